@@ -1,22 +1,26 @@
 """Admin routes."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import HTMLResponse, JSONResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app import crud
 from app.database import get_db
 from app.models import User
+from app.services import auth_service
 
 from .dependencies import get_current_user, require_admin, templates, validate_csrf
 
 
 router = APIRouter(prefix="/admin")
 
+USERS_PAGE_SIZE = 50
 
-def _serialize_user(user: User, tracked_club_count: int) -> Dict[str, Any]:
+
+def _serialize_user(user: User, tracked_club_count: int, tracked_fencer_count: int) -> Dict[str, Any]:
     return {
         "id": user.id,
         "username": user.username,
@@ -25,18 +29,23 @@ def _serialize_user(user: User, tracked_club_count: int) -> Dict[str, Any]:
         "is_active": user.is_active,
         "created_at": user.created_at.isoformat() if user.created_at else None,
         "tracked_club_count": tracked_club_count,
+        "tracked_fencer_count": tracked_fencer_count,
     }
 
 
 @router.get("/users", response_class=HTMLResponse)
 def list_users(
     request: Request,
+    q: Optional[str] = None,
+    before: Optional[int] = Query(default=None, ge=1),
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    counts = {row["user_id"]: row["tracked_club_count"] for row in crud.get_registration_counts_for_users(db)}
-    serialized = [_serialize_user(user, counts.get(user.id, 0)) for user in users]
+    search = (q or "").strip() or None
+    # One extra row tells whether there is another page
+    rows = crud.get_users_with_counts(db, search=search, before_id=before, limit=USERS_PAGE_SIZE + 1)
+    has_more = len(rows) > USERS_PAGE_SIZE
+    serialized = [_serialize_user(*row) for row in rows[:USERS_PAGE_SIZE]]
 
     return templates.TemplateResponse(
         "admin/users.html",
@@ -44,10 +53,29 @@ def list_users(
             "request": request,
             "user": admin,
             "users": serialized,
+            "search": search,
+            "next_before": serialized[-1]["id"] if has_more else None,
+            "is_first_page": before is None,
         },
     )
 
 
+def _apply_user_updates(db: Session, user_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
+    user = crud.get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    # Signed cookies carry the admin flag, so sessions must not outlive a demotion
+    # or deactivation; granting rights leaves them alone
+    privileges_reduced = any(getattr(user, field) and not value for field, value in updates.items())
+    user = crud.update_user(db, user_id, **updates)
+    if privileges_reduced:
+        auth_service.revoke_user_sessions(db, user_id)
+    db.commit()
+
+    return _serialize_user(*crud.get_user_with_counts(db, user.id))
+
+
 @router.patch("/users/{user_id}")
 async def update_user(
     user_id: int,
@@ -70,12 +98,6 @@ async def update_user(
     if user_id == admin.id and "is_active" in updates and not updates["is_active"]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot deactivate yourself")
 
-    try:
-        user = crud.update_user(db, user_id, **updates)
-        db.commit()
-    except ValueError:
-        db.rollback()
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    # The admin API still uses the sync session, so keep its queries off the event loop
+    return JSONResponse(await run_in_threadpool(_apply_user_updates, db, user_id, updates))
 
-    counts = {row["user_id"]: row["tracked_club_count"] for row in crud.get_registration_counts_for_users(db)}
-    return JSONResponse(_serialize_user(user, counts.get(user.id, 0)))
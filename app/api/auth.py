@@ -3,13 +3,14 @@
 import os
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Cookie, Depends, Request, Response, status
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models import User
-from app.services import auth_service, rate_limit_service
+from app.services import auth_service, password_pool_service, rate_limit_service
 
 from .dependencies import (
     SESSION_COOKIE_NAME,
@@ -43,6 +44,20 @@ def _clear_session_cookie(response: Response) -> None:
     response.delete_cookie(key=SESSION_COOKIE_NAME)
 
 
+def _start_session(db: Session, user_id: int) -> str:
+    token, _ = auth_service.create_session(db, user_id)
+    db.commit()
+    return token
+
+
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.get("/register", response_class=HTMLResponse)
 def register_page(
     request: Request,
@@ -86,10 +101,13 @@ async def register_user(
         )
 
     try:
-        user = auth_service.register_user(username, email, password, db)
-        db.commit()
+        user = await auth_service.register_user_async(username, email, password, db)
+        await run_in_threadpool(db.commit)
+    except password_pool_service.PasswordPoolBusyError:
+        await run_in_threadpool(db.rollback)
+        raise _password_pool_busy()
     except ValueError as exc:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         error_msg = str(exc)
         if content_type.startswith("application/json"):
             return JSONResponse({"detail": error_msg}, status_code=status.HTTP_400_BAD_REQUEST)
@@ -104,7 +122,7 @@ async def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
         )
     except Exception:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         if content_type.startswith("application/json"):
             raise
         raise
@@ -147,7 +165,10 @@ async def login_user(
     username = (payload.get("username") or "").strip()
     password = payload.get("password") or ""
 
-    user = auth_service.authenticate(username, password, db)
+    try:
+        user = await auth_service.authenticate_async(username, password, db)
+    except password_pool_service.PasswordPoolBusyError:
+        raise _password_pool_busy()
     if not user:
         error_msg = "Invalid credentials"
         if content_type.startswith("application/json"):
@@ -166,8 +187,7 @@ async def login_user(
     # Reset rate limit on successful login
     rate_limit_service.reset_rate_limit(f"login:{username}")
 
-    token, _ = auth_service.create_session(db, user.id)
-    db.commit()
+    token = await run_in_threadpool(_start_session, db, user.id)
 
     if content_type.startswith("application/json"):
         response = JSONResponse({"message": "ok"})
@@ -5,19 +5,30 @@ from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app import crud
-from app.database import get_db
+from app import async_crud
+from app.database import get_async_db
 from app.models import TrackedClub, User
+from app.services import fragment_cache_service
 from app.services.club_validation_service import validate_club_url
 
-from .dependencies import get_current_user, templates, validate_csrf
+from .dependencies import (
+    cached_fragment,
+    get_current_user,
+    not_modified,
+    page_etag,
+    templates,
+    validate_csrf,
+    with_etag,
+)
 
 
 router = APIRouter()
 
 ALLOWED_WEAPONS = ["foil", "epee", "saber"]
+CLUB_LIST_TEMPLATE = "partials/tracked_club_list.html"
 
 
 def _normalize_weapon_filter(raw_values: Optional[Any]) -> Optional[str]:
@@ -59,15 +70,22 @@ def _serialize_tracked_club(tracked: TrackedClub) -> Dict[str, Any]:
     }
 
 
-def _build_club_context(db: Session, user: User, error: Optional[str] = None) -> Dict[str, Any]:
-    tracked = crud.get_tracked_clubs(db, user.id, active=None)
-    active_clubs = [club for club in tracked if club.active]
-    inactive_clubs = [club for club in tracked if not club.active]
+async def _build_club_context(
+    request: Request,
+    db: AsyncSession,
+    user: User,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    async def _load_lists() -> Dict[str, Any]:
+        tracked = await async_crud.get_tracked_clubs(db, user.id, active=None)
+        return {
+            "active_clubs": [club for club in tracked if club.active],
+            "inactive_clubs": [club for club in tracked if not club.active],
+            "weapon_options": ALLOWED_WEAPONS,
+        }
 
     context: Dict[str, Any] = {
-        "tracked_clubs": tracked,
-        "active_clubs": active_clubs,
-        "inactive_clubs": inactive_clubs,
+        "club_list_html": await cached_fragment(request, db, user, CLUB_LIST_TEMPLATE, _load_lists),
         "weapon_options": ALLOWED_WEAPONS,
     }
 
@@ -78,26 +96,32 @@ def _build_club_context(db: Session, user: User, error: Optional[str] = None) ->
 
 
 @router.get("/clubs", response_class=HTMLResponse)
-def list_tracked_clubs(
+async def list_tracked_clubs(
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return templates.TemplateResponse(
+    etag = await page_etag(request, db, user)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    response = templates.TemplateResponse(
         "tracked_clubs.html",
         {
             "request": request,
             "user": user,
-            **_build_club_context(db, user),
+            **await _build_club_context(request, db, user),
         },
     )
+    return with_etag(response, etag)
 
 
 @router.post("/clubs/add")
 async def add_tracked_club(
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
     content_type = request.headers.get("content-type", "")
@@ -122,13 +146,14 @@ async def add_tracked_club(
             {
                 "request": request,
                 "user": user,
-                **_build_club_context(db, user, error=message),
+                **await _build_club_context(request, db, user, error=message),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
     try:
-        normalized_url, detected_name = validate_club_url(club_url)
+        # Blocking HTTP fetch of the club page
+        normalized_url, detected_name = await run_in_threadpool(validate_club_url, club_url)
     except ValueError as exc:
         message = str(exc)
         if content_type.startswith("application/json"):
@@ -138,7 +163,7 @@ async def add_tracked_club(
             {
                 "request": request,
                 "user": user,
-                **_build_club_context(db, user, error=message),
+                **await _build_club_context(request, db, user, error=message),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
@@ -146,19 +171,20 @@ async def add_tracked_club(
     weapon_filter = _normalize_weapon_filter(weapon_filter_raw)
     club_name = provided_name or detected_name
 
-    existing = crud.get_tracked_club_by_user_and_url(db, user.id, normalized_url)
+    existing = await async_crud.get_tracked_club_by_user_and_url(db, user.id, normalized_url)
 
     if existing:
         if not existing.active:
-            crud.update_tracked_club(
+            await async_crud.update_tracked_club(
                 db,
                 existing.id,
                 active=True,
                 weapon_filter=weapon_filter,
                 club_name=club_name,
             )
-            db.commit()
-            db.refresh(existing)
+            await db.commit()
+            fragment_cache_service.invalidate_user(user.id)
+            await db.refresh(existing)
             tracked = existing
         else:
             message = "Club already tracked"
@@ -169,23 +195,24 @@ async def add_tracked_club(
                 {
                     "request": request,
                     "user": user,
-                    **_build_club_context(db, user, error=message),
+                    **await _build_club_context(request, db, user, error=message),
                 },
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
     else:
         try:
-            tracked = crud.create_tracked_club(
+            tracked = await async_crud.create_tracked_club(
                 db,
                 user_id=user.id,
                 club_url=normalized_url,
                 club_name=club_name,
                 weapon_filter=weapon_filter,
             )
-            db.commit()
-            db.refresh(tracked)
+            await db.commit()
+            fragment_cache_service.invalidate_user(user.id)
+            await db.refresh(tracked)
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             message = "Club already tracked"
             if content_type.startswith("application/json"):
                 return JSONResponse({"detail": message}, status_code=status.HTTP_400_BAD_REQUEST)
@@ -194,7 +221,7 @@ async def add_tracked_club(
                 {
                     "request": request,
                     "user": user,
-                    **_build_club_context(db, user, error=message),
+                    **await _build_club_context(request, db, user, error=message),
                 },
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
@@ -210,10 +237,10 @@ async def update_tracked_club(
     tracked_club_id: int,
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
-    tracked = crud.get_tracked_club_for_user(db, tracked_club_id, user.id)
+    tracked = await async_crud.get_tracked_club_for_user(db, tracked_club_id, user.id)
     if not tracked:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tracked club not found")
 
@@ -233,25 +260,27 @@ async def update_tracked_club(
     if not updates:
         return JSONResponse(_serialize_tracked_club(tracked))
 
-    crud.update_tracked_club(db, tracked.id, **updates)
-    db.commit()
+    await async_crud.update_tracked_club(db, tracked.id, **updates)
+    await db.commit()
+    fragment_cache_service.invalidate_user(user.id)
 
-    db.refresh(tracked)
+    await db.refresh(tracked)
     return JSONResponse(_serialize_tracked_club(tracked))
 
 
 @router.delete("/clubs/{tracked_club_id}")
-def remove_tracked_club(
+async def remove_tracked_club(
     tracked_club_id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
-    tracked = crud.get_tracked_club_for_user(db, tracked_club_id, user.id)
+    tracked = await async_crud.get_tracked_club_for_user(db, tracked_club_id, user.id)
     if not tracked:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tracked club not found")
 
-    crud.deactivate_tracked_club(db, tracked_club_id)
-    db.commit()
+    await async_crud.deactivate_tracked_club(db, tracked_club_id)
+    await db.commit()
+    fragment_cache_service.invalidate_user(user.id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,20 +1,71 @@
 """Shared dependencies for API routes."""
 
+import logging
 import os
-from typing import Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from fastapi import Cookie, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from fastapi.templating import Jinja2Templates
-from jinja2 import pass_context
-from sqlalchemy.orm import Session
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, pass_context
+from markupsafe import Markup
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app import async_crud
+from app.api import timing
+from app.database import get_async_db
 from app.models import User
-from app.services import auth_service, csrf_service, rate_limit_service
+from app.services import (
+    auth_service,
+    csrf_service,
+    etag_service,
+    fragment_cache_service,
+    rate_limit_service,
+)
 
 
 SESSION_COOKIE_NAME = "session_token"
-templates = Jinja2Templates(directory="app/templates")
+TEMPLATE_DIR = "app/templates"
+# Compiled template bytecode shared by workers and kept across restarts; empty disables it
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", "./.jinja_cache")
+# Re-check template files for changes on every render (development only)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() in {"1", "true", "yes"}
+
+logger = logging.getLogger(__name__)
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    if not TEMPLATE_CACHE_DIR:
+        return None
+    try:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    except OSError as exc:
+        logger.warning("Template bytecode cache disabled, cannot create %s: %s", TEMPLATE_CACHE_DIR, exc)
+        return None
+    return FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+
+class _TimedTemplate(Template):
+    """Template that adds its render time to the request's Server-Timing."""
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            timing.record("render", time.perf_counter() - started)
+
+
+_environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=_bytecode_cache(),
+)
+_environment.template_class = _TimedTemplate
+
+templates = Jinja2Templates(env=_environment)
 
 
 def get_templates() -> Jinja2Templates:
@@ -22,29 +73,63 @@ def get_templates() -> Jinja2Templates:
     return templates
 
 
-def get_optional_user(
+def precompile_templates() -> int:
+    """
+    Compile every template up front so first requests render at steady-state speed.
+
+    Bytecode written to ``TEMPLATE_CACHE_DIR`` lets later workers and restarts
+    skip Jinja's parse/compile step. Returns the number of templates loaded.
+    """
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
+
+
+async def load_auth_context(
+    request: Request,
+    session_token: Optional[str],
+    db: AsyncSession,
+) -> Optional[User]:
+    """Load session, user and CSRF token once per request.
+
+    The result is stored on ``request.state`` so later dependencies (such as
+    ``validate_csrf``) reuse it instead of querying the session again.
+    """
+    state = request.state
+    if getattr(state, "auth_loaded", False) and state.session_token == session_token:
+        return state.user
+
+    session = await auth_service.load_session_async(db, session_token)
+    user = session.user if session else None
+    if user is not None and user in db:
+        # Detach so a rollback later in the request cannot expire the user
+        # (expired attributes cannot be lazily reloaded on an AsyncSession).
+        db.expunge(user)
+
+    state.session_token = session_token
+    state.user = user
+    state.csrf_token = session.csrf_token if session else None
+    state.auth_loaded = True
+    return state.user
+
+
+async def get_optional_user(
     request: Request,
     session_token: Optional[str] = Cookie(default=None, alias=SESSION_COOKIE_NAME),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Optional[User]:
     """Return the authenticated user if a valid session is present."""
-    request.state.session_token = session_token
-    user = auth_service.validate_session(db, session_token)
-    if user:
-        request.state.user = user
-        request.state.csrf_token = csrf_service.get_csrf_token(db, session_token)
-    else:
-        request.state.csrf_token = None
-    return user
+    return await load_auth_context(request, session_token, db)
 
 
-def get_current_user(
+async def get_current_user(
     request: Request,
     session_token: Optional[str] = Cookie(default=None, alias=SESSION_COOKIE_NAME),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     """Require an authenticated user."""
-    user = get_optional_user(request, session_token, db)
+    user = await load_auth_context(request, session_token, db)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     return user
@@ -74,7 +159,7 @@ templates.env.globals["csrf_token"] = csrf_token
 async def validate_csrf(
     request: Request,
     session_token: Optional[str] = Cookie(default=None, alias=SESSION_COOKIE_NAME),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> None:
     """Validate CSRF token for state-changing requests."""
     content_type = request.headers.get("content-type", "").lower()
@@ -86,10 +171,63 @@ async def validate_csrf(
         form = await request.form()
         provided_token = form.get("csrf_token") if form is not None else None
 
-    if not csrf_service.validate_csrf_token(session_token, provided_token, db):
+    await load_auth_context(request, session_token, db)
+    if not csrf_service.tokens_match(request.state.csrf_token, provided_token):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid CSRF token")
 
 
+async def user_data_version(request: Request, db: AsyncSession, user: User) -> int:
+    """Return the user's data version, loaded at most once per request."""
+    version = getattr(request.state, "data_version", None)
+    if version is None:
+        version = await async_crud.get_user_data_version(db, user.id)
+        request.state.data_version = version
+    return version
+
+
+async def page_etag(request: Request, db: AsyncSession, user: User) -> str:
+    """Weak ETag for the user's view of the requested page (one primary-key lookup)."""
+    version = await user_data_version(request, db, user)
+    variant = f"{request.url.path}?{request.url.query}:{getattr(request.state, 'csrf_token', None) or ''}"
+    return etag_service.build_etag(user.id, version, variant)
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response when the client already holds ``etag``."""
+    if etag_service.etag_matches(request.headers.get("if-none-match"), etag):
+        return with_etag(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag)
+    return None
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Tag a per-user page so browsers revalidate it instead of reusing it blindly."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+async def cached_fragment(
+    request: Request,
+    db: AsyncSession,
+    user: User,
+    template_name: str,
+    load_context: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Markup:
+    """
+    Render ``template_name`` for the user, or reuse the cached HTML.
+
+    ``load_context`` (which runs the queries) is only awaited on a cache miss.
+    """
+    version = await user_data_version(request, db, user)
+    key = (template_name, user.id, version, getattr(request.state, "csrf_token", None))
+    html = fragment_cache_service.get(key)
+    if html is None:
+        context = {"request": request, "user": user, **await load_context()}
+        html = templates.get_template(template_name).render(context)
+        fragment_cache_service.put(key, html)
+    return Markup(html)
+
+
 async def check_login_rate_limit(request: Request) -> None:
     """Rate limit login attempts by username."""
     max_attempts = int(os.getenv("LOGIN_RATE_LIMIT_ATTEMPTS", "5"))
@@ -4,21 +4,21 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import crud
-from app.database import get_db
+from app import async_crud
+from app.database import get_async_db
 from app.models import User
 
 from .tracked_fencers import build_fencer_management_context
-from .dependencies import get_current_user, get_optional_user, templates
+from .dependencies import get_current_user, get_optional_user, not_modified, page_etag, templates, with_etag
 
 
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-def home(
+async def home(
     request: Request,
     user: Optional[User] = Depends(get_optional_user),
 ):
@@ -28,25 +28,29 @@ def home(
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
-def dashboard(
+async def dashboard(
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    tracked_clubs = crud.get_tracked_clubs(db, user.id, active=True)
-    inactive_clubs = crud.get_tracked_clubs(db, user.id, active=False)
-    fencer_context = build_fencer_management_context(db, user)
+    etag = await page_etag(request, db, user)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    counts = await async_crud.get_tracking_counts(db, user.id)
+    # The fencer list is served from the fragment cache when the data is unchanged
+    fencer_context = await build_fencer_management_context(request, db, user)
 
     context = {
         "request": request,
         "user": user,
-        "tracked_club_count": len(tracked_clubs),
-        "inactive_club_count": len(inactive_clubs),
-        "tracked_fencer_count": len(fencer_context["active_fencers"]),
-        "inactive_fencer_count": len(fencer_context["inactive_fencers"]),
-        "active_fencers": fencer_context["active_fencers"],
-        "inactive_fencers": fencer_context["inactive_fencers"],
+        "tracked_club_count": counts["active_clubs"],
+        "inactive_club_count": counts["inactive_clubs"],
+        "tracked_fencer_count": counts["active_fencers"],
+        "inactive_fencer_count": counts["inactive_fencers"],
+        "fencer_list_html": fencer_context["fencer_list_html"],
         "fencer_weapon_options": fencer_context["weapon_options"],
     }
 
-    return templates.TemplateResponse("dashboard.html", context)
+    return with_etag(templates.TemplateResponse("dashboard.html", context), etag)
@@ -0,0 +1,91 @@
+"""Routes for browsing scraped registrations."""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models import User
+from app.services import registration_query_service
+
+from .dependencies import get_current_user, templates
+
+
+router = APIRouter()
+
+
+async def _load_page(
+    db: AsyncSession,
+    tournament: Optional[str],
+    fencer: Optional[str],
+    event: Optional[str],
+    sort_by: Optional[str],
+    sort_order: Optional[str],
+    cursor: Optional[str],
+    page_size: Optional[int],
+) -> Dict[str, Any]:
+    try:
+        return await db.run_sync(
+            registration_query_service.query_registrations,
+            tournament_filter=tournament or None,
+            fencer_filter=fencer or None,
+            event_filter=event or None,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor or None,
+            page_size=page_size,
+        )
+    except registration_query_service.InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@router.get("/registrations", response_class=HTMLResponse)
+async def list_registrations(
+    request: Request,
+    tournament: Optional[str] = None,
+    fencer: Optional[str] = None,
+    event: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = Query(default=None, ge=1),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    page = await _load_page(db, tournament, fencer, event, sort_by, sort_order, cursor, page_size)
+
+    return templates.TemplateResponse(
+        "registrations.html",
+        {
+            "request": request,
+            "user": user,
+            "registrations": page["items"],
+            "next_cursor": page["next_cursor"],
+            "page_size": page["page_size"],
+            "total_count": page["total_count"],
+            "is_first_page": not cursor,
+            "fencer_filter": fencer,
+            "tournament_filter": tournament,
+            "event_filter": event,
+            "sort_by": page["sort_by"],
+            "sort_order": page["sort_order"],
+        },
+    )
+
+
+@router.get("/api/registrations")
+async def list_registrations_json(
+    tournament: Optional[str] = None,
+    fencer: Optional[str] = None,
+    event: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = Query(default=None, ge=1),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> JSONResponse:
+    page = await _load_page(db, tournament, fencer, event, sort_by, sort_order, cursor, page_size)
+    return JSONResponse(page)
@@ -0,0 +1,86 @@
+"""Per-request timing: ``Server-Timing`` header and route latency metrics.
+
+``ServerTimingMiddleware`` times each HTTP request until its response headers
+are sent and reports, in the ``Server-Timing`` header, the total (``app``),
+time spent in SQL (``db``, with the statement count) and in template
+rendering (``render``). Whatever remains is handler code, including blocking
+HTTP calls. The same request also feeds ``fc_http_request_seconds`` and
+``fc_http_request_queries``, labelled by route template rather than raw path.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import query_stats
+from app.services import metrics_service
+
+# Send the Server-Timing header (timings are still recorded as metrics when off)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in {"1", "true", "yes"}
+
+UNMATCHED_ROUTE = "unmatched"
+
+_current: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timing", default=None)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add ``seconds`` to the ``name`` entry of the current request's Server-Timing."""
+    timings = _current.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def _server_timing(total: float, queries: query_stats.QueryStats, timings: Dict[str, float]) -> str:
+    noun = "query" if queries.count == 1 else "queries"
+    entries = [
+        f"app;dur={total * 1000:.1f}",
+        f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} {noun}"',
+    ]
+    entries.extend(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware; see the module docstring."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        elapsed = None
+        status = 500
+        timings: Dict[str, float] = {}
+        token = _current.set(timings)
+
+        with query_stats.track() as queries:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal elapsed, status
+                if message["type"] == "http.response.start":
+                    elapsed = time.perf_counter() - started
+                    status = message["status"]
+                    if SERVER_TIMING_ENABLED:
+                        headers = MutableHeaders(scope=message)
+                        headers.append("Server-Timing", _server_timing(elapsed, queries, timings))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _current.reset(token)
+                if elapsed is None:
+                    elapsed = time.perf_counter() - started
+                # The router stores the matched route in the (shared) scope
+                route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+                method = scope["method"]
+                metrics_service.HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(elapsed)
+                metrics_service.HTTP_REQUEST_QUERIES.labels(method, route).observe(queries.count)
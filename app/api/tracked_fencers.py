@@ -6,20 +6,34 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import crud
-from app.database import get_db
+from app import async_crud
+from app.database import get_async_db
 from app.models import TrackedFencer, User
-from app.services import fencer_validation_service, fencer_scraper_service
+from app.services import (
+    fencer_cooldown_service,
+    fencer_validation_service,
+    fragment_cache_service,
+)
 from app.services.fencer_validation_service import build_fencer_profile_url
 
-from .dependencies import get_current_user, templates, validate_csrf
+from .dependencies import (
+    cached_fragment,
+    get_current_user,
+    not_modified,
+    page_etag,
+    templates,
+    validate_csrf,
+    with_etag,
+)
 
 
 router = APIRouter()
 
 ALLOWED_WEAPONS = ["foil", "epee", "saber"]
+FENCER_LIST_TEMPLATE = "partials/tracked_fencer_list.html"
 
 
 class FencerStatus:
@@ -37,11 +51,11 @@ def _determine_status(fencer: TrackedFencer) -> FencerStatus:
         return FencerStatus("Disabled", "tag", "Tracking paused by user")
 
     if (
-        fencer.failure_count >= fencer_scraper_service.FENCER_MAX_FAILURES
+        fencer.failure_count >= fencer_cooldown_service.FENCER_MAX_FAILURES
         and fencer.last_failure_at
     ):
         cooldown_expires = fencer.last_failure_at + timedelta(
-            minutes=fencer_scraper_service.FENCER_FAILURE_COOLDOWN_MIN
+            minutes=fencer_cooldown_service.FENCER_FAILURE_COOLDOWN_MIN
         )
         if cooldown_expires > datetime.now(UTC):
             remaining = cooldown_expires - datetime.now(UTC)
@@ -82,26 +96,48 @@ def _serialize_fencer(fencer: TrackedFencer) -> Dict[str, Any]:
     }
 
 
-def _build_context(
-    db: Session,
+class LazyFencerList:
+    """
+    Tracked fencers serialized for the card template on first iteration.
+
+    Views that never render the list (or only test it for emptiness) skip
+    ``_serialize_fencer`` entirely.
+    """
+
+    __slots__ = ("_fencers", "_items")
+
+    def __init__(self, fencers: List[TrackedFencer]):
+        self._fencers = fencers
+        self._items: Optional[List[Dict[str, Any]]] = None
+
+    def __bool__(self) -> bool:
+        return bool(self._fencers)
+
+    def __len__(self) -> int:
+        return len(self._fencers)
+
+    def __iter__(self):
+        if self._items is None:
+            self._items = [_serialize_fencer(fencer) for fencer in self._fencers]
+        return iter(self._items)
+
+
+async def _build_context(
+    request: Request,
+    db: AsyncSession,
     user: User,
     error: Optional[str] = None,
     success: Optional[str] = None,
 ) -> Dict[str, Any]:
-    fencers = crud.get_all_tracked_fencers_for_user(db, user.id, active_only=False)
-    active: List[Dict[str, Any]] = []
-    inactive: List[Dict[str, Any]] = []
-
-    for fencer in fencers:
-        serialized = _serialize_fencer(fencer)
-        if fencer.active:
-            active.append(serialized)
-        else:
-            inactive.append(serialized)
+    async def _load_lists() -> Dict[str, Any]:
+        fencers = await async_crud.get_all_tracked_fencers_for_user(db, user.id, active_only=False)
+        return {
+            "active_fencers": LazyFencerList([fencer for fencer in fencers if fencer.active]),
+            "inactive_fencers": LazyFencerList([fencer for fencer in fencers if not fencer.active]),
+        }
 
     context: Dict[str, Any] = {
-        "active_fencers": active,
-        "inactive_fencers": inactive,
+        "fencer_list_html": await cached_fragment(request, db, user, FENCER_LIST_TEMPLATE, _load_lists),
         "weapon_options": ALLOWED_WEAPONS,
     }
 
@@ -113,9 +149,9 @@ def _build_context(
     return context
 
 
-def build_fencer_management_context(db: Session, user: User) -> Dict[str, Any]:
+async def build_fencer_management_context(request: Request, db: AsyncSession, user: User) -> Dict[str, Any]:
     """Expose fencer context for other views (e.g., dashboard cards)."""
-    return _build_context(db, user)
+    return await _build_context(request, db, user)
 
 
 def _handle_weapon_filter(raw_value: str) -> Optional[str]:
@@ -126,29 +162,35 @@ def _handle_weapon_filter(raw_value: str) -> Optional[str]:
 
 
 @router.get("/fencers", response_class=HTMLResponse)
-def list_tracked_fencers(
+async def list_tracked_fencers(
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
+    etag = await page_etag(request, db, user)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     success = request.query_params.get("success")
     error = request.query_params.get("error")
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "tracked_fencers.html",
         {
             "request": request,
             "user": user,
-            **_build_context(db, user, error=error, success=success),
+            **await _build_context(request, db, user, error=error, success=success),
         },
     )
+    return with_etag(response, etag)
 
 
 @router.post("/fencers")
 async def create_tracked_fencer(
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
     form = await request.form()
@@ -165,7 +207,7 @@ async def create_tracked_fencer(
             {
                 "request": request,
                 "user": user,
-                **_build_context(db, user, error=error_msg),
+                **await _build_context(request, db, user, error=error_msg),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
@@ -183,12 +225,12 @@ async def create_tracked_fencer(
             {
                 "request": request,
                 "user": user,
-                **_build_context(db, user, error=str(exc)),
+                **await _build_context(request, db, user, error=str(exc)),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    existing = crud.get_tracked_fencer_for_user(db, user.id, fencer_id)
+    existing = await async_crud.get_tracked_fencer_for_user(db, user.id, fencer_id)
     if existing:
         if existing.active:
             return templates.TemplateResponse(
@@ -196,7 +238,7 @@ async def create_tracked_fencer(
                 {
                     "request": request,
                     "user": user,
-                    **_build_context(db, user, error="Fencer already tracked"),
+                    **await _build_context(request, db, user, error="Fencer already tracked"),
                 },
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
@@ -206,10 +248,11 @@ async def create_tracked_fencer(
         existing.failure_count = 0
         existing.last_failure_at = None
         existing.last_checked_at = None
-        crud.update_tracked_fencer(
+        await async_crud.update_tracked_fencer(
             db, existing, display_name=display_name, weapon_filter=weapon_filter
         )
-        db.commit()
+        await db.commit()
+        fragment_cache_service.invalidate_user(user.id)
         return RedirectResponse(
             url="/fencers?success=Fencer%20re-activated",
             status_code=status.HTTP_303_SEE_OTHER,
@@ -217,31 +260,37 @@ async def create_tracked_fencer(
 
     # Fallback: try to get name from cache or scrape if slug didn't provide a name
     if not display_name:
-        cached_fencer = crud.get_fencer_by_fencingtracker_id(db, fencer_id)
+        cached_fencer = await async_crud.get_fencer_by_fencingtracker_id(db, fencer_id)
         if cached_fencer and cached_fencer.name:
             display_name = cached_fencer.name
         else:
-            display_name = fencer_scraper_service.fetch_fencer_display_name(fencer_id)
+            # Imported here: the scraper (requests, BeautifulSoup) is only needed on this path
+            from app.services import fencer_scraper_service
+
+            display_name = await run_in_threadpool(
+                fencer_scraper_service.fetch_fencer_display_name, fencer_id
+            )
 
     final_display_name = display_name
 
     try:
-        crud.create_tracked_fencer(
+        await async_crud.create_tracked_fencer(
             db,
             user_id=user.id,
             fencer_id=fencer_id,
             display_name=final_display_name,
             weapon_filter=weapon_filter,
         )
-        db.commit()
+        await db.commit()
+        fragment_cache_service.invalidate_user(user.id)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         return templates.TemplateResponse(
             "tracked_fencers.html",
             {
                 "request": request,
                 "user": user,
-                **_build_context(db, user, error="Fencer already tracked"),
+                **await _build_context(request, db, user, error="Fencer already tracked"),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
@@ -257,10 +306,10 @@ async def edit_tracked_fencer(
     tracked_fencer_id: int,
     request: Request,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
-    fencer = crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
+    fencer = await async_crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
     if not fencer or fencer.user_id != user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tracked fencer not found")
 
@@ -276,18 +325,19 @@ async def edit_tracked_fencer(
             {
                 "request": request,
                 "user": user,
-                **_build_context(db, user, error=str(exc)),
+                **await _build_context(request, db, user, error=str(exc)),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    crud.update_tracked_fencer(
+    await async_crud.update_tracked_fencer(
         db,
         fencer,
         display_name=display_name,
         weapon_filter=weapon_filter,
     )
-    db.commit()
+    await db.commit()
+    fragment_cache_service.invalidate_user(user.id)
 
     return RedirectResponse(
         url="/fencers?success=Fencer%20updated",
@@ -299,16 +349,17 @@ async def edit_tracked_fencer(
 async def delete_tracked_fencer(
     tracked_fencer_id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
-    fencer = crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
+    fencer = await async_crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
     if not fencer or fencer.user_id != user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tracked fencer not found")
 
     # Permanently delete the fencer
-    db.delete(fencer)
-    db.commit()
+    await db.delete(fencer)
+    await db.commit()
+    fragment_cache_service.invalidate_user(user.id)
 
     return RedirectResponse(
         url="/fencers?success=Fencer%20deleted",
@@ -320,15 +371,16 @@ async def delete_tracked_fencer(
 async def deactivate_tracked_fencer(
     tracked_fencer_id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
-    fencer = crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
+    fencer = await async_crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
     if not fencer or fencer.user_id != user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tracked fencer not found")
 
-    crud.deactivate_tracked_fencer(db, fencer)
-    db.commit()
+    await async_crud.deactivate_tracked_fencer(db, fencer)
+    await db.commit()
+    fragment_cache_service.invalidate_user(user.id)
 
     return RedirectResponse(
         url="/fencers?success=Fencer%20deactivated",
@@ -340,10 +392,10 @@ async def deactivate_tracked_fencer(
 async def reactivate_tracked_fencer(
     tracked_fencer_id: int,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _csrf: None = Depends(validate_csrf),
 ):
-    fencer = crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
+    fencer = await async_crud.get_tracked_fencer_by_id(db, tracked_fencer_id)
     if not fencer or fencer.user_id != user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tracked fencer not found")
 
@@ -351,7 +403,8 @@ async def reactivate_tracked_fencer(
     fencer.failure_count = 0
     fencer.last_failure_at = None
     fencer.last_checked_at = None
-    db.commit()
+    await db.commit()
+    fragment_cache_service.invalidate_user(user.id)
 
     return RedirectResponse(
         url="/fencers?success=Fencer%20reactivated",
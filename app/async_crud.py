@@ -0,0 +1,252 @@
+"""Async counterparts of the crud functions used by the web layer.
+
+Signatures mirror ``app.crud`` but take an ``AsyncSession``. Relationships
+needed by callers are loaded eagerly, since lazy loads are not available on
+async sessions.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from . import models
+
+
+# Session operations
+
+
+async def get_session_with_user(db: AsyncSession, session_token: str) -> Optional[models.UserSession]:
+    """Load a session and its user in a single query."""
+    result = await db.execute(
+        select(models.UserSession)
+        .options(joinedload(models.UserSession.user))
+        .where(models.UserSession.session_token == session_token)
+    )
+    return result.scalars().first()
+
+
+async def delete_session(db: AsyncSession, session: models.UserSession) -> None:
+    await db.delete(session)
+    await db.flush()
+
+
+# Fencer operations
+
+
+async def get_fencer_by_fencingtracker_id(db: AsyncSession, fencingtracker_id: str) -> Optional[models.Fencer]:
+    """Get a fencer by their fencingtracker ID."""
+    result = await db.execute(
+        select(models.Fencer).where(models.Fencer.fencingtracker_id == fencingtracker_id)
+    )
+    return result.scalars().first()
+
+
+# Tracked club operations
+
+
+async def create_tracked_club(
+    db: AsyncSession,
+    user_id: int,
+    club_url: str,
+    club_name: Optional[str] = None,
+    weapon_filter: Optional[str] = None,
+) -> models.TrackedClub:
+    tracked = models.TrackedClub(
+        user_id=user_id,
+        club_url=club_url,
+        club_name=club_name,
+        weapon_filter=weapon_filter,
+    )
+    db.add(tracked)
+    await db.flush()
+    return tracked
+
+
+async def get_tracked_club_by_id(
+    db: AsyncSession,
+    tracked_club_id: int,
+) -> Optional[models.TrackedClub]:
+    result = await db.execute(
+        select(models.TrackedClub).where(models.TrackedClub.id == tracked_club_id)
+    )
+    return result.scalars().one_or_none()
+
+
+async def get_tracked_club_for_user(
+    db: AsyncSession,
+    tracked_club_id: int,
+    user_id: int,
+) -> Optional[models.TrackedClub]:
+    result = await db.execute(
+        select(models.TrackedClub).where(
+            models.TrackedClub.id == tracked_club_id,
+            models.TrackedClub.user_id == user_id,
+        )
+    )
+    return result.scalars().one_or_none()
+
+
+async def get_tracked_club_by_user_and_url(
+    db: AsyncSession,
+    user_id: int,
+    club_url: str,
+) -> Optional[models.TrackedClub]:
+    result = await db.execute(
+        select(models.TrackedClub).where(
+            models.TrackedClub.user_id == user_id,
+            models.TrackedClub.club_url == club_url,
+        )
+    )
+    return result.scalars().one_or_none()
+
+
+async def get_tracked_clubs(
+    db: AsyncSession,
+    user_id: int,
+    active: Optional[bool] = None,
+) -> List[models.TrackedClub]:
+    query = select(models.TrackedClub).where(models.TrackedClub.user_id == user_id)
+    if active is not None:
+        query = query.where(models.TrackedClub.active.is_(active))
+    result = await db.execute(query.order_by(models.TrackedClub.created_at.desc()))
+    return list(result.scalars().all())
+
+
+async def update_tracked_club(
+    db: AsyncSession,
+    tracked_club_id: int,
+    **kwargs,
+) -> models.TrackedClub:
+    tracked = await get_tracked_club_by_id(db, tracked_club_id)
+    if not tracked:
+        raise ValueError("Tracked club not found")
+
+    for field, value in kwargs.items():
+        if hasattr(tracked, field) and value is not None:
+            setattr(tracked, field, value)
+
+    await db.flush()
+    return tracked
+
+
+async def deactivate_tracked_club(db: AsyncSession, tracked_club_id: int) -> None:
+    tracked = await get_tracked_club_by_id(db, tracked_club_id)
+    if tracked and tracked.active:
+        tracked.active = False
+        await db.flush()
+
+
+# Tracked fencer operations
+
+
+async def create_tracked_fencer(
+    db: AsyncSession,
+    user_id: int,
+    fencer_id: str,
+    display_name: Optional[str] = None,
+    weapon_filter: Optional[str] = None,
+) -> models.TrackedFencer:
+    tracked = models.TrackedFencer(
+        user_id=user_id,
+        fencer_id=fencer_id,
+        display_name=display_name,
+        weapon_filter=weapon_filter,
+    )
+    db.add(tracked)
+    await db.flush()
+    return tracked
+
+
+async def get_tracked_fencer_by_id(
+    db: AsyncSession,
+    tracked_fencer_id: int,
+) -> Optional[models.TrackedFencer]:
+    result = await db.execute(
+        select(models.TrackedFencer).where(models.TrackedFencer.id == tracked_fencer_id)
+    )
+    return result.scalars().one_or_none()
+
+
+async def get_tracked_fencer_for_user(
+    db: AsyncSession,
+    user_id: int,
+    fencer_id: str,
+) -> Optional[models.TrackedFencer]:
+    result = await db.execute(
+        select(models.TrackedFencer).where(
+            models.TrackedFencer.user_id == user_id,
+            models.TrackedFencer.fencer_id == fencer_id,
+        )
+    )
+    return result.scalars().one_or_none()
+
+
+async def get_all_tracked_fencers_for_user(
+    db: AsyncSession,
+    user_id: int,
+    active_only: bool = True,
+) -> List[models.TrackedFencer]:
+    query = select(models.TrackedFencer).where(models.TrackedFencer.user_id == user_id)
+    if active_only:
+        query = query.where(models.TrackedFencer.active == True)
+    result = await db.execute(query.order_by(models.TrackedFencer.created_at.desc()))
+    return list(result.scalars().all())
+
+
+async def update_tracked_fencer(
+    db: AsyncSession,
+    tracked_fencer: models.TrackedFencer,
+    display_name: Optional[str] = None,
+    weapon_filter: Optional[str] = None,
+) -> models.TrackedFencer:
+    if display_name is not None:
+        tracked_fencer.display_name = display_name
+    if weapon_filter is not None:
+        tracked_fencer.weapon_filter = weapon_filter
+    await db.flush()
+    return tracked_fencer
+
+
+async def deactivate_tracked_fencer(
+    db: AsyncSession,
+    tracked_fencer: models.TrackedFencer,
+) -> models.TrackedFencer:
+    tracked_fencer.active = False
+    await db.flush()
+    return tracked_fencer
+
+
+# Dashboard counters and page versions
+
+
+async def get_user_data_version(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(select(models.User.data_version).where(models.User.id == user_id))
+    return result.scalar_one_or_none() or 0
+
+
+async def get_tracking_counts(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """
+    Count a user's active and inactive tracked clubs and fencers in one query.
+
+    Returns a dict with ``active_clubs``, ``inactive_clubs``, ``active_fencers``
+    and ``inactive_fencers``. Both halves are answered from the
+    ``(user_id, active, created_at)`` indexes without loading any rows.
+    """
+    clubs = (
+        select(literal("clubs").label("kind"), models.TrackedClub.active, func.count().label("total"))
+        .where(models.TrackedClub.user_id == user_id)
+        .group_by(models.TrackedClub.active)
+    )
+    fencers = (
+        select(literal("fencers").label("kind"), models.TrackedFencer.active, func.count().label("total"))
+        .where(models.TrackedFencer.user_id == user_id)
+        .group_by(models.TrackedFencer.active)
+    )
+
+    counts = {"active_clubs": 0, "inactive_clubs": 0, "active_fencers": 0, "inactive_fencers": 0}
+    result = await db.execute(union_all(clubs, fencers))
+    for kind, active, total in result:
+        counts[f"{'active' if active else 'inactive'}_{kind}"] = total
+    return counts
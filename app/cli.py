@@ -0,0 +1,533 @@
+"""Command line entry point: ``python -m app.cli <command>``.
+
+Commands are often one-shot cron jobs, so module import stays light: the
+scrapers, mail client, APScheduler and password hashing are imported inside
+the commands and jobs that use them.
+"""
+
+import logging
+import os
+from datetime import UTC, datetime
+from typing import List, Optional
+
+import typer
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before app modules read their settings
+load_dotenv()
+
+from . import crud
+from .database import SessionLocal, get_db, init_db
+
+cli = typer.Typer()
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCRAPE_INTERVAL_MINUTES = 30
+ALERT_DISPATCH_INTERVAL_MINUTES = 1
+SESSION_SWEEP_INTERVAL_MINUTES = 60
+
+
+def _parse_club_urls(raw: Optional[str]) -> List[str]:
+    if not raw:
+        return []
+
+    return [url.strip() for url in raw.split(',') if url.strip()]
+
+
+def _resolve_interval(value: Optional[str], fallback: int) -> int:
+    if value is None:
+        return fallback
+
+    try:
+        minutes = int(value)
+    except ValueError as exc:
+        raise ValueError("SCRAPER_INTERVAL_MINUTES must be an integer") from exc
+
+    if minutes <= 0:
+        raise ValueError("SCRAPER_INTERVAL_MINUTES must be greater than 0")
+
+    return minutes
+
+
+def _configured_interval(interval: Optional[int]) -> int:
+    """Resolve the scrape interval from ``--interval`` or the environment."""
+    if interval is not None and interval <= 0:
+        raise typer.BadParameter("--interval must be greater than 0")
+
+    try:
+        return interval or _resolve_interval(
+            os.getenv("SCRAPER_INTERVAL_MINUTES"), DEFAULT_SCRAPE_INTERVAL_MINUTES
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+def _run_scrape_job(club_url: str) -> None:
+    from .services import scraper_service
+
+    session = SessionLocal()
+
+    try:
+        stats = scraper_service.scrape_and_persist(session, club_url)
+        logger.info(
+            "Scrape finished for %s (new=%s updated=%s total=%s)",
+            club_url,
+            stats["new"],
+            stats["updated"],
+            stats["total"],
+        )
+    except Exception:  # pragma: no cover - logged for ops visibility
+        logger.exception("Scrape failed for %s", club_url)
+    finally:
+        session.close()
+
+
+def _run_club_scrape_cycle(club_urls: List[str]) -> None:
+    """Scrape every tracked or configured club once, then deliver the alerts they produced."""
+    from .services import scraper_service
+
+    session = SessionLocal()
+
+    try:
+        targets = scraper_service.resolve_club_targets(session, club_urls)
+    except Exception:  # pragma: no cover - logged for ops visibility
+        logger.exception("Could not load club scrape targets")
+        return
+    finally:
+        session.close()
+
+    logger.info("Scraping %d club(s)", len(targets))
+    for club_url in targets:
+        _run_scrape_job(club_url)
+    _run_alert_dispatch_job()
+
+
+def _run_fencer_scrape_job() -> None:
+    """Scrape all active tracked fencers."""
+    from .services import fencer_scraper_service
+
+    session = SessionLocal()
+
+    try:
+        stats = fencer_scraper_service.scrape_all_tracked_fencers(session)
+        if stats["enabled"]:
+            logger.info(
+                "Fencer scrape finished (scraped=%s skipped=%s failed=%s total_registrations=%s)",
+                stats["fencers_scraped"],
+                stats["fencers_skipped"],
+                stats["fencers_failed"],
+                stats["total_registrations"],
+            )
+        else:
+            logger.info("Fencer scraping disabled")
+    except Exception:  # pragma: no cover - logged for ops visibility
+        logger.exception("Fencer scrape failed")
+    finally:
+        session.close()
+
+
+def _run_scrape_node_cycle(
+    worker_id: str,
+    club_urls: List[str],
+    interval: int,
+    batch_size: int,
+) -> None:
+    """Sync the scrape task queue with the configured targets and work off due tasks."""
+    from functools import partial
+
+    from .services import fencer_scraper_service, scrape_queue_service, scraper_service
+
+    session = SessionLocal()
+
+    try:
+        scrape_queue_service.sync_targets(
+            session,
+            scrape_queue_service.KIND_CLUB,
+            scraper_service.resolve_club_targets(session, club_urls),
+        )
+        club_stats = scrape_queue_service.process_due_tasks(
+            session,
+            scrape_queue_service.KIND_CLUB,
+            scraper_service.scrape_and_persist,
+            worker_id,
+            interval,
+            limit=batch_size,
+        )
+        if club_stats["succeeded"]:
+            _run_alert_dispatch_job()
+
+        if fencer_scraper_service.FENCER_SCRAPE_ENABLED:
+            scrape_queue_service.sync_targets(
+                session, scrape_queue_service.KIND_FENCER, crud.get_active_tracked_fencer_ids(session)
+            )
+            scrape_queue_service.process_due_tasks(
+                session,
+                scrape_queue_service.KIND_FENCER,
+                partial(fencer_scraper_service.scrape_tracked_fencer, throttle=True),
+                worker_id,
+                interval,
+                limit=batch_size,
+            )
+    except Exception:  # pragma: no cover - logged for ops visibility
+        session.rollback()
+        logger.exception("Scrape node cycle failed")
+    finally:
+        session.close()
+
+
+def _run_alert_dispatch_job() -> None:
+    """Deliver queued instant alerts."""
+    from .services import alert_service
+
+    session = SessionLocal()
+
+    try:
+        alert_service.dispatch_pending_alerts(session)
+    except Exception:  # pragma: no cover - logged for ops visibility
+        session.rollback()
+        logger.exception("Alert dispatch failed")
+    finally:
+        session.close()
+
+
+def _run_session_sweep_job() -> None:
+    """Delete expired user sessions."""
+    from .services import auth_service
+
+    session = SessionLocal()
+
+    try:
+        auth_service.sweep_expired_sessions(session)
+    except Exception:  # pragma: no cover - logged for ops visibility
+        session.rollback()
+        logger.exception("Session sweep failed")
+    finally:
+        session.close()
+
+
+def _start_metrics_server() -> None:
+    """Expose this process's metrics on METRICS_PORT, if set."""
+    from .services import metrics_service
+
+    metrics_service.start_http_server()
+
+
+@cli.command()
+def db_init():
+    """Initialize the database and create tables."""
+    typer.echo("Initializing database...")
+    init_db()
+    typer.echo("Database initialized.")
+
+
+@cli.command()
+def scrape(
+    club_url: str = typer.Argument(
+        ..., help="The URL of the club registration page on fencingtracker.com"
+    )
+):
+    """Run the scraper for a specific club URL."""
+    from .services import scraper_service
+
+    typer.echo(f"Scraping registrations from {club_url}")
+    db = next(get_db())
+    try:
+        result = scraper_service.scrape_and_persist(db, club_url)
+        typer.echo(
+            f"Scraping complete. Total: {result['total']}, New: {result['new']}, Updated: {result['updated']}"
+        )
+    finally:
+        db.close()
+
+    _run_alert_dispatch_job()
+
+
+@cli.command()
+def send_test_email(recipient: str = typer.Argument(None, help="Optional recipient email address")):
+    """Send a test email via Mailgun to verify configuration."""
+    from .services.mailgun_client import NotificationError
+    from .services.notification_service import send_registration_notification
+
+    typer.echo("Sending test email...")
+
+    try:
+        recipients = [recipient] if recipient else None
+        message_id = send_registration_notification(
+            fencer_name="Test Fencer",
+            tournament_name="Test Tournament",
+            events="Test Event",
+            source_url="https://example.com/test",
+            recipients=recipients,
+        )
+        typer.echo(f"Test email sent successfully. Message ID: {message_id}")
+    except NotificationError as e:
+        typer.echo(f"Failed to send test email: {e}", err=True)
+        raise typer.Exit(1)
+    except Exception as e:
+        typer.echo(f"Unexpected error: {e}", err=True)
+        raise typer.Exit(1)
+
+
+@cli.command("schedule")
+def schedule_scraper(
+    club_url: Optional[List[str]] = typer.Option(
+        None,
+        "--club-url",
+        "-u",
+        help="Extra club registration URL to scrape besides tracked clubs. Provide multiple times for more than one club.",
+    ),
+    interval: Optional[int] = typer.Option(
+        None,
+        "--interval",
+        "-i",
+        help="Minutes between scrapes. Defaults to SCRAPER_INTERVAL_MINUTES env var or 30.",
+    ),
+    run_now: bool = typer.Option(
+        True,
+        "--run-now/--no-run-now",
+        help="Scrape immediately before scheduling recurring jobs.",
+    ),
+):
+    """Run APScheduler to scrape tracked clubs and fencers at a fixed interval."""
+
+    urls = club_url or _parse_club_urls(os.getenv("SCRAPER_CLUB_URLS"))
+    configured_interval = _configured_interval(interval)
+
+    typer.echo(
+        f"Scheduling tracked clubs and {len(urls)} configured club(s) every {configured_interval} minute(s)"
+    )
+    init_db()
+    _start_metrics_server()
+
+    if run_now:
+        typer.echo("Running initial scrape...")
+        _run_club_scrape_cycle(urls)
+
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
+    scheduler = BlockingScheduler()
+
+    # Targets are re-read from tracked clubs on every run
+    scheduler.add_job(
+        _run_club_scrape_cycle,
+        "interval",
+        minutes=configured_interval,
+        args=[urls],
+        id="scrape_clubs",
+        next_run_time=datetime.now(UTC),
+    )
+    typer.echo(f"Scheduled club scraping job (interval: {configured_interval} minutes)")
+
+    # Add fencer scraping job (runs on same interval as club scraping)
+    scheduler.add_job(
+        _run_fencer_scrape_job,
+        "interval",
+        minutes=configured_interval,
+        id="scrape_fencers",
+        next_run_time=datetime.now(UTC),
+    )
+    typer.echo(f"Scheduled fencer scraping job (interval: {configured_interval} minutes)")
+
+    scheduler.add_job(
+        _run_alert_dispatch_job,
+        "interval",
+        minutes=ALERT_DISPATCH_INTERVAL_MINUTES,
+        id="dispatch_alerts",
+    )
+    typer.echo(f"Scheduled alert dispatch job (interval: {ALERT_DISPATCH_INTERVAL_MINUTES} minute)")
+
+    scheduler.add_job(
+        _run_session_sweep_job,
+        "interval",
+        minutes=SESSION_SWEEP_INTERVAL_MINUTES,
+        id="sweep_sessions",
+        next_run_time=datetime.now(UTC),
+    )
+    typer.echo(f"Scheduled session sweep job (interval: {SESSION_SWEEP_INTERVAL_MINUTES} minutes)")
+
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        typer.echo("Scheduler stopped")
+
+
+@cli.command("worker")
+def run_worker_command(
+    club_url: Optional[List[str]] = typer.Option(
+        None,
+        "--club-url",
+        "-u",
+        help="Extra club registration URL to scrape besides tracked clubs. Provide multiple times for more than one club.",
+    ),
+    interval: Optional[int] = typer.Option(
+        None,
+        "--interval",
+        "-i",
+        help="Minutes between scrapes. Defaults to SCRAPER_INTERVAL_MINUTES env var or 30.",
+    ),
+    run_now: bool = typer.Option(
+        True,
+        "--run-now/--no-run-now",
+        help="Run the scrape and session sweep jobs immediately on startup.",
+    ),
+    scrape: bool = typer.Option(
+        True,
+        "--scrape/--no-scrape",
+        help="Schedule the club and fencer scrapes. Use --no-scrape when scrape-node processes do the scraping.",
+    ),
+):
+    """Run every background job (scrapes, digests, alerts, session sweep) in one process."""
+    import asyncio
+
+    from . import worker
+
+    urls = club_url or _parse_club_urls(os.getenv("SCRAPER_CLUB_URLS"))
+    configured_interval = _configured_interval(interval)
+    if not scrape:
+        typer.echo("Scraping is left to scrape-node processes")
+
+    init_db()
+    _start_metrics_server()
+    typer.echo(f"Starting worker (scrape interval: {configured_interval} minutes)")
+    asyncio.run(worker.run_worker(urls, configured_interval, run_now=run_now, scrape=scrape))
+    typer.echo("Worker stopped")
+
+
+@cli.command("scrape-node")
+def run_scrape_node(
+    club_url: Optional[List[str]] = typer.Option(
+        None,
+        "--club-url",
+        "-u",
+        help="Extra club registration URL to scrape besides tracked clubs. Provide multiple times for more than one club.",
+    ),
+    interval: Optional[int] = typer.Option(
+        None,
+        "--interval",
+        "-i",
+        help="Minutes between scrapes of each target. Defaults to SCRAPER_INTERVAL_MINUTES env var or 30.",
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None,
+        "--batch-size",
+        "-b",
+        help="Tasks claimed per kind per cycle. Defaults to SCRAPE_TASK_BATCH_SIZE env var or 10.",
+    ),
+    once: bool = typer.Option(False, "--once", help="Run a single cycle and exit."),
+):
+    """Scrape club and fencer targets from the shared task queue; run one per machine to scale out."""
+    import time
+
+    from .services import scrape_queue_service
+
+    urls = club_url or _parse_club_urls(os.getenv("SCRAPER_CLUB_URLS"))
+    configured_interval = _configured_interval(interval)
+    if batch_size is not None and batch_size <= 0:
+        raise typer.BadParameter("--batch-size must be greater than 0")
+
+    init_db()
+    _start_metrics_server()
+    worker_id = scrape_queue_service.default_worker_id()
+    typer.echo(f"Starting scrape node {worker_id} (scrape interval: {configured_interval} minutes)")
+
+    try:
+        while True:
+            _run_scrape_node_cycle(
+                worker_id,
+                urls,
+                configured_interval,
+                batch_size or scrape_queue_service.SCRAPE_TASK_BATCH_SIZE,
+            )
+            if once:
+                break
+            time.sleep(scrape_queue_service.SCRAPE_POLL_SEC)
+    except KeyboardInterrupt:
+        typer.echo("Scrape node stopped")
+
+
+@cli.command("digest-scheduler")
+def run_digest_scheduler():
+    """Start the daily digest scheduler."""
+    from .services import digest_service
+
+    init_db()
+    _start_metrics_server()
+    digest_service.start_digest_scheduler()
+
+
+@cli.command("send-user-digest")
+def send_user_digest_command(user_id: int = typer.Argument(..., help="ID of the user to send a digest to")):
+    """Generate and send a digest email for a single user."""
+    from .services import digest_service
+    from .services.mailgun_client import NotificationError
+
+    session = SessionLocal()
+    try:
+        user = crud.get_user_by_id(session, user_id)
+        if not user:
+            typer.echo(f"User {user_id} not found", err=True)
+            raise typer.Exit(1)
+
+        try:
+            sent = digest_service.send_user_digest(session, user)
+            session.commit()
+        except NotificationError as exc:
+            session.rollback()
+            typer.echo(f"Failed to send digest: {exc}", err=True)
+            raise typer.Exit(1)
+
+        if sent:
+            typer.echo("Digest sent")
+        else:
+            typer.echo("No new registrations found; email not sent")
+    finally:
+        session.close()
+
+
+@cli.command("cleanup-sessions")
+def cleanup_sessions_command():
+    """Delete expired user sessions."""
+    from .services import auth_service
+
+    session = SessionLocal()
+    try:
+        removed = auth_service.sweep_expired_sessions(session)
+        typer.echo(f"Removed {removed} expired session(s)")
+    finally:
+        session.close()
+
+
+@cli.command("create-admin")
+def create_admin(
+    username: str = typer.Argument(..., help="Username for the admin account"),
+    email: str = typer.Argument(..., help="Email address for the admin user"),
+    password: str = typer.Option(
+        ..., "--password", "-p", prompt=True, hide_input=True, confirmation_prompt=True, help="Password for the admin user"
+    ),
+):
+    """Create an initial admin account via the CLI."""
+    from .services import auth_service
+
+    session = SessionLocal()
+    try:
+        existing = crud.get_user_by_username(session, username)
+        if existing:
+            typer.echo("User already exists; cannot create admin with duplicate username", err=True)
+            raise typer.Exit(1)
+
+        password_hash = auth_service.hash_password(password)
+        user = crud.create_user(
+            session,
+            username=username,
+            email=email,
+            password_hash=password_hash,
+            is_admin=True,
+        )
+        session.commit()
+        typer.echo(f"Admin user created with id {user.id}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    cli()
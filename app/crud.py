@@ -1,7 +1,11 @@
-from datetime import UTC, datetime
-from typing import List, Optional
-
-from sqlalchemy import func
+import csv
+import io
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
@@ -62,6 +66,46 @@ def update_or_create_registration(
         tuple[Registration, bool]: The registration object and a boolean indicating
         if it was newly created (True if new, False if it already existed).
     """
+    registration, created, _ = upsert_registration_event(db, fencer, tournament, events, club_url)
+    return registration, created
+
+
+def _add_event(registration: models.Registration, events: str, club_url: str) -> bool:
+    """Append ``events`` to an existing registration; returns True if the event list changed."""
+    existing_events = registration.events
+    changed = False
+    # If events field doesn't already contain this event, append it
+    if existing_events and events and events not in existing_events.split(", "):
+        # Append the new event to existing events (comma-separated)
+        registration.events = f"{existing_events}, {events}"
+        changed = True
+    elif not existing_events and events:
+        # No existing events, set it
+        registration.events = events
+        changed = True
+    # Otherwise, event already in the list, just update timestamp
+
+    if not registration.club_url:
+        registration.club_url = club_url
+    registration.last_seen_at = datetime.now(UTC)
+    return changed
+
+
+def upsert_registration_event(
+    db: Session,
+    fencer: models.Fencer,
+    tournament: models.Tournament,
+    events: str,
+    club_url: str,
+) -> Tuple[models.Registration, bool, bool]:
+    """
+    ``update_or_create_registration`` that also reports whether the events changed.
+
+    Returns:
+        Tuple[Registration, bool, bool]: The registration, whether it was newly
+        created, and whether it is new or gained an event (False when a scrape
+        only refreshed ``last_seen_at``).
+    """
     registration = db.query(models.Registration).filter(
         models.Registration.fencer_id == fencer.id,
         models.Registration.tournament_id == tournament.id,
@@ -69,21 +113,9 @@ def update_or_create_registration(
 
     if registration:
         # Update existing registration
-        # If events field doesn't already contain this event, append it
-        existing_events = registration.events
-        if existing_events and events and events not in existing_events:
-            # Append the new event to existing events (comma-separated)
-            registration.events = f"{existing_events}, {events}"
-        elif not existing_events:
-            # No existing events, set it
-            registration.events = events
-        # Otherwise, event already in the list, just update timestamp
-
-        if not registration.club_url:
-            registration.club_url = club_url
-        registration.last_seen_at = datetime.now(UTC)
+        changed = _add_event(registration, events, club_url)
         db.flush()
-        return registration, False
+        return registration, False, changed
     else:
         # Create new registration
         registration = models.Registration(
@@ -106,20 +138,153 @@ def update_or_create_registration(
             ).first()
             if registration:
                 # Update the existing registration instead
-                existing_events = registration.events
-                if existing_events and events and events not in existing_events:
-                    registration.events = f"{existing_events}, {events}"
-                elif not existing_events:
-                    registration.events = events
-                if not registration.club_url:
-                    registration.club_url = club_url
-                registration.last_seen_at = datetime.now(UTC)
+                changed = _add_event(registration, events, club_url)
                 db.flush()
-                return registration, False
+                return registration, False, changed
             else:
                 # Still doesn't exist? Re-raise the error
                 raise
-        return registration, True
+        return registration, True, True
+
+
+# (fencer_name, tournament_name, event_date, event_name) as parsed from a club page
+ScrapedRow = Tuple[str, str, str, str]
+
+
+def is_postgres(db: Session) -> bool:
+    """Return True when the session is bound to a PostgreSQL database."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _copy_rows(db: Session, rows: List[ScrapedRow]) -> None:
+    """Stream rows into the ``registration_stage`` temp table with COPY."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for seq, row in enumerate(rows):
+        writer.writerow((seq, *row))
+    buffer.seek(0)
+
+    copy_sql = (
+        "COPY registration_stage (seq, fencer_name, tournament_name, event_date, event_name) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    cursor = db.connection().connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2
+            cursor.copy_expert(copy_sql, buffer)
+        else:
+            # psycopg 3
+            with cursor.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+def bulk_ingest_registrations(db: Session, rows: List[ScrapedRow], club_url: str) -> Tuple[List[int], int]:
+    """
+    Upsert a page of scraped rows with COPY and set-based statements (PostgreSQL only).
+
+    Rows are copied into a transaction-scoped temp table, then fencers,
+    tournaments and registrations are merged with ``INSERT ... ON CONFLICT``.
+    Events are appended to existing registrations the same way
+    ``update_or_create_registration`` does.
+
+    Returns:
+        Tuple[List[int], int]: IDs of registrations that were newly created, and
+        the number of registrations that were created or gained an event.
+    """
+    db.execute(text(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS registration_stage (
+            seq integer NOT NULL,
+            fencer_name text NOT NULL,
+            tournament_name text NOT NULL,
+            event_date text NOT NULL,
+            event_name text NOT NULL
+        ) ON COMMIT DROP
+        """
+    ))
+    # The table outlives this call until commit; drop rows from an earlier page
+    db.execute(text("TRUNCATE registration_stage"))
+    _copy_rows(db, rows)
+
+    db.execute(text(
+        """
+        INSERT INTO fencers (name)
+        SELECT DISTINCT fencer_name FROM registration_stage
+        ON CONFLICT (name) DO NOTHING
+        """
+    ))
+    db.execute(text(
+        """
+        INSERT INTO tournaments (name, date)
+        SELECT DISTINCT ON (tournament_name) tournament_name, event_date
+        FROM registration_stage
+        ORDER BY tournament_name, seq
+        ON CONFLICT (name) DO NOTHING
+        """
+    ))
+
+    result = db.execute(
+        text(
+            """
+            WITH staged AS (
+                SELECT f.id AS fencer_id, t.id AS tournament_id, s.event_name, min(s.seq) AS seq
+                FROM registration_stage s
+                JOIN fencers f ON f.name = s.fencer_name
+                JOIN tournaments t ON t.name = s.tournament_name
+                GROUP BY f.id, t.id, s.event_name
+            ),
+            merged AS (
+                SELECT
+                    staged.fencer_id,
+                    staged.tournament_id,
+                    coalesce(
+                        string_agg(staged.event_name, ', ' ORDER BY staged.seq)
+                            FILTER (
+                                WHERE r.events IS NULL
+                                OR NOT (staged.event_name = ANY(string_to_array(r.events, ', ')))
+                            ),
+                        ''
+                    ) AS new_events
+                FROM staged
+                LEFT JOIN registrations r
+                    ON r.fencer_id = staged.fencer_id AND r.tournament_id = staged.tournament_id
+                GROUP BY staged.fencer_id, staged.tournament_id
+            ),
+            upserted AS (
+                INSERT INTO registrations (fencer_id, tournament_id, events, club_url, created_at, last_seen_at)
+                SELECT
+                    fencer_id,
+                    tournament_id,
+                    new_events,
+                    :club_url,
+                    timezone('utc', now()),
+                    timezone('utc', now())
+                FROM merged
+                ON CONFLICT (fencer_id, tournament_id) DO UPDATE SET
+                    events = CASE
+                        WHEN excluded.events = '' THEN registrations.events
+                        WHEN coalesce(registrations.events, '') = '' THEN excluded.events
+                        ELSE registrations.events || ', ' || excluded.events
+                    END,
+                    club_url = coalesce(nullif(registrations.club_url, ''), excluded.club_url),
+                    last_seen_at = excluded.last_seen_at
+                RETURNING id, fencer_id, tournament_id, (xmax = 0) AS inserted
+            )
+            SELECT upserted.id, upserted.inserted, merged.new_events <> '' AS changed
+            FROM upserted
+            JOIN merged
+                ON merged.fencer_id = upserted.fencer_id AND merged.tournament_id = upserted.tournament_id
+            """
+        ),
+        {"club_url": club_url},
+    )
+    rows = result.all()
+    new_ids = [row.id for row in rows if row.inserted]
+    changed_count = sum(1 for row in rows if row.inserted or row.changed)
+    return new_ids, changed_count
 
 
 # User CRUD operations
@@ -176,6 +341,56 @@ def update_user(db: Session, user_id: int, **kwargs) -> models.User:
     return user
 
 
+# (user, tracked club count, tracked fencer count) for the admin user list
+UserWithCounts = Tuple[models.User, int, int]
+
+
+def _users_with_counts_query(db: Session):
+    """Users alongside their tracked club/fencer counts as correlated subqueries."""
+    club_count = (
+        db.query(func.count(models.TrackedClub.id))
+        .filter(models.TrackedClub.user_id == models.User.id)
+        .correlate(models.User)
+        .scalar_subquery()
+    )
+    fencer_count = (
+        db.query(func.count(models.TrackedFencer.id))
+        .filter(models.TrackedFencer.user_id == models.User.id)
+        .correlate(models.User)
+        .scalar_subquery()
+    )
+    return db.query(models.User, club_count, fencer_count)
+
+
+def get_users_with_counts(
+    db: Session,
+    search: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = 50,
+) -> List[UserWithCounts]:
+    """
+    Return one page of users, newest first, with their tracking counts.
+
+    ``search`` matches a substring of the username or email. Pages are keyed
+    on the user id: pass the last id of the previous page as ``before_id``.
+    """
+    query = _users_with_counts_query(db)
+    if search:
+        pattern = f"%{search}%"
+        query = query.filter(
+            or_(models.User.username.ilike(pattern), models.User.email.ilike(pattern))
+        )
+    if before_id is not None:
+        query = query.filter(models.User.id < before_id)
+    rows = query.order_by(models.User.id.desc()).limit(limit).all()
+    return [tuple(row) for row in rows]
+
+
+def get_user_with_counts(db: Session, user_id: int) -> Optional[UserWithCounts]:
+    row = _users_with_counts_query(db).filter(models.User.id == user_id).one_or_none()
+    return tuple(row) if row else None
+
+
 # Session management
 
 
@@ -205,6 +420,16 @@ def get_session(db: Session, session_token: str) -> Optional[models.UserSession]
     )
 
 
+def get_session_with_user(db: Session, session_token: str) -> Optional[models.UserSession]:
+    """Fetch a session and its user in a single joined query."""
+    return (
+        db.query(models.UserSession)
+        .options(joinedload(models.UserSession.user))
+        .filter(models.UserSession.session_token == session_token)
+        .one_or_none()
+    )
+
+
 def delete_session(db: Session, session_token: str) -> None:
     session = (
         db.query(models.UserSession)
@@ -216,10 +441,61 @@ def delete_session(db: Session, session_token: str) -> None:
         db.flush()
 
 
-def cleanup_expired_sessions(db: Session) -> int:
+def delete_session_by_id(db: Session, session_id: int) -> None:
     deleted = (
         db.query(models.UserSession)
-        .filter(models.UserSession.expires_at < datetime.now(UTC))
+        .filter(models.UserSession.id == session_id)
+        .delete(synchronize_session=False)
+    )
+    if deleted:
+        db.flush()
+
+
+def delete_user_sessions(db: Session, user_id: int) -> int:
+    """Delete every session belonging to ``user_id``; returns the number removed."""
+    deleted = (
+        db.query(models.UserSession)
+        .filter(models.UserSession.user_id == user_id)
+        .delete(synchronize_session=False)
+    )
+    if deleted:
+        db.flush()
+    return deleted
+
+
+def create_session_revocation(
+    db: Session,
+    revoked_at: datetime,
+    expires_at: datetime,
+    session_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+) -> models.RevokedSession:
+    """Record that one session, or every session of a user, is revoked until ``expires_at``."""
+    revocation = models.RevokedSession(
+        session_id=session_id,
+        user_id=user_id,
+        revoked_at=revoked_at,
+        expires_at=expires_at,
+    )
+    db.add(revocation)
+    db.flush()
+    return revocation
+
+
+def get_active_session_revocations(db: Session, now: datetime) -> List[models.RevokedSession]:
+    """Return revocations whose tokens may still be presented (not yet expired)."""
+    return (
+        db.query(models.RevokedSession)
+        .filter(models.RevokedSession.expires_at > now)
+        .all()
+    )
+
+
+def cleanup_expired_session_revocations(db: Session, now: datetime) -> int:
+    """Delete revocations whose tokens have expired; returns the number removed."""
+    deleted = (
+        db.query(models.RevokedSession)
+        .filter(models.RevokedSession.expires_at <= now)
         .delete(synchronize_session=False)
     )
     if deleted:
@@ -227,6 +503,27 @@ def cleanup_expired_sessions(db: Session) -> int:
     return deleted
 
 
+def cleanup_expired_sessions(db: Session, limit: Optional[int] = None) -> int:
+    """Delete expired sessions, at most ``limit`` rows when given."""
+    query = db.query(models.UserSession).filter(
+        models.UserSession.expires_at < datetime.now(UTC)
+    )
+    if limit is not None:
+        expired_ids = (
+            db.query(models.UserSession.id)
+            .filter(models.UserSession.expires_at < datetime.now(UTC))
+            .order_by(models.UserSession.expires_at)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        query = db.query(models.UserSession).filter(models.UserSession.id.in_(expired_ids))
+
+    deleted = query.delete(synchronize_session=False)
+    if deleted:
+        db.flush()
+    return deleted
+
+
 # Tracked club operations
 
 
@@ -324,6 +621,32 @@ def deactivate_tracked_club(db: Session, tracked_club_id: int) -> None:
         db.flush()
 
 
+def get_active_tracked_club_urls(db: Session) -> List[str]:
+    """Distinct club URLs tracked by at least one user (each is scraped once)."""
+    rows = (
+        db.query(models.TrackedClub.club_url)
+        .filter(models.TrackedClub.active == True)
+        .distinct()
+        .order_by(models.TrackedClub.club_url)
+        .all()
+    )
+    return [row.club_url for row in rows]
+
+
+def bump_data_versions_for_club(db: Session, club_url: str) -> None:
+    """Bump the data version of every user actively tracking ``club_url``."""
+    trackers = (
+        db.query(models.TrackedClub.user_id)
+        .filter(models.TrackedClub.club_url == club_url, models.TrackedClub.active.is_(True))
+    )
+    db.execute(
+        update(models.User)
+        .where(models.User.id.in_(trackers.scalar_subquery()))
+        .values(data_version=models.User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
 # Registration queries for digests
 
 
@@ -345,19 +668,6 @@ def get_registrations_by_club_url(
     return query.all()
 
 
-def get_registration_counts_for_users(db: Session) -> List[dict]:
-    rows = (
-        db.query(
-            models.User.id.label("user_id"),
-            func.count(models.TrackedClub.id).label("tracked_club_count"),
-        )
-        .outerjoin(models.TrackedClub, models.User.id == models.TrackedClub.user_id)
-        .group_by(models.User.id)
-        .all()
-    )
-    return [dict(row._mapping) for row in rows]
-
-
 # Tracked fencer operations
 
 
@@ -428,6 +738,31 @@ def get_all_active_tracked_fencers(db: Session) -> List[models.TrackedFencer]:
     )
 
 
+def get_active_tracked_fencer_ids(db: Session) -> List[str]:
+    """Distinct fencer IDs tracked by at least one user (each is scraped once)."""
+    rows = (
+        db.query(models.TrackedFencer.fencer_id)
+        .filter(models.TrackedFencer.active == True)
+        .distinct()
+        .order_by(models.TrackedFencer.fencer_id)
+        .all()
+    )
+    return [row.fencer_id for row in rows]
+
+
+def get_active_tracked_fencers_by_fencer_id(db: Session, fencer_id: str) -> List[models.TrackedFencer]:
+    """Every user's active tracking row for one fencer."""
+    return (
+        db.query(models.TrackedFencer)
+        .filter(
+            models.TrackedFencer.fencer_id == fencer_id,
+            models.TrackedFencer.active == True,
+        )
+        .order_by(models.TrackedFencer.id)
+        .all()
+    )
+
+
 def update_tracked_fencer(
     db: Session,
     tracked_fencer: models.TrackedFencer,
@@ -487,3 +822,260 @@ def get_registrations_for_fencer(
     if since is not None:
         query = query.filter(models.Registration.created_at >= since)
     return query.all()
+
+
+# Instant alert operations
+
+
+def get_active_club_subscriptions(db: Session) -> List[tuple]:
+    """Return (club_url, user_id, email, weapon_filter) for every active club subscription."""
+    return (
+        db.query(
+            models.TrackedClub.club_url,
+            models.User.id,
+            models.User.email,
+            models.TrackedClub.weapon_filter,
+        )
+        .join(models.User, models.User.id == models.TrackedClub.user_id)
+        .filter(
+            models.TrackedClub.active.is_(True),
+            models.User.is_active.is_(True),
+        )
+        .all()
+    )
+
+
+def get_active_fencer_subscriptions(db: Session) -> List[tuple]:
+    """Return (fencer_id, user_id, email, weapon_filter) for every active fencer subscription."""
+    return (
+        db.query(
+            models.TrackedFencer.fencer_id,
+            models.User.id,
+            models.User.email,
+            models.TrackedFencer.weapon_filter,
+        )
+        .join(models.User, models.User.id == models.TrackedFencer.user_id)
+        .filter(
+            models.TrackedFencer.active.is_(True),
+            models.User.is_active.is_(True),
+        )
+        .all()
+    )
+
+
+def create_instant_alert(
+    db: Session,
+    user_id: int,
+    registration_id: int,
+    recipient: str,
+    subject: str,
+    body: str,
+) -> models.InstantAlert:
+    alert = models.InstantAlert(
+        user_id=user_id,
+        registration_id=registration_id,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+    )
+    db.add(alert)
+    db.flush()
+    return alert
+
+
+def claim_instant_alerts(
+    db: Session,
+    limit: int,
+    now: datetime,
+    stale_before: datetime,
+) -> List[models.InstantAlert]:
+    """
+    Mark up to ``limit`` pending alerts as ``sending`` for this dispatcher with one UPDATE.
+
+    Alerts left in ``sending`` since before ``stale_before`` (their dispatcher
+    died mid-batch) are claimed again. As with ``claim_scrape_tasks``, the
+    UPDATE repeats the claimable condition so racing dispatchers never claim
+    the same row, and PostgreSQL skips rows another dispatcher has locked.
+    """
+    claimable = or_(
+        models.InstantAlert.status == "pending",
+        and_(
+            models.InstantAlert.status == "sending",
+            models.InstantAlert.claimed_at < stale_before,
+        ),
+    )
+    candidates = (
+        select(models.InstantAlert.id)
+        .where(claimable)
+        .order_by(models.InstantAlert.id)
+        .limit(limit)
+    )
+    if is_postgres(db):
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    claim_token = uuid.uuid4().hex
+    db.execute(
+        update(models.InstantAlert)
+        .where(models.InstantAlert.id.in_(candidates.scalar_subquery()), claimable)
+        .values(status="sending", claimed_at=now, claim_token=claim_token)
+        .execution_options(synchronize_session=False)
+    )
+
+    return (
+        db.query(models.InstantAlert)
+        .populate_existing()
+        .filter(models.InstantAlert.claim_token == claim_token)
+        .order_by(models.InstantAlert.id)
+        .all()
+    )
+
+
+# Scrape task queue operations
+
+
+def _lease_free(now: datetime):
+    return or_(
+        models.ScrapeTask.lease_expires_at.is_(None),
+        models.ScrapeTask.lease_expires_at < now,
+    )
+
+
+def sync_scrape_tasks(db: Session, kind: str, targets: Iterable[str], now: datetime) -> Tuple[int, int]:
+    """
+    Make the ``kind`` tasks match ``targets``.
+
+    Missing targets are inserted (due immediately); concurrent nodes inserting
+    the same target are absorbed by the (kind, target) unique constraint.
+    Tasks no longer wanted are deleted unless a node currently holds their
+    lease. Returns ``(added, removed)``.
+    """
+    wanted = set(targets)
+    existing = set(
+        db.execute(
+            select(models.ScrapeTask.target).where(models.ScrapeTask.kind == kind)
+        ).scalars()
+    )
+
+    added = 0
+    missing = sorted(wanted - existing)
+    if missing:
+        dialect_insert = postgresql.insert if is_postgres(db) else sqlite.insert
+        stmt = dialect_insert(models.ScrapeTask).values([
+            {"kind": kind, "target": target, "next_run_at": now, "attempts": 0, "created_at": now}
+            for target in missing
+        ]).on_conflict_do_nothing(index_elements=["kind", "target"])
+        added = db.execute(stmt).rowcount
+
+    removed = 0
+    stale = existing - wanted
+    if stale:
+        removed = db.execute(
+            delete(models.ScrapeTask)
+            .where(
+                models.ScrapeTask.kind == kind,
+                models.ScrapeTask.target.in_(stale),
+                _lease_free(now),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    return added, removed
+
+
+def claim_scrape_tasks(
+    db: Session,
+    kind: str,
+    worker_id: str,
+    limit: int,
+    lease_seconds: int,
+    now: datetime,
+) -> List[models.ScrapeTask]:
+    """
+    Lease up to ``limit`` due ``kind`` tasks to ``worker_id`` with one UPDATE.
+
+    The UPDATE repeats the due/unleased condition, so when two nodes race for
+    the same rows only one statement matches each row. On PostgreSQL the
+    candidate rows are locked with SKIP LOCKED so racing nodes pick disjoint
+    batches instead of waiting on each other. The claimed batch shares a fresh
+    lease token, used to renew and release it.
+    """
+    due = (
+        models.ScrapeTask.kind == kind,
+        models.ScrapeTask.next_run_at <= now,
+        _lease_free(now),
+    )
+    candidates = (
+        select(models.ScrapeTask.id)
+        .where(*due)
+        .order_by(models.ScrapeTask.next_run_at, models.ScrapeTask.id)
+        .limit(limit)
+    )
+    if is_postgres(db):
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    lease_token = uuid.uuid4().hex
+    db.execute(
+        update(models.ScrapeTask)
+        .where(models.ScrapeTask.id.in_(candidates.scalar_subquery()), *due)
+        .values(
+            lease_owner=worker_id,
+            lease_token=lease_token,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            last_started_at=now,
+            attempts=models.ScrapeTask.attempts + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    return (
+        db.query(models.ScrapeTask)
+        .populate_existing()
+        .filter(models.ScrapeTask.lease_token == lease_token)
+        .order_by(models.ScrapeTask.next_run_at, models.ScrapeTask.id)
+        .all()
+    )
+
+
+def renew_scrape_task_leases(db: Session, lease_token: str, lease_seconds: int, now: datetime) -> int:
+    """Extend every task still held under ``lease_token``; returns how many were renewed."""
+    return db.execute(
+        update(models.ScrapeTask)
+        .where(models.ScrapeTask.lease_token == lease_token)
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def release_scrape_task(
+    db: Session,
+    task_id: int,
+    lease_token: str,
+    next_run_at: datetime,
+    now: datetime,
+    result: Optional[str] = None,
+    error: Optional[str] = None,
+) -> bool:
+    """
+    Record the outcome of a leased task and hand it back to the queue.
+
+    Returns False when the lease was lost (it expired and another node took
+    the task), in which case nothing is written.
+    """
+    values = {
+        "lease_owner": None,
+        "lease_token": None,
+        "lease_expires_at": None,
+        "next_run_at": next_run_at,
+        "last_finished_at": now,
+        "last_error": error,
+    }
+    if error is None:
+        values["attempts"] = 0
+        values["last_result"] = result
+
+    return db.execute(
+        update(models.ScrapeTask)
+        .where(models.ScrapeTask.id == task_id, models.ScrapeTask.lease_token == lease_token)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
@@ -0,0 +1,52 @@
+"""Per-user data version backing the ETags of the user's pages.
+
+``users.data_version`` is incremented whenever something shown on a user's
+dashboard, club or fencer pages changes: their tracked clubs and fencers
+(including scrape status written by the fencer scraper), the user row
+itself, or registrations scraped for a club they track. Pages can then
+answer conditional requests by comparing a single integer.
+
+Changes to tracked entities are picked up automatically after every ORM
+flush, so no write path has to remember to bump the version. Registration
+changes are bumped explicitly by the club scraper through
+``crud.bump_data_versions_for_club``, only when a scrape creates a
+registration or adds an event to one.
+"""
+
+from typing import Iterable, Set
+
+from sqlalchemy import bindparam, text
+
+# Tables whose rows belong to a user through ``user_id``
+USER_OWNED_TABLES = ("tracked_clubs", "tracked_fencers")
+
+_BUMP = text(
+    "UPDATE users SET data_version = data_version + 1 WHERE id IN :user_ids"
+).bindparams(bindparam("user_ids", expanding=True))
+
+
+def bump(connection, user_ids: Iterable[int]) -> None:
+    """Increment the data version of ``user_ids`` on ``connection`` (or a Session)."""
+    user_ids = sorted(set(user_ids))
+    if user_ids:
+        connection.execute(_BUMP, {"user_ids": user_ids})
+
+
+def _affected_user_ids(session) -> Set[int]:
+    user_ids: Set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in USER_OWNED_TABLES:
+            owner = obj.user_id
+        elif table == "users" and obj in session.dirty:
+            owner = obj.id
+        else:
+            continue
+        if owner is not None and (obj not in session.dirty or session.is_modified(obj)):
+            user_ids.add(owner)
+    return user_ids
+
+
+def bump_after_flush(session, flush_context) -> None:
+    """``after_flush`` hook bumping the owners of every flushed tracked entity."""
+    bump(session.connection(), _affected_user_ids(session))
@@ -1,19 +1,134 @@
-from sqlalchemy import create_engine
+import os
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from .models import Base
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./fc_registration.db"
+# Database URL (matches the default used by Alembic in migrations/env.py)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fc_registration.db")
+
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE_SEC = int(os.getenv("DB_POOL_RECYCLE_SEC", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in {"1", "true", "yes"}
+
+# Async drivers used for the web layer's AsyncSession, keyed by backend name
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# SQLite tuning applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE_BYTES = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure WAL mode and caching for a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        # Negative cache_size is expressed in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_BYTES}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(database_url: str = SQLALCHEMY_DATABASE_URL) -> Engine:
+    """Create an engine for ``database_url`` with pool and SQLite tuning applied."""
+    url = make_url(database_url)
+    kwargs = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE_SEC,
+    }
+
+    if url.get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if url.database and url.database != ":memory:":
+            kwargs["pool_size"] = DB_POOL_SIZE
+            kwargs["max_overflow"] = DB_MAX_OVERFLOW
+    else:
+        kwargs["pool_size"] = DB_POOL_SIZE
+        kwargs["max_overflow"] = DB_MAX_OVERFLOW
+
+    db_engine = create_engine(url, **kwargs)
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+
+    return db_engine
+
+
+def to_async_url(database_url: str) -> URL:
+    """Return ``database_url`` rewritten to use the backend's async driver."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_db_engine(database_url: str = SQLALCHEMY_DATABASE_URL) -> AsyncEngine:
+    """Create an async engine for ``database_url`` with the same tuning as the sync engine."""
+    url = to_async_url(database_url)
+    kwargs = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE_SEC,
+    }
+    if url.database and url.database != ":memory:":
+        kwargs["pool_size"] = DB_POOL_SIZE
+        kwargs["max_overflow"] = DB_MAX_OVERFLOW
+
+    db_engine = create_async_engine(url, **kwargs)
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+    return db_engine
+
 
 # Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+engine = create_db_engine()
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine is created on first use so the CLI and scheduler do not
+# need the async drivers installed.
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Return the shared ``AsyncSession`` factory, creating the async engine if needed."""
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        _async_engine = create_async_db_engine()
+        # Objects stay usable after commit; lazy refreshes would need a greenlet
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (used on application shutdown)."""
+    global _async_engine, _async_session_factory
+    db_engine, _async_engine, _async_session_factory = _async_engine, None, None
+    if db_engine is not None:
+        await db_engine.dispose()
+
 
 def init_db():
     """Initialize the database by creating all tables."""
@@ -26,4 +141,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency to get an async database session."""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -3,16 +3,32 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
+    event,
 )
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 from datetime import datetime
 
+from . import data_version, query_stats, search_index
+
 Base = declarative_base()
 
+# Full-text search tables live outside the ORM but follow the schema lifecycle
+event.listen(Base.metadata, "after_create", search_index.create_search_index)
+event.listen(Base.metadata, "before_drop", search_index.drop_search_index)
+
+# Keep users.data_version (used for page ETags) in step with tracked entity changes
+event.listen(Session, "after_flush", data_version.bump_after_flush)
+
+# Per-context statement counts and timings (scrape results, Server-Timing) and the slow query log
+event.listen(Engine, "before_cursor_execute", query_stats.before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", query_stats.after_cursor_execute)
+
 
 class Tournament(Base):
     __tablename__ = "tournaments"
@@ -41,15 +57,20 @@ class Registration(Base):
     fencer_id = Column(Integer, ForeignKey("fencers.id"), nullable=False)
     tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
     events = Column(String, nullable=False)
-    club_url = Column(String, nullable=False, index=True)
+    club_url = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    last_seen_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     fencer = relationship("Fencer", back_populates="registrations")
     tournament = relationship("Tournament", back_populates="registrations")
 
     __table_args__ = (
         UniqueConstraint('fencer_id', 'tournament_id', name='unique_fencer_tournament'),
+        # Digest lookups filter on club_url and created_at >= since
+        Index('ix_registrations_club_url_created_at', 'club_url', 'created_at'),
+        # Keyset pagination for the registrations browser
+        Index('ix_registrations_last_seen_at_id', 'last_seen_at', 'id'),
+        Index('ix_registrations_tournament_id', 'tournament_id'),
     )
 
 
@@ -63,6 +84,8 @@ class User(Base):
     is_admin = Column(Boolean, default=False, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped on every change visible on the user's pages, see app.data_version
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     sessions = relationship(
         "UserSession",
@@ -88,12 +111,29 @@ class UserSession(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     session_token = Column(String, unique=True, nullable=False, index=True)
     csrf_token = Column(String(128), nullable=True)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     user = relationship("User", back_populates="sessions")
 
 
+class RevokedSession(Base):
+    """Signed session cookies rejected before they expire (``SESSION_MODE=signed``).
+
+    A row revokes either one session (``session_id``) or every session of
+    ``user_id`` issued up to ``revoked_at``. Rows are only needed until
+    ``expires_at``, after which the tokens they cover have expired anyway.
+    """
+
+    __tablename__ = "revoked_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, nullable=True)
+    user_id = Column(Integer, nullable=True)
+    revoked_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
 class TrackedClub(Base):
     __tablename__ = "tracked_clubs"
 
@@ -109,6 +149,7 @@ class TrackedClub(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "club_url", name="uq_tracked_clubs_user_club"),
+        Index("ix_tracked_clubs_user_id_active_created_at", "user_id", "active", "created_at"),
     )
 
 
@@ -131,4 +172,56 @@ class TrackedFencer(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "fencer_id", name="uq_tracked_fencers_user_fencer"),
+        Index("ix_tracked_fencers_user_id_active_created_at", "user_id", "active", "created_at"),
+    )
+
+
+class InstantAlert(Base):
+    __tablename__ = "instant_alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    registration_id = Column(Integer, ForeignKey("registrations.id"), nullable=False)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(String, nullable=False)
+    status = Column(String, default="pending", nullable=False, index=True)  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+    # Set while a dispatcher holds the alert (status "sending")
+    claimed_at = Column(DateTime, nullable=True)
+    claim_token = Column(String, nullable=True, index=True)
+
+    user = relationship("User")
+    registration = relationship("Registration")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "registration_id", name="uq_instant_alerts_user_registration"),
+    )
+
+
+class ScrapeTask(Base):
+    """A scrape target (club URL or fencer ID) leased to one scraper node at a time."""
+
+    __tablename__ = "scrape_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # club, fencer
+    target = Column(String, nullable=False)
+    next_run_at = Column(DateTime, nullable=False)
+    lease_owner = Column(String, nullable=True)
+    lease_token = Column(String, nullable=True, index=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_started_at = Column(DateTime, nullable=True)
+    last_finished_at = Column(DateTime, nullable=True)
+    last_error = Column(String, nullable=True)
+    last_result = Column(String, nullable=True)  # JSON summary of the last successful run
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("kind", "target", name="uq_scrape_tasks_kind_target"),
+        Index("ix_scrape_tasks_kind_next_run_at", "kind", "next_run_at"),
     )
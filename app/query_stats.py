@@ -0,0 +1,86 @@
+"""Count and time the SQL statements issued while a block of code runs.
+
+Listeners on every engine add to the ``QueryStats`` of the current context
+(thread or task), if one is being tracked, so concurrent scrapes and requests
+sharing an engine each see only their own statements. When nothing is
+tracked the listeners cost a context variable lookup and a clock read per
+statement.
+
+Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged with their
+bound parameters redacted, whether or not a context is tracked.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+# Log statements that take at least this long (0 disables the slow query log)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "250"))
+
+logger = logging.getLogger(__name__)
+
+_STARTED_KEY = "query_stats_started"
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Count and time statements executed in this context until the block exits."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters without their values (names or positions only)."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = redact_parameters(parameters[0]) if parameters else "()"
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}=?" for key in parameters) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join("?" for _ in parameters) + ")"
+    return "()" if parameters is None else "?"
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Statements on one connection never overlap, so a single slot suffices
+    conn.info[_STARTED_KEY] = time.perf_counter()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.pop(_STARTED_KEY, None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    stats = _current.get()
+    if stats is not None:
+        stats.seconds += elapsed
+
+    if 0 < SLOW_QUERY_THRESHOLD_MS <= elapsed * 1000:
+        logger.warning(
+            "Slow query (%.1f ms): %s params=%s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            redact_parameters(parameters, executemany),
+        )
@@ -0,0 +1,81 @@
+"""SQLite FTS5 search index over fencer names, tournament names and events.
+
+Each indexed column gets an external-content FTS5 table (the text is not
+stored twice) kept in sync by triggers, so every write path, including the
+scraper and bulk imports, updates the index without extra code.
+"""
+
+import re
+from typing import List, Optional
+
+# FTS table -> (content table, indexed column)
+FTS_TABLES = {
+    "fencers_fts": ("fencers", "name"),
+    "tournaments_fts": ("tournaments", "name"),
+    "registrations_fts": ("registrations", "events"),
+}
+
+# Case- and accent-insensitive matching of names like "Zoë" or "Müller"
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+def create_statements() -> List[str]:
+    """Return the DDL creating every FTS table and its sync triggers."""
+    statements = []
+    for fts, (table, column) in FTS_TABLES.items():
+        statements.extend([
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{column}, content='{table}', content_rowid='id', tokenize='{FTS_TOKENIZER}')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+            f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        ])
+    return statements
+
+
+def drop_statements() -> List[str]:
+    """Return the DDL removing every FTS table and its triggers."""
+    statements = []
+    for fts in FTS_TABLES:
+        statements.extend(f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ("ai", "ad", "au"))
+        statements.append(f"DROP TABLE IF EXISTS {fts}")
+    return statements
+
+
+def rebuild_statements() -> List[str]:
+    """Return statements re-indexing existing rows (after creation or a bulk load)."""
+    return [f"INSERT INTO {fts}({fts}) VALUES ('rebuild')" for fts in FTS_TABLES]
+
+
+def create_search_index(target, connection, **kw) -> None:
+    """``after_create`` hook installing the index when tables are created with ``create_all``."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in create_statements() + rebuild_statements():
+        connection.exec_driver_sql(statement)
+
+
+def drop_search_index(target, connection, **kw) -> None:
+    """``before_drop`` hook so ``drop_all`` leaves no orphaned FTS tables behind."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in drop_statements():
+        connection.exec_driver_sql(statement)
+
+
+def build_match_query(term: Optional[str]) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+
+    ``"jan do"`` becomes ``"jan"* "do"*``. Quoting each token keeps FTS5
+    operators and punctuation in user input from being interpreted.
+    Returns None when the term has no searchable words.
+    """
+    tokens = re.findall(r"\w+", term or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,239 @@
+"""Instant per-user alerts for newly created registrations.
+
+Subscriptions (active tracked clubs and tracked fencers of active users) are
+held in an in-memory index keyed by ``club_url`` and ``fencingtracker_id`` so
+matching a registration only touches the users subscribed to it. The index
+lives in the scraping process while tracking changes are made by the web
+app, so it is only as fresh as ``ALERT_INDEX_TTL_SEC``: a newly tracked club
+or fencer starts receiving alerts within that many seconds. Matches are
+written to the ``instant_alerts`` outbox and delivered by
+``dispatch_pending_alerts``, which may run in several processes at once:
+each batch is claimed (status ``sending``) before any email goes out.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..models import Fencer, InstantAlert, Registration, Tournament
+from . import metrics_service
+from .digest_service import events_match_weapons, parse_weapon_filter
+from .mailgun_client import NotificationError
+from .notification_service import get_client
+
+# Maximum age of the subscription index before it is rebuilt; bounds how long
+# tracking changes made in the web app take to reach instant alerts.
+ALERT_INDEX_TTL_SEC = int(os.getenv("ALERT_INDEX_TTL_SEC", "60"))
+ALERT_DISPATCH_BATCH_SIZE = int(os.getenv("ALERT_DISPATCH_BATCH_SIZE", "100"))
+# Alerts left in "sending" this long (their dispatcher died) are claimed again
+ALERT_CLAIM_TIMEOUT_SEC = int(os.getenv("ALERT_CLAIM_TIMEOUT_SEC", "600"))
+ALERT_MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    __slots__ = ("user_id", "email", "weapons")
+
+    def __init__(self, user_id: int, email: str, weapons: Optional[FrozenSet[str]]):
+        self.user_id = user_id
+        self.email = email
+        self.weapons = weapons
+
+    def accepts(self, events_lower: str) -> bool:
+        """Return True when the registration events pass this subscriber's weapon filter."""
+        return events_match_weapons(events_lower, self.weapons)
+
+
+class SubscriptionIndex:
+    """Lookup tables from club URL / fencingtracker ID to subscribers."""
+
+    def __init__(
+        self,
+        by_club: Dict[str, List[Subscriber]],
+        by_fencer: Dict[str, List[Subscriber]],
+        generation: int = 0,
+    ):
+        self.by_club = by_club
+        self.by_fencer = by_fencer
+        self.generation = generation
+        self.built_at = time.monotonic()
+
+    def match(
+        self,
+        club_url: Optional[str],
+        fencingtracker_id: Optional[str],
+        events: str,
+    ) -> List[Subscriber]:
+        """Return subscribers for the registration, at most one per user."""
+        events_lower = (events or "").lower()
+        matched: Dict[int, Subscriber] = {}
+
+        candidates: List[Subscriber] = []
+        if club_url:
+            candidates.extend(self.by_club.get(club_url, ()))
+        if fencingtracker_id:
+            candidates.extend(self.by_fencer.get(fencingtracker_id, ()))
+
+        for subscriber in candidates:
+            if subscriber.user_id in matched:
+                continue
+            if subscriber.accepts(events_lower):
+                matched[subscriber.user_id] = subscriber
+
+        return list(matched.values())
+
+
+_index: Optional[SubscriptionIndex] = None
+_index_lock = threading.Lock()
+# Bumped by invalidate_index; an index built from an older generation is stale
+_generations = itertools.count(1)
+_generation = 0
+_index_hit_metric, _index_miss_metric = metrics_service.cache_children("alert_index")
+
+
+def build_index(db: Session, generation: int = 0) -> SubscriptionIndex:
+    """Load all active subscriptions into a fresh index."""
+    by_club: Dict[str, List[Subscriber]] = {}
+    by_fencer: Dict[str, List[Subscriber]] = {}
+
+    for club_url, user_id, email, weapon_filter in crud.get_active_club_subscriptions(db):
+        if not email:
+            continue
+        by_club.setdefault(club_url, []).append(
+            Subscriber(user_id, email, parse_weapon_filter(weapon_filter))
+        )
+
+    for fencer_id, user_id, email, weapon_filter in crud.get_active_fencer_subscriptions(db):
+        if not email:
+            continue
+        by_fencer.setdefault(fencer_id, []).append(
+            Subscriber(user_id, email, parse_weapon_filter(weapon_filter))
+        )
+
+    logger.debug(
+        "Built alert subscription index (%s clubs, %s fencers)", len(by_club), len(by_fencer)
+    )
+    return SubscriptionIndex(by_club, by_fencer, generation)
+
+
+def invalidate_index() -> None:
+    """Mark this process's subscription index stale (tracking changed in this process).
+
+    Has no effect on other processes, whose indexes refresh on ``ALERT_INDEX_TTL_SEC``.
+    """
+    global _generation
+    _generation = next(_generations)
+
+
+def get_index(db: Session) -> SubscriptionIndex:
+    """Return the current subscription index, rebuilding it when stale."""
+    global _index
+    with _index_lock:
+        # Read before building: an invalidation landing mid-build leaves the
+        # new index one generation behind, so the next call rebuilds again
+        generation = _generation
+        expired = _index is not None and (time.monotonic() - _index.built_at) > ALERT_INDEX_TTL_SEC
+        if _index is None or _index.generation != generation or expired:
+            _index_miss_metric.inc()
+            _index = build_index(db, generation)
+        else:
+            _index_hit_metric.inc()
+        return _index
+
+
+def format_alert(fencer_name: str, tournament_name: str, events: str, source_url: str) -> tuple[str, str]:
+    """Return the (subject, body) for an instant alert email."""
+    subject = f"New fencing registration: {fencer_name}"
+    body = (
+        f"Fencer: {fencer_name}\n"
+        f"Tournament: {tournament_name}\n"
+        f"Events: {events}\n"
+        f"Source: {source_url}\n"
+        "\n"
+        "Manage your tracking preferences:\n"
+        "/clubs"
+    )
+    return subject, body
+
+
+def enqueue_registration_alerts(
+    db: Session,
+    registration: Registration,
+    fencer: Fencer,
+    tournament: Tournament,
+) -> int:
+    """Queue an alert for every user subscribed to the registration.
+
+    Returns the number of alerts queued. Alerts are flushed but not committed;
+    they become visible to the dispatcher with the caller's commit.
+    """
+    subscribers = get_index(db).match(
+        registration.club_url,
+        fencer.fencingtracker_id,
+        registration.events,
+    )
+    if not subscribers:
+        return 0
+
+    subject, body = format_alert(
+        fencer.name, tournament.name, registration.events, registration.club_url
+    )
+    for subscriber in subscribers:
+        crud.create_instant_alert(
+            db,
+            user_id=subscriber.user_id,
+            registration_id=registration.id,
+            recipient=subscriber.email,
+            subject=subject,
+            body=body,
+        )
+
+    return len(subscribers)
+
+
+def dispatch_pending_alerts(db: Session, limit: int = ALERT_DISPATCH_BATCH_SIZE) -> Dict[str, int]:
+    """Claim and send up to ``limit`` pending alerts, committing after each one.
+
+    The claim is committed before sending so concurrent dispatchers (the
+    worker job, scrape cycles, scrape nodes) never email the same alert.
+    Returns counts of sent and failed alerts.
+    """
+    now = datetime.now(UTC)
+    alerts: List[InstantAlert] = crud.claim_instant_alerts(
+        db, limit, now, stale_before=now - timedelta(seconds=ALERT_CLAIM_TIMEOUT_SEC)
+    )
+    db.commit()
+    sent = 0
+    failed = 0
+
+    for alert in alerts:
+        try:
+            get_client().send_text(alert.subject, alert.body, to=[alert.recipient])
+            alert.status = "sent"
+            alert.sent_at = datetime.now(UTC)
+            sent += 1
+        except NotificationError as exc:
+            alert.attempts += 1
+            alert.last_error = str(exc)
+            if alert.attempts >= ALERT_MAX_ATTEMPTS:
+                alert.status = "failed"
+                failed += 1
+            else:
+                alert.status = "pending"
+            logger.error("Failed to send alert %s to user %s: %s", alert.id, alert.user_id, exc)
+        alert.claimed_at = None
+        alert.claim_token = None
+        db.commit()
+
+    if alerts:
+        logger.info("Alert dispatch finished (sent=%s failed=%s)", sent, failed)
+
+    return {"sent": sent, "failed": failed}
@@ -1,17 +1,20 @@
 """Authentication and user management services."""
 
 import hashlib
+import logging
 import os
 import secrets
 from datetime import UTC, datetime, timedelta
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from .. import crud
-from ..models import User
-from . import csrf_service
-from .notification_service import send_registration_notification
+from .. import async_crud, crud
+from ..models import User, UserSession
+from . import csrf_service, metrics_service, password_pool_service, session_signing_service
+from .notification_service import get_client
 
 try:  # pragma: no cover - executed when bcrypt is available
     import bcrypt  # type: ignore
@@ -23,6 +26,10 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for environments with
 
 SESSION_DURATION_DAYS = 30
 SESSION_TOKEN_BYTES = 32
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "500"))
+SESSION_SWEEP_MAX_BATCHES = int(os.getenv("SESSION_SWEEP_MAX_BATCHES", "100"))
+
+logger = logging.getLogger(__name__)
 
 
 class AuthenticationError(Exception):
@@ -71,11 +78,7 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
-def register_user(username: str, email: str, password: str, db: Session) -> User:
-    """Register a new user account."""
-    username = username.strip()
-    email = email.strip()
-
+def _check_new_user(username: str, password: str, db: Session) -> None:
     if len(password) < 8:
         raise ValueError("Password must be at least 8 characters long")
 
@@ -83,7 +86,8 @@ def register_user(username: str, email: str, password: str, db: Session) -> User
     if existing:
         raise ValueError("Username already exists")
 
-    password_hash = hash_password(password)
+
+def _create_user_account(username: str, email: str, password_hash: str, db: Session) -> User:
     user = crud.create_user(db, username=username, email=email, password_hash=password_hash)
 
     try:
@@ -95,6 +99,29 @@ def register_user(username: str, email: str, password: str, db: Session) -> User
     return user
 
 
+def register_user(username: str, email: str, password: str, db: Session) -> User:
+    """Register a new user account."""
+    username = username.strip()
+    email = email.strip()
+
+    _check_new_user(username, password, db)
+    return _create_user_account(username, email, hash_password(password), db)
+
+
+async def register_user_async(username: str, email: str, password: str, db: Session) -> User:
+    """Register a new user without blocking the event loop.
+
+    The password is hashed on the bounded password pool; the sync session
+    queries and the admin signup email run in the threadpool.
+    """
+    username = username.strip()
+    email = email.strip()
+
+    await run_in_threadpool(_check_new_user, username, password, db)
+    password_hash = await password_pool_service.run(hash_password, password)
+    return await run_in_threadpool(_create_user_account, username, email, password_hash, db)
+
+
 def authenticate(username: str, password: str, db: Session) -> Optional[User]:
     """Authenticate a user and return the user record on success."""
     user = crud.get_user_by_username(db, username.strip())
@@ -108,6 +135,19 @@ def authenticate(username: str, password: str, db: Session) -> Optional[User]:
     return user
 
 
+async def authenticate_async(username: str, password: str, db: Session) -> Optional[User]:
+    """Authenticate a user, verifying the password on the bounded password pool."""
+    user = await run_in_threadpool(crud.get_user_by_username, db, username.strip())
+
+    if not user or not user.is_active:
+        return None
+
+    if not await password_pool_service.run(verify_password, password, user.password_hash):
+        return None
+
+    return user
+
+
 def generate_session_token() -> str:
     """Generate a random session token."""
     return secrets.token_hex(SESSION_TOKEN_BYTES)
@@ -118,49 +158,146 @@ def create_session(db: Session, user_id: int) -> Tuple[str, datetime]:
     expires_at = datetime.now(UTC) + timedelta(days=SESSION_DURATION_DAYS)
     token = generate_session_token()
     csrf_token = csrf_service.generate_csrf_token()
-    crud.create_session(
+    session = crud.create_session(
         db,
         user_id=user_id,
         session_token=token,
         expires_at=expires_at,
         csrf_token=csrf_token,
     )
+
+    if session_signing_service.is_enabled():
+        user = crud.get_user_by_id(db, user_id)
+        token = session_signing_service.issue_token(session.id, user, csrf_token, expires_at)
+
     return token, expires_at
 
 
-def validate_session(db: Session, session_token: Optional[str]) -> Optional[User]:
-    """Validate a session token and return the associated user if valid."""
+def load_session(
+    db: Session,
+    session_token: Optional[str],
+) -> Optional[Union[UserSession, session_signing_service.SignedSession]]:
+    """Return the valid session for a token with its user eagerly loaded.
+
+    Session, user and CSRF token come back from one joined query. Returns None
+    when the token is unknown, expired, or belongs to an inactive user. With
+    ``SESSION_MODE=signed`` the session is decoded from the token instead.
+    """
+    if not session_token:
+        return None
+
+    if session_signing_service.is_enabled():
+        return session_signing_service.load_session(db, session_token)
+
+    session = crud.get_session_with_user(db, session_token)
+    if not session:
+        return None
+
+    if _is_expired(session):
+        db.delete(session)
+        db.flush()
+        return None
+
+    user = session.user
+    if not user or not user.is_active:
+        return None
+
+    return session
+
+
+async def load_session_async(
+    db: AsyncSession,
+    session_token: Optional[str],
+) -> Optional[Union[UserSession, session_signing_service.SignedSession]]:
+    """Async variant of ``load_session`` for routes using an ``AsyncSession``."""
     if not session_token:
         return None
 
-    session = crud.get_session(db, session_token)
+    if session_signing_service.is_enabled():
+        return await session_signing_service.load_session_async(db, session_token)
+
+    session = await async_crud.get_session_with_user(db, session_token)
     if not session:
         return None
 
+    if _is_expired(session):
+        await async_crud.delete_session(db, session)
+        return None
+
+    user = session.user
+    if not user or not user.is_active:
+        return None
+
+    return session
+
+
+def _is_expired(session: UserSession) -> bool:
     # Handle both naive and aware datetimes for backwards compatibility
-    now = datetime.now(UTC)
     expires_at = session.expires_at
     if expires_at.tzinfo is None:
         # Convert naive datetime to UTC for comparison
         expires_at = expires_at.replace(tzinfo=UTC)
+    return expires_at < datetime.now(UTC)
 
-    if expires_at < now:
-        crud.delete_session(db, session_token)
-        return None
-
-    user = crud.get_user_by_id(db, session.user_id)
-    if not user or not user.is_active:
-        return None
 
-    return user
+def validate_session(db: Session, session_token: Optional[str]) -> Optional[User]:
+    """Validate a session token and return the associated user if valid."""
+    session = load_session(db, session_token)
+    return session.user if session else None
 
 
 def logout(db: Session, session_token: Optional[str]) -> None:
     """Invalidate a session token."""
-    if session_token:
+    if not session_token:
+        return
+
+    if session_signing_service.is_enabled():
+        session_signing_service.revoke_token(db, session_token)
+    else:
         crud.delete_session(db, session_token)
 
 
+def revoke_user_sessions(db: Session, user_id: int) -> int:
+    """End every session of ``user_id`` (after deactivation or demotion).
+
+    Deleting the rows logs the user out in database mode. Signed cookies are
+    revoked for the longest lifetime a token can have; this process rejects
+    them immediately, other processes on their next revocation refresh.
+    """
+    deleted = crud.delete_user_sessions(db, user_id)
+    if session_signing_service.is_enabled():
+        expires_at = datetime.now(UTC) + timedelta(days=SESSION_DURATION_DAYS)
+        session_signing_service.revoke_user(db, user_id, expires_at)
+    return deleted
+
+
+def sweep_expired_sessions(
+    db: Session,
+    batch_size: int = SESSION_SWEEP_BATCH_SIZE,
+    max_batches: int = SESSION_SWEEP_MAX_BATCHES,
+) -> int:
+    """Delete expired sessions in bounded batches, committing after each batch.
+
+    Returns the number of rows removed. Stops after ``max_batches`` so a large
+    backlog is drained over several runs instead of holding the write lock.
+    Expired signed-session revocations are dropped at the end.
+    """
+    total = 0
+    for _ in range(max_batches):
+        deleted = crud.cleanup_expired_sessions(db, limit=batch_size)
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            break
+
+    crud.cleanup_expired_session_revocations(db, datetime.now(UTC))
+    db.commit()
+
+    metrics_service.SESSIONS_SWEPT.inc(total)
+    logger.info("Session sweep removed %s expired session(s)", total)
+    return total
+
+
 def notify_admin_new_user(user: User) -> None:
     """Send an email notification to the system admin about a new user signup."""
     admin_email = os.getenv("ADMIN_EMAIL")
@@ -179,12 +316,4 @@ def notify_admin_new_user(user: User) -> None:
         f"Signup Date: {user.created_at}\n"
     )
 
-    send_registration_notification(
-        fencer_name="",
-        tournament_name="",
-        events="",
-        source_url="",
-        recipients=[admin_email],
-        subject=subject,
-        body=body,
-    )
+    get_client().send_text(subject, body, to=[admin_email])
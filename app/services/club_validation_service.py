@@ -1,13 +1,11 @@
 """Utilities for validating fencing tracker club URLs."""
 
 import logging
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 from urllib.parse import unquote
 
-import requests
-from bs4 import BeautifulSoup
-
-from .scraper_service import normalize_club_url
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 
 logger = logging.getLogger(__name__)
@@ -20,7 +18,7 @@ HEADERS = {
 }
 
 
-def _extract_club_name(soup: BeautifulSoup) -> Optional[str]:
+def _extract_club_name(soup: "BeautifulSoup") -> Optional[str]:
     """Try to extract the club name from the page."""
     for selector in ["h1", "title", "h2"]:
         node = soup.select_one(selector)
@@ -31,6 +29,12 @@ def _extract_club_name(soup: BeautifulSoup) -> Optional[str]:
 
 def validate_club_url(club_url: str, timeout: int = 10) -> Tuple[str, str]:
     """Validate the club URL and return normalized URL and club name."""
+    # Deferred so the web app only loads the HTTP/HTML stack when a club is added
+    import requests
+    from bs4 import BeautifulSoup
+
+    from .scraper_service import normalize_club_url
+
     normalized_url = normalize_club_url(club_url)
 
     try:
@@ -15,6 +15,14 @@ def generate_csrf_token() -> str:
     return secrets.token_hex(_TOKEN_BYTES)
 
 
+def tokens_match(expected_csrf_token: Optional[str], provided_csrf_token: Optional[str]) -> bool:
+    """Compare a session's CSRF token with the one submitted by the client."""
+    if not expected_csrf_token or not provided_csrf_token:
+        return False
+
+    return secrets.compare_digest(expected_csrf_token, provided_csrf_token)
+
+
 def validate_csrf_token(
     session_token: Optional[str],
     provided_csrf_token: Optional[str],
@@ -25,10 +33,10 @@ def validate_csrf_token(
         return False
 
     session = crud.get_session(db, session_token)
-    if not session or not session.csrf_token:
+    if not session:
         return False
 
-    return secrets.compare_digest(session.csrf_token, provided_csrf_token)
+    return tokens_match(session.csrf_token, provided_csrf_token)
 
 
 def get_csrf_token(db: Session, session_token: Optional[str]) -> Optional[str]:
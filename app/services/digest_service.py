@@ -2,47 +2,62 @@
 
 import logging
 from datetime import UTC, datetime, timedelta
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional
 
-from apscheduler.schedulers.blocking import BlockingScheduler
 from sqlalchemy.orm import Session
 
 from app import crud
 from app.database import SessionLocal
 from app.models import Registration, TrackedClub, TrackedFencer, User
 
-from .notification_service import send_registration_notification
+from .notification_service import get_client
 
 
 logger = logging.getLogger(__name__)
 
 DIGEST_LOOKBACK_HOURS = 24
+# Local time at which the daily digest goes out
+DIGEST_HOUR = 9
+DIGEST_MINUTE = 0
 
 
-def apply_weapon_filter(
-    registrations: Iterable[Registration],
-    weapon_filter: Optional[str],
-) -> List[Registration]:
-    """Filter registrations to those that match the configured weapons."""
+def parse_weapon_filter(weapon_filter: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Return the lower-cased weapons of a comma-separated filter, or None when it allows everything."""
     if not weapon_filter:
-        return list(registrations)
+        return None
 
-    allowed = {
+    weapons = frozenset(
         weapon.strip().lower()
         for weapon in weapon_filter.split(",")
         if weapon and weapon.strip()
-    }
+    )
+    return weapons or None
 
-    if not allowed:
-        return list(registrations)
 
-    filtered: List[Registration] = []
-    for registration in registrations:
-        events_lower = registration.events.lower()
-        if any(weapon in events_lower for weapon in allowed):
-            filtered.append(registration)
+def events_match_weapons(events_lower: str, weapons: Optional[FrozenSet[str]]) -> bool:
+    """Return True when lower-cased ``events_lower`` passes a parsed weapon filter.
 
-    return filtered
+    Shared by the digest and instant alerts so both filter identically.
+    """
+    if not weapons:
+        return True
+    return any(weapon in events_lower for weapon in weapons)
+
+
+def apply_weapon_filter(
+    registrations: Iterable[Registration],
+    weapon_filter: Optional[str],
+) -> List[Registration]:
+    """Filter registrations to those that match the configured weapons."""
+    weapons = parse_weapon_filter(weapon_filter)
+    if not weapons:
+        return list(registrations)
+
+    return [
+        registration
+        for registration in registrations
+        if events_match_weapons(registration.events.lower(), weapons)
+    ]
 
 
 def _collect_club_sections(
@@ -243,15 +258,7 @@ def send_user_digest(db: Session, user: User) -> bool:
     subject = f"Daily fencing update ({total_registrations} new)"
     body = format_digest_email(user, club_sections, fencer_sections)
 
-    send_registration_notification(
-        fencer_name="",
-        tournament_name="",
-        events="",
-        source_url="",
-        recipients=[user.email],
-        subject=subject,
-        body=body,
-    )
+    get_client().send_text(subject, body, to=[user.email])
 
     logger.info(
         "Sent digest to user %s (%s) with %s new registrations (%s clubs, %s fencers)",
@@ -283,12 +290,14 @@ def send_daily_digests() -> None:
 
 def start_digest_scheduler() -> None:
     """Start the blocking APScheduler for digests."""
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
     scheduler = BlockingScheduler()
     scheduler.add_job(
         send_daily_digests,
         "cron",
-        hour=9,
-        minute=0,
+        hour=DIGEST_HOUR,
+        minute=DIGEST_MINUTE,
         id="daily_digest",
     )
 
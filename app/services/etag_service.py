@@ -0,0 +1,38 @@
+"""Weak ETags for per-user pages, derived from ``users.data_version``."""
+
+import hashlib
+import os
+import time
+from typing import Optional
+
+# Pages also show time-dependent text (e.g. fencer cooldown countdowns), so
+# the ETag rolls over at least this often even when the version is unchanged.
+ETAG_TIME_BUCKET_SEC = int(os.getenv("ETAG_TIME_BUCKET_SEC", "60"))
+
+
+def build_etag(user_id: int, data_version: int, variant: str = "", now: Optional[float] = None) -> str:
+    """
+    Return a weak ETag for one rendering of a user's page.
+
+    ``variant`` distinguishes renderings of the same data, e.g. the path,
+    query string and the CSRF token embedded in forms.
+    """
+    bucket = int((time.time() if now is None else now) // max(ETAG_TIME_BUCKET_SEC, 1))
+    raw = f"{user_id}:{data_version}:{bucket}:{variant}"
+    return f'W/"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
@@ -0,0 +1,10 @@
+"""Failure cooldown settings shared by the fencer scraper and the web views.
+
+Kept apart from ``fencer_scraper_service`` so the web app can show cooldown
+status without importing the scraper and its HTTP/HTML parsing dependencies.
+"""
+
+import os
+
+FENCER_MAX_FAILURES = int(os.getenv("FENCER_MAX_FAILURES", "3"))
+FENCER_FAILURE_COOLDOWN_MIN = int(os.getenv("FENCER_FAILURE_COOLDOWN_MIN", "60"))
@@ -17,17 +17,20 @@ from ..crud import (
     get_or_create_tournament,
     update_or_create_registration,
     get_all_active_tracked_fencers,
+    get_active_tracked_fencers_by_fencer_id,
     update_fencer_check_status,
 )
+from .. import query_stats
 from ..models import Registration
+from . import metrics_service
+from .alert_service import enqueue_registration_alerts
+from .fencer_cooldown_service import FENCER_FAILURE_COOLDOWN_MIN, FENCER_MAX_FAILURES
 from .fencer_validation_service import build_fencer_profile_url
 
 # Environment configuration with defaults
 FENCER_SCRAPE_ENABLED = os.getenv("FENCER_SCRAPE_ENABLED", "true").lower() == "true"
 FENCER_SCRAPE_DELAY_SEC = float(os.getenv("FENCER_SCRAPE_DELAY_SEC", "5"))
 FENCER_SCRAPE_JITTER_SEC = float(os.getenv("FENCER_SCRAPE_JITTER_SEC", "2"))
-FENCER_MAX_FAILURES = int(os.getenv("FENCER_MAX_FAILURES", "3"))
-FENCER_FAILURE_COOLDOWN_MIN = int(os.getenv("FENCER_FAILURE_COOLDOWN_MIN", "60"))
 
 # HTTP constants
 MAX_RETRIES = 3
@@ -36,6 +39,13 @@ RETRY_DELAYS = [1, 2, 4]  # Exponential backoff in seconds
 
 logger = logging.getLogger(__name__)
 
+_ROWS_PARSED = metrics_service.SCRAPE_ROWS_PARSED.labels("fencer")
+_RUN_SUCCEEDED = metrics_service.SCRAPE_RUNS.labels("fencer", "success")
+_RUN_UNCHANGED = metrics_service.SCRAPE_RUNS.labels("fencer", "unchanged")
+_RUN_FAILED = metrics_service.SCRAPE_RUNS.labels("fencer", "failure")
+_NEW_REGISTRATIONS = metrics_service.REGISTRATIONS.labels("fencer", "new")
+_UPDATED_REGISTRATIONS = metrics_service.REGISTRATIONS.labels("fencer", "updated")
+
 PROFILE_REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -60,10 +70,12 @@ def _should_skip_fencer(tracked_fencer) -> bool:
     time_since_failure = (datetime.now(UTC) - tracked_fencer.last_failure_at).total_seconds()
 
     if time_since_failure < cooldown_seconds:
+        metrics_service.FENCER_COOLDOWN_SKIPS.inc()
         logger.debug(
-            f"Skipping fencer {tracked_fencer.fencer_id} "
-            f"(failures: {tracked_fencer.failure_count}, "
-            f"cooldown: {int(cooldown_seconds - time_since_failure)}s remaining)"
+            "Skipping fencer %s (failures: %s, cooldown: %ss remaining)",
+            tracked_fencer.fencer_id,
+            tracked_fencer.failure_count,
+            int(cooldown_seconds - time_since_failure),
         )
         return True
 
@@ -74,7 +86,7 @@ def _apply_delay_with_jitter():
     """Apply base delay with random jitter to spread out requests."""
     jitter = random.uniform(-FENCER_SCRAPE_JITTER_SEC, FENCER_SCRAPE_JITTER_SEC)
     delay = max(0, FENCER_SCRAPE_DELAY_SEC + jitter)
-    logger.debug(f"Applying delay: {delay:.2f}s (base: {FENCER_SCRAPE_DELAY_SEC}s, jitter: {jitter:+.2f}s)")
+    logger.debug("Applying delay: %.2fs (base: %ss, jitter: %+.2fs)", delay, FENCER_SCRAPE_DELAY_SEC, jitter)
     time.sleep(delay)
 
 
@@ -196,6 +208,10 @@ def scrape_fencer_profile(
         - total: total registrations processed
         - hash: current registration hash
         - skipped: True if page unchanged
+        - timings_ms: milliseconds spent per stage (connect, download,
+          parse, detect, persist, notify)
+        - bytes: size of the downloaded page
+        - queries: SQL statements issued
 
     Raises:
         Exception: If fetching or parsing fails after all retries
@@ -203,200 +219,273 @@ def scrape_fencer_profile(
     profile_url = build_fencer_profile_url(fencer_id, display_name)
     log_name = display_name or f"ID:{fencer_id}"
 
-    logger.info(f"[{log_name}] Fetching fencer profile: {profile_url}")
-
-    # Retry logic with exponential backoff
-    session = requests.Session()
-    response = None
+    logger.info("[%s] Fetching fencer profile: %s", log_name, profile_url)
 
-    for attempt in range(MAX_RETRIES):
+    timer = metrics_service.StageTimer(metrics_service.SCRAPE_STAGE_SECONDS, "fencer")
+    with query_stats.track() as queries:
         try:
-            logger.debug(f"[{log_name}] Fetching profile (attempt {attempt + 1}/{MAX_RETRIES})")
-            response = session.get(
-                profile_url,
-                headers=PROFILE_REQUEST_HEADERS,
-                timeout=TIMEOUT_SECONDS,
-            )
-
-            # Check status code before raising
-            if response.status_code >= 400:
-                # Don't retry client errors (4xx)
-                if 400 <= response.status_code < 500:
-                    logger.error(f"[{log_name}] HTTP {response.status_code}: {response.reason}")
-                    raise Exception(f"HTTP {response.status_code} error for {profile_url}")
-
-                # Retry server errors (5xx) and rate limits (429)
-                if attempt == MAX_RETRIES - 1:
-                    logger.error(f"[{log_name}] Failed after {MAX_RETRIES} attempts: HTTP {response.status_code}")
-                    raise Exception(f"Failed to fetch after {MAX_RETRIES} attempts: HTTP {response.status_code}")
-
-                delay = RETRY_DELAYS[attempt]
-                logger.warning(f"[{log_name}] HTTP {response.status_code}, retrying in {delay}s...")
-                time.sleep(delay)
-                continue
-
-            logger.debug(f"[{log_name}] Successfully fetched profile (HTTP {response.status_code})")
-            break  # Success
-
-        except requests.exceptions.RequestException as e:
-            # Retry on connection errors
-            if attempt == MAX_RETRIES - 1:
-                logger.error(f"[{log_name}] Failed after {MAX_RETRIES} attempts: {e}")
-                raise Exception(f"Failed to fetch after {MAX_RETRIES} attempts: {e}")
+            result = _scrape_profile_page(db, fencer_id, display_name, cached_hash, profile_url, log_name, timer)
+        except Exception:
+            _RUN_FAILED.inc()
+            raise
+        finally:
+            timer.observe()
+
+    result["timings_ms"] = timer.milliseconds()
+    result["queries"] = queries.count
+    logger.info(
+        "[%s] Scrape stats %s",
+        log_name,
+        metrics_service.format_fields({
+            "scraper": "fencer",
+            "fencer_id": fencer_id,
+            **{key: value for key, value in result.items() if key != "hash"},
+        }),
+    )
+    return result
 
-            delay = RETRY_DELAYS[attempt]
-            logger.warning(f"[{log_name}] Connection error: {e}, retrying in {delay}s...")
-            time.sleep(delay)
 
-    if not response:
-        raise Exception(f"Failed to fetch profile from {profile_url}")
+def _scrape_profile_page(
+    db: Session,
+    fencer_id: str,
+    display_name: Optional[str],
+    cached_hash: Optional[str],
+    profile_url: str,
+    log_name: str,
+    timer: metrics_service.StageTimer,
+) -> Dict[str, any]:
+    """Fetch, parse and persist one profile page; stages are recorded on ``timer``."""
+    content = _fetch_profile(profile_url, log_name, timer)
 
     # Parse HTML
-    soup = BeautifulSoup(response.content, 'html.parser')
+    with timer.stage("parse"):
+        soup = BeautifulSoup(content, 'html.parser')
 
     # Find registration tables on fencer profile
-    tables = soup.find_all('table')
+    with timer.stage("detect"):
+        tables = soup.find_all('table')
 
     if not tables:
-        logger.warning(f"[{log_name}] No tables found on profile page")
+        logger.warning("[%s] No tables found on profile page", log_name)
         current_hash = hashlib.sha256(b'').hexdigest()  # Empty hash
+        _RUN_SUCCEEDED.inc()
         return {
             "new": 0,
             "updated": 0,
             "total": 0,
             "hash": current_hash,
             "skipped": False,
+            "bytes": len(content),
         }
 
     # Compute hash of current page content for change detection
-    current_hash = _compute_registration_hash(tables)
+    with timer.stage("parse"):
+        current_hash = _compute_registration_hash(tables)
 
     # Check if page has changed since last scrape
     if cached_hash and current_hash == cached_hash:
-        logger.info(f"[{log_name}] No changes detected (hash match), skipping parse")
+        logger.info("[%s] No changes detected (hash match), skipping parse", log_name)
+        _RUN_UNCHANGED.inc()
         return {
             "new": 0,
             "updated": 0,
             "total": 0,
             "hash": current_hash,
             "skipped": True,
+            "bytes": len(content),
         }
 
     # Extract fencer's actual name from page if possible
-    fencer_name_from_page = _extract_fencer_name_from_page(soup, fencer_id)
+    with timer.stage("parse"):
+        fencer_name_from_page = _extract_fencer_name_from_page(soup, fencer_id)
 
     new_count = 0
     updated_count = 0
     total_count = 0
 
-    # Process each table that looks like a registration table
-    for table_idx, table in enumerate(tables, start=1):
-        if not _is_registration_table(table):
-            logger.debug(f"[{log_name}] Skipping non-registration table {table_idx}")
-            continue
-
-        logger.debug(f"[{log_name}] Processing registration table {table_idx}")
+    with timer.stage("persist"):
+        # Process each table that looks like a registration table
+        for table_idx, table in enumerate(tables, start=1):
+            with timer.stage("detect"):
+                is_registration_table = _is_registration_table(table)
+            if not is_registration_table:
+                logger.debug("[%s] Skipping non-registration table %s", log_name, table_idx)
+                continue
 
-        # Parse rows
-        rows = table.find_all('tr')[1:]  # Skip header row
-        logger.info(f"[{log_name}] Found {len(rows)} registrations in table {table_idx}")
+            logger.debug("[%s] Processing registration table %s", log_name, table_idx)
 
-        for row_idx, row in enumerate(rows, start=1):
-            cells = row.find_all('td')
+            # Parse rows
+            rows = table.find_all('tr')[1:]  # Skip header row
+            logger.info("[%s] Found %s registrations in table %s", log_name, len(rows), table_idx)
 
-            if len(cells) < 3:
-                logger.debug(f"[{log_name}] Skipping row {row_idx} with {len(cells)} columns (expected >=3)")
-                continue
+            for row_idx, row in enumerate(rows, start=1):
+                cells = row.find_all('td')
 
-            try:
-                # Fencer profile page structure (assumed similar to club page):
-                # Column 0: Tournament name
-                # Column 1: Event name
-                # Column 2: Date
-                tournament_name = cells[0].get_text(strip=True)
-                event_name = cells[1].get_text(strip=True)
-                event_date = cells[2].get_text(strip=True) if len(cells) > 2 else "TBD"
-
-                # Skip empty rows
-                if not tournament_name or not event_name:
-                    logger.debug(f"[{log_name}] Skipping row {row_idx} with empty tournament or event")
+                if len(cells) < 3:
+                    logger.debug("[%s] Skipping row %s with %s columns (expected >=3)", log_name, row_idx, len(cells))
                     continue
 
-                # CRITICAL FIX: Look up fencer by fencingtracker_id first to avoid duplicates
-                fencer = get_fencer_by_fencingtracker_id(db, fencer_id)
-
-                if not fencer:
-                    # Fencer doesn't exist yet - determine name and create
-                    fencer_name = (
-                        fencer_name_from_page
-                        or display_name
-                        or f"Fencer_{fencer_id}"  # Fallback only if we can't determine name
-                    )
-
-                    fencer = get_or_create_fencer(db, fencer_name)
-                    fencer.fencingtracker_id = fencer_id
-                    db.flush()
-                    logger.debug(f"[{log_name}] Created new fencer record: {fencer_name}")
-                else:
-                    # Fencer exists - update name if we have a better one
-                    if fencer_name_from_page and fencer.name.startswith("Fencer_"):
-                        logger.info(f"[{log_name}] Updating fencer name from '{fencer.name}' to '{fencer_name_from_page}'")
-                        fencer.name = fencer_name_from_page
+                try:
+                    # Fencer profile page structure (assumed similar to club page):
+                    # Column 0: Tournament name
+                    # Column 1: Event name
+                    # Column 2: Date
+                    tournament_name = cells[0].get_text(strip=True)
+                    event_name = cells[1].get_text(strip=True)
+                    event_date = cells[2].get_text(strip=True) if len(cells) > 2 else "TBD"
+
+                    # Skip empty rows
+                    if not tournament_name or not event_name:
+                        logger.debug("[%s] Skipping row %s with empty tournament or event", log_name, row_idx)
+                        continue
+
+                    # CRITICAL FIX: Look up fencer by fencingtracker_id first to avoid duplicates
+                    fencer = get_fencer_by_fencingtracker_id(db, fencer_id)
+
+                    if not fencer:
+                        # Fencer doesn't exist yet - determine name and create
+                        fencer_name = (
+                            fencer_name_from_page
+                            or display_name
+                            or f"Fencer_{fencer_id}"  # Fallback only if we can't determine name
+                        )
+
+                        fencer = get_or_create_fencer(db, fencer_name)
+                        fencer.fencingtracker_id = fencer_id
                         db.flush()
-
-                tournament = get_or_create_tournament(db, tournament_name, event_date)
-
-                existing_registration = (
-                    db.query(Registration)
-                    .filter(
-                        Registration.fencer_id == fencer.id,
-                        Registration.tournament_id == tournament.id,
+                        logger.debug("[%s] Created new fencer record: %s", log_name, fencer_name)
+                    else:
+                        # Fencer exists - update name if we have a better one
+                        if fencer_name_from_page and fencer.name.startswith("Fencer_"):
+                            logger.info(
+                                "[%s] Updating fencer name from '%s' to '%s'",
+                                log_name,
+                                fencer.name,
+                                fencer_name_from_page,
+                            )
+                            fencer.name = fencer_name_from_page
+                            db.flush()
+
+                    tournament = get_or_create_tournament(db, tournament_name, event_date)
+
+                    existing_registration = (
+                        db.query(Registration)
+                        .filter(
+                            Registration.fencer_id == fencer.id,
+                            Registration.tournament_id == tournament.id,
+                        )
+                        .one_or_none()
                     )
-                    .one_or_none()
-                )
-
-                source_url = (
-                    existing_registration.club_url
-                    if existing_registration and existing_registration.club_url
-                    else profile_url
-                )
 
-                registration, is_new = update_or_create_registration(
-                    db,
-                    fencer,
-                    tournament,
-                    event_name,
-                    source_url,
-                )
+                    source_url = (
+                        existing_registration.club_url
+                        if existing_registration and existing_registration.club_url
+                        else profile_url
+                    )
 
-                if is_new:
-                    new_count += 1
-                else:
-                    updated_count += 1
+                    registration, is_new = update_or_create_registration(
+                        db,
+                        fencer,
+                        tournament,
+                        event_name,
+                        source_url,
+                    )
 
-                total_count += 1
+                    if is_new:
+                        new_count += 1
+                        with timer.stage("notify"):
+                            enqueue_registration_alerts(db, registration, fencer, tournament)
+                    else:
+                        updated_count += 1
 
-            except Exception as e:
-                logger.error(f"[{log_name}] Error processing row {row_idx}: {e}")
-                continue
+                    total_count += 1
 
-    logger.info(f"[{log_name}] Scraping complete. Total: {total_count}, New: {new_count}, Updated: {updated_count}")
+                except Exception as e:
+                    logger.error("[%s] Error processing row %s: %s", log_name, row_idx, e)
+                    continue
 
+    _ROWS_PARSED.inc(total_count)
+    _RUN_SUCCEEDED.inc()
+    _NEW_REGISTRATIONS.inc(new_count)
+    _UPDATED_REGISTRATIONS.inc(updated_count)
     return {
         "new": new_count,
         "updated": updated_count,
         "total": total_count,
         "hash": current_hash,
         "skipped": False,
+        "bytes": len(content),
     }
 
 
+def _fetch_profile(profile_url: str, log_name: str, timer: metrics_service.StageTimer) -> bytes:
+    """
+    GET a fencer profile, retrying connection errors, 429s and 5xx responses with backoff.
+
+    Times ``connect`` (DNS, connection set-up and waiting for the response
+    headers) separately from ``download`` (reading the body).
+    """
+    # Retry logic with exponential backoff
+    session = requests.Session()
+    response = None
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            logger.debug("[%s] Fetching profile (attempt %s/%s)", log_name, attempt + 1, MAX_RETRIES)
+            with timer.stage("connect"):
+                response = session.get(
+                    profile_url,
+                    headers=PROFILE_REQUEST_HEADERS,
+                    timeout=TIMEOUT_SECONDS,
+                    stream=True,
+                )
+
+            # Check status code before raising
+            if response.status_code >= 400:
+                # Don't retry client errors (4xx)
+                if 400 <= response.status_code < 500:
+                    logger.error("[%s] HTTP %s: %s", log_name, response.status_code, response.reason)
+                    raise Exception(f"HTTP {response.status_code} error for {profile_url}")
+
+                # Retry server errors (5xx) and rate limits (429)
+                if attempt == MAX_RETRIES - 1:
+                    logger.error("[%s] Failed after %s attempts: HTTP %s", log_name, MAX_RETRIES, response.status_code)
+                    raise Exception(f"Failed to fetch after {MAX_RETRIES} attempts: HTTP {response.status_code}")
+
+                delay = RETRY_DELAYS[attempt]
+                logger.warning("[%s] HTTP %s, retrying in %ss...", log_name, response.status_code, delay)
+                response.close()
+                time.sleep(delay)
+                continue
+
+            logger.debug("[%s] Successfully fetched profile (HTTP %s)", log_name, response.status_code)
+            break  # Success
+
+        except requests.exceptions.RequestException as e:
+            # Retry on connection errors
+            if attempt == MAX_RETRIES - 1:
+                logger.error("[%s] Failed after %s attempts: %s", log_name, MAX_RETRIES, e)
+                raise Exception(f"Failed to fetch after {MAX_RETRIES} attempts: {e}")
+
+            delay = RETRY_DELAYS[attempt]
+            logger.warning("[%s] Connection error: %s, retrying in %ss...", log_name, e, delay)
+            time.sleep(delay)
+
+    if not response:
+        raise Exception(f"Failed to fetch profile from {profile_url}")
+
+    with timer.stage("download"):
+        return response.content
+
+
 def scrape_all_tracked_fencers(db: Session) -> Dict[str, any]:
     """
     Scrape all active tracked fencers with throttling and error handling.
 
     Returns:
-        Summary statistics for the scraping run
+        Summary statistics for the scraping run, including per-stage
+        ``timings_ms``, ``bytes`` and ``queries`` summed over every profile
+        scraped
     """
     if not FENCER_SCRAPE_ENABLED:
         logger.info("Fencer scraping is disabled (FENCER_SCRAPE_ENABLED=false)")
@@ -406,13 +495,16 @@ def scrape_all_tracked_fencers(db: Session) -> Dict[str, any]:
             "fencers_skipped": 0,
             "fencers_failed": 0,
             "total_registrations": 0,
+            "timings_ms": {},
+            "bytes": 0,
+            "queries": 0,
         }
 
     logger.info("Starting tracked fencer scraping run")
 
     # Get all active tracked fencers
     tracked_fencers = get_all_active_tracked_fencers(db)
-    logger.info(f"Found {len(tracked_fencers)} active tracked fencers")
+    logger.info("Found %s active tracked fencers", len(tracked_fencers))
 
     if not tracked_fencers:
         logger.info("No tracked fencers to scrape")
@@ -422,15 +514,26 @@ def scrape_all_tracked_fencers(db: Session) -> Dict[str, any]:
             "fencers_skipped": 0,
             "fencers_failed": 0,
             "total_registrations": 0,
+            "timings_ms": {},
+            "bytes": 0,
+            "queries": 0,
         }
 
     scraped_count = 0
     skipped_count = 0
     failed_count = 0
     total_registrations = 0
+    timings_ms: Dict[str, float] = {}
+    total_bytes = 0
+    total_queries = 0
 
     for idx, tracked_fencer in enumerate(tracked_fencers, start=1):
-        logger.info(f"Processing fencer {idx}/{len(tracked_fencers)}: {tracked_fencer.display_name or tracked_fencer.fencer_id}")
+        logger.info(
+            "Processing fencer %s/%s: %s",
+            idx,
+            len(tracked_fencers),
+            tracked_fencer.display_name or tracked_fencer.fencer_id,
+        )
 
         # Check if fencer should be skipped due to failures
         if _should_skip_fencer(tracked_fencer):
@@ -457,16 +560,22 @@ def scrape_all_tracked_fencers(db: Session) -> Dict[str, any]:
 
             scraped_count += 1
             total_registrations += result["total"]
+            metrics_service.add_timings(timings_ms, result["timings_ms"])
+            total_bytes += result["bytes"]
+            total_queries += result["queries"]
 
             if result["skipped"]:
                 logger.info(
-                    f"Scraped {tracked_fencer.display_name or tracked_fencer.fencer_id}: "
-                    f"No changes detected (cached)"
+                    "Scraped %s: No changes detected (cached)",
+                    tracked_fencer.display_name or tracked_fencer.fencer_id,
                 )
             else:
                 logger.info(
-                    f"Successfully scraped {tracked_fencer.display_name or tracked_fencer.fencer_id}: "
-                    f"{result['total']} registrations ({result['new']} new, {result['updated']} updated)"
+                    "Successfully scraped %s: %s registrations (%s new, %s updated)",
+                    tracked_fencer.display_name or tracked_fencer.fencer_id,
+                    result['total'],
+                    result['new'],
+                    result['updated'],
                 )
 
         except Exception as e:
@@ -476,23 +585,69 @@ def scrape_all_tracked_fencers(db: Session) -> Dict[str, any]:
 
             failed_count += 1
             logger.error(
-                f"Failed to scrape {tracked_fencer.display_name or tracked_fencer.fencer_id}: {e} "
-                f"(failure count: {tracked_fencer.failure_count})"
+                "Failed to scrape %s: %s (failure count: %s)",
+                tracked_fencer.display_name or tracked_fencer.fencer_id,
+                e,
+                tracked_fencer.failure_count,
             )
 
-    logger.info(
-        f"Fencer scraping run complete. "
-        f"Scraped: {scraped_count}, Skipped: {skipped_count}, Failed: {failed_count}, "
-        f"Total registrations: {total_registrations}"
-    )
-
-    return {
+    stats = {
         "enabled": True,
         "fencers_scraped": scraped_count,
         "fencers_skipped": skipped_count,
         "fencers_failed": failed_count,
         "total_registrations": total_registrations,
+        "timings_ms": timings_ms,
+        "bytes": total_bytes,
+        "queries": total_queries,
     }
+    logger.info("Fencer scraping run complete %s", metrics_service.format_fields(stats))
+    return stats
+
+
+def scrape_tracked_fencer(db: Session, fencer_id: str, throttle: bool = False) -> Dict[str, any]:
+    """
+    Scrape one fencer profile on behalf of every user tracking it.
+
+    Used by the scrape task queue, where a task is a fencer ID rather than a
+    user's tracking row: the page is fetched once and each active row gets the
+    check status and registration hash. Honours the failure cooldown shared by
+    those rows. ``throttle`` applies the usual delay with jitter before fetching.
+
+    Returns the ``scrape_fencer_profile`` result plus ``tracked`` (rows updated),
+    or ``skipped_cooldown`` when the fencer is cooling down or no longer tracked.
+
+    Raises:
+        Exception: If fetching or parsing fails after all retries (rows are
+        marked as failed first)
+    """
+    tracked_fencers = get_active_tracked_fencers_by_fencer_id(db, fencer_id)
+    if not tracked_fencers or all(_should_skip_fencer(tf) for tf in tracked_fencers):
+        return {"skipped_cooldown": True, "tracked": len(tracked_fencers)}
+
+    if throttle:
+        _apply_delay_with_jitter()
+
+    display_name = next((tf.display_name for tf in tracked_fencers if tf.display_name), None)
+    cached_hashes = {tf.last_registration_hash for tf in tracked_fencers}
+    cached_hash = cached_hashes.pop() if len(cached_hashes) == 1 else None
+
+    try:
+        result = scrape_fencer_profile(db, fencer_id, display_name, cached_hash=cached_hash)
+    except Exception:
+        checked_at = datetime.now(UTC)
+        for tracked_fencer in tracked_fencers:
+            update_fencer_check_status(db, tracked_fencer, checked_at, success=False)
+        db.commit()
+        raise
+
+    checked_at = datetime.now(UTC)
+    for tracked_fencer in tracked_fencers:
+        update_fencer_check_status(db, tracked_fencer, checked_at, success=True)
+        tracked_fencer.last_registration_hash = result["hash"]
+    db.commit()
+
+    return {**result, "skipped_cooldown": False, "tracked": len(tracked_fencers)}
 
 
 def fetch_fencer_display_name(fencer_id: str, timeout: float = 3.0) -> Optional[str]:
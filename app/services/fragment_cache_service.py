@@ -0,0 +1,88 @@
+"""
+In-memory cache of rendered HTML fragments (the tracked club and fencer lists).
+
+Entries are keyed by fragment name, user, the user's data version and a
+variant (the session's CSRF token, which is embedded in the forms), so a
+change to the user's data never serves an old fragment. The TTL bounds how
+stale time-dependent text, such as fencer cooldown countdowns, can get.
+Routes that change tracked entities also drop the user's entries right away
+with ``invalidate_user``. Beyond ``FRAGMENT_CACHE_MAX_ENTRIES`` the least
+recently used entry is evicted.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from . import metrics_service
+
+FRAGMENT_CACHE_TTL_SEC = int(os.getenv("FRAGMENT_CACHE_TTL_SEC", "60"))
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "2048"))
+
+# (fragment name, user id, data version, variant) -> (expires at, html)
+FragmentKey = Tuple[str, int, int, Hashable]
+
+_fragments: "OrderedDict[FragmentKey, Tuple[float, str]]" = OrderedDict()
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+_hit_metric, _miss_metric = metrics_service.cache_children("fragment")
+
+
+def get(key: FragmentKey) -> Optional[str]:
+    """Return the cached HTML for ``key`` if present and not expired."""
+    global _hits, _misses
+    now = time.monotonic()
+    with _lock:
+        cached = _fragments.get(key)
+        if cached and cached[0] > now:
+            _fragments.move_to_end(key)
+            _hits += 1
+            _hit_metric.inc()
+            return cached[1]
+        if cached:
+            del _fragments[key]
+        _misses += 1
+        _miss_metric.inc()
+        return None
+
+
+def put(key: FragmentKey, html: str) -> None:
+    """Store rendered HTML for ``key`` for ``FRAGMENT_CACHE_TTL_SEC``."""
+    if FRAGMENT_CACHE_TTL_SEC <= 0:
+        return
+    with _lock:
+        _fragments[key] = (time.monotonic() + FRAGMENT_CACHE_TTL_SEC, html)
+        _fragments.move_to_end(key)
+        while len(_fragments) > FRAGMENT_CACHE_MAX_ENTRIES:
+            _fragments.popitem(last=False)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop every fragment cached for ``user_id``."""
+    with _lock:
+        for key in [key for key in _fragments if key[1] == user_id]:
+            del _fragments[key]
+
+
+def clear() -> None:
+    """Drop all fragments (used by tests)."""
+    global _hits, _misses
+    with _lock:
+        _fragments.clear()
+        _hits = _misses = 0
+
+
+def stats() -> Dict[str, int]:
+    """Return entry, hit and miss counts."""
+    with _lock:
+        return {"entries": len(_fragments), "hits": _hits, "misses": _misses}
+
+
+metrics_service.callback_metric(
+    "fc_fragment_cache_entries",
+    "Rendered fragments currently cached.",
+    lambda: {(): len(_fragments)},
+)
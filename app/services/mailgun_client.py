@@ -2,8 +2,13 @@ import os
 import time
 import logging
 from typing import Optional, List
-import requests
-from requests.exceptions import RequestException
+
+from . import metrics_service
+
+_EMAIL_SENT = metrics_service.EMAILS.labels("sent")
+_EMAIL_FAILED = metrics_service.EMAILS.labels("failed")
+_EMAIL_SENT_SECONDS = metrics_service.EMAIL_SEND_SECONDS.labels("sent")
+_EMAIL_FAILED_SECONDS = metrics_service.EMAIL_SEND_SECONDS.labels("failed")
 
 
 class NotificationError(Exception):
@@ -20,6 +25,9 @@ class MailgunEmailClient:
 
     def __init__(self):
         """Initialize the Mailgun client with environment configuration."""
+        # Imported on first use so processes that never send mail (the web app) skip it
+        import requests
+
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
         self.timeout = 10
@@ -70,6 +78,24 @@ class MailgunEmailClient:
         Raises:
             NotificationError: When sending fails after retries
         """
+        started = time.perf_counter()
+        try:
+            message_id = self._send_text(subject, body, to, tags)
+        except NotificationError:
+            _EMAIL_FAILED.inc()
+            _EMAIL_FAILED_SECONDS.observe(time.perf_counter() - started)
+            raise
+        _EMAIL_SENT.inc()
+        _EMAIL_SENT_SECONDS.observe(time.perf_counter() - started)
+        return message_id
+
+    def _send_text(
+        self,
+        subject: str,
+        body: str,
+        to: Optional[List[str]],
+        tags: Optional[List[str]],
+    ) -> str:
         recipients = to or self.default_recipients
 
         # Prepare the payload
@@ -90,6 +116,7 @@ class MailgunEmailClient:
         backoff_times = [1, 2]  # Sleep times between retries
 
         last_exception = None
+        from requests.exceptions import RequestException
 
         for attempt in range(max_attempts):
             try:
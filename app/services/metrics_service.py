@@ -0,0 +1,428 @@
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+The web app serves it at ``/metrics``; the worker, scheduler and scrape
+nodes serve it on ``METRICS_PORT`` when that is set. Each process (and each
+uvicorn worker) has its own registry, so scrape every process.
+
+Updates are meant for hot paths: ``labels()`` children are looked up once and
+kept in module constants, and ``inc``/``observe`` are a lock and an addition.
+Values that already live elsewhere (cache sizes, password pool load) are read
+by callbacks only when the registry is rendered.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans quick DB writes up to slow, retried page fetches
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child for ``values``; keep it around on hot paths."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in sorted(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (durations, in seconds) over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in sorted(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    Gauge or counter whose samples are read from ``callback`` at render time.
+
+    ``callback`` returns ``{label values: value}`` (an empty tuple key when
+    there are no labels).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+    ):
+        self.callback = callback
+        self.type_name = type_name
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        try:
+            samples = self.callback()
+        except Exception:  # pragma: no cover - never fail the whole scrape
+            logger.exception("Metrics callback for %s failed", self.name)
+            return lines
+        for values, value in sorted(samples.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add ``metric``; registering a name twice returns the first metric."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def callback_metric(
+    name: str,
+    documentation: str,
+    callback: Callable[[], Dict[LabelValues, float]],
+    labelnames: Sequence[str] = (),
+    type_name: str = "gauge",
+) -> CallbackMetric:
+    return REGISTRY.register(CallbackMetric(name, documentation, callback, labelnames, type_name))
+
+
+def render() -> str:
+    """Return every registered metric in the Prometheus text format."""
+    return REGISTRY.render()
+
+
+class StageTimer:
+    """
+    Accumulate exclusive wall time per stage of one run and report it to ``histogram``.
+
+    Stages may nest: time spent in an inner stage (e.g. ``notify`` inside
+    ``persist``) is not counted for the outer one.
+    """
+
+    def __init__(self, histogram: Histogram, *labels: str):
+        self.histogram = histogram
+        self.labels = labels
+        self.durations: Dict[str, float] = {}
+        self._stack: List[List] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.durations[outer[0]] = self.durations.get(outer[0], 0.0) + started - outer[1]
+        self._stack.append([name, started])
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            _, resumed = self._stack.pop()
+            self.durations[name] = self.durations.get(name, 0.0) + ended - resumed
+            if self._stack:
+                self._stack[-1][1] = ended
+
+    def observe(self) -> None:
+        """Record each stage's total in the histogram."""
+        for stage, seconds in self.durations.items():
+            self.histogram.labels(*self.labels, stage).observe(seconds)
+
+    def milliseconds(self) -> Dict[str, float]:
+        """Return each stage's total in milliseconds, rounded to 0.1 ms."""
+        return {stage: round(seconds * 1000, 1) for stage, seconds in self.durations.items()}
+
+
+def add_timings(totals: Dict[str, float], timings: Dict[str, float]) -> None:
+    """Add per-stage ``timings`` (as returned by ``milliseconds``) into ``totals``."""
+    for stage, value in timings.items():
+        totals[stage] = round(totals.get(stage, 0.0) + value, 1)
+
+
+def format_fields(fields: Dict[str, Any]) -> str:
+    """
+    Render ``fields`` as ``key=value`` pairs for a single structured log line.
+
+    Nested dicts are flattened with dotted keys (``timings_ms.parse=1.2``).
+    """
+    parts = []
+    for key, value in fields.items():
+        if isinstance(value, dict):
+            parts.append(format_fields({f"{key}.{inner}": v for inner, v in value.items()}))
+            continue
+        text = str(value)
+        if not text or any(char in text for char in ' "='):
+            text = '"' + text.replace('"', '\\"') + '"'
+        parts.append(f"{key}={text}")
+    return " ".join(parts)
+
+
+def start_http_server(port: int = METRICS_PORT, addr: str = "0.0.0.0"):
+    """
+    Serve ``/metrics`` from a daemon thread for processes without a web app.
+
+    Returns the server, or None when ``port`` is 0 (disabled).
+    """
+    if port <= 0:
+        return None
+
+    # Imported here so the web app, which serves /metrics itself, skips http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Serving metrics on port %s", server.server_address[1])
+    return server
+
+
+# --- Application metrics ---
+
+SCRAPE_STAGE_SECONDS = histogram(
+    "fc_scrape_stage_seconds",
+    "Time spent in each stage of a club or fencer scrape.",
+    ("scraper", "stage"),
+)
+SCRAPE_RUNS = counter(
+    "fc_scrape_runs_total",
+    "Club and fencer scrapes by outcome (success, unchanged, failure).",
+    ("scraper", "outcome"),
+)
+SCRAPE_ROWS_PARSED = counter(
+    "fc_scrape_rows_parsed_total",
+    "Registration rows parsed from scraped pages.",
+    ("scraper",),
+)
+REGISTRATIONS = counter(
+    "fc_registrations_total",
+    "Registrations written by scrapes (new or updated).",
+    ("scraper", "result"),
+)
+FENCER_COOLDOWN_SKIPS = counter(
+    "fc_fencer_cooldown_skips_total",
+    "Fencer scrapes skipped because the fencer is in failure cooldown.",
+)
+CACHE_REQUESTS = counter(
+    "fc_cache_requests_total",
+    "Lookups in in-memory caches by result; hit ratio = hit / (hit + miss).",
+    ("cache", "result"),
+)
+EMAILS = counter(
+    "fc_emails_total",
+    "Emails handed to Mailgun by outcome (sent, failed).",
+    ("outcome",),
+)
+EMAIL_SEND_SECONDS = histogram(
+    "fc_email_send_seconds",
+    "Mailgun send latency including retries.",
+    ("outcome",),
+)
+HTTP_REQUEST_SECONDS = histogram(
+    "fc_http_request_seconds",
+    "Web request latency by route template, until the response headers are sent.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_QUERIES = histogram(
+    "fc_http_request_queries",
+    "SQL statements issued per web request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+SESSIONS_SWEPT = counter(
+    "fc_sessions_swept_total",
+    "Expired sessions deleted by the session sweeper.",
+)
+
+
+def cache_children(cache: str) -> Tuple[_CounterChild, _CounterChild]:
+    """Return the ``(hit, miss)`` counters for ``cache``."""
+    return CACHE_REQUESTS.labels(cache, "hit"), CACHE_REQUESTS.labels(cache, "miss")
+
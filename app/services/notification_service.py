@@ -21,8 +21,6 @@ def send_registration_notification(
     events: str,
     source_url: str,
     recipients: Optional[List[str]] = None,
-    subject: Optional[str] = None,
-    body: Optional[str] = None,
 ) -> str:
     """
     Send email notification for a new fencing registration.
@@ -42,9 +40,6 @@ def send_registration_notification(
     """
     client = get_client()
 
-    if subject is not None and body is not None:
-        return client.send_text(subject, body, to=recipients)
-
     default_subject = f"New fencing registration: {fencer_name}"
     message_body = (
         f"Fencer: {fencer_name}\n"
@@ -0,0 +1,90 @@
+"""Bounded worker pool for password hashing and verification.
+
+bcrypt and PBKDF2 are deliberately slow and both release the GIL, so running
+them on a small dedicated thread pool keeps the event loop free for other
+requests. The number of pending jobs is capped; callers beyond the cap get
+``PasswordPoolBusyError`` instead of queueing without limit.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from . import metrics_service
+
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", "2"))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", "32"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_in_flight = 0
+_rejected = 0
+
+
+class PasswordPoolBusyError(Exception):
+    """Raised when too many password operations are already pending."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_POOL_WORKERS,
+                thread_name_prefix="password-pool",
+            )
+        return _executor
+
+
+async def run(func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func(*args)`` on the password pool and await its result."""
+    global _in_flight, _rejected
+    with _lock:
+        if _in_flight >= PASSWORD_POOL_MAX_PENDING:
+            _rejected += 1
+            raise PasswordPoolBusyError("Password pool is at capacity")
+        _in_flight += 1
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+def get_stats() -> Dict[str, int]:
+    """Return current pool utilisation for monitoring."""
+    with _lock:
+        return {
+            "workers": PASSWORD_POOL_WORKERS,
+            "in_flight": _in_flight,
+            "queued": max(0, _in_flight - PASSWORD_POOL_WORKERS),
+            "max_pending": PASSWORD_POOL_MAX_PENDING,
+            "rejected": _rejected,
+        }
+
+
+def shutdown() -> None:
+    """Stop the worker threads (used on application shutdown)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+metrics_service.callback_metric(
+    "fc_password_pool_jobs",
+    "Password hash/verify jobs in the pool by state (in_flight, queued).",
+    lambda: {(state,): value for state, value in get_stats().items() if state in ("in_flight", "queued")},
+    ("state",),
+)
+metrics_service.callback_metric(
+    "fc_password_pool_rejected_total",
+    "Password jobs rejected because the pool was at capacity.",
+    lambda: {(): get_stats()["rejected"]},
+    type_name="counter",
+)
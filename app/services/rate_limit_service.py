@@ -1,11 +1,416 @@
-"""Rate limiting service for authentication endpoints."""
+"""Rate limiting service for authentication endpoints.
 
+Uses a sliding-window counter: each key keeps the attempt counts for the
+current and previous fixed windows, and the previous count is weighted by how
+much of it still overlaps the sliding window. State per key is constant in
+size, idle keys are swept periodically, and the number of tracked keys is
+capped (least recently used keys are evicted first).
+
+The counters live in a pluggable backend selected with ``RATE_LIMIT_BACKEND``:
+
+- ``memory`` (default): a per-process dict; each worker enforces its own limit.
+- ``sqlite``: a WAL-mode SQLite file shared by every worker on the host.
+- ``shm``: a fixed-size hash table in POSIX shared memory, guarded by a file lock.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
 import time
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+try:  # pragma: no cover - POSIX only
+    import fcntl
+
+    _HAS_FCNTL = True
+except ModuleNotFoundError:  # pragma: no cover - e.g. Windows
+    _HAS_FCNTL = False
+
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+RATE_LIMIT_SWEEP_INTERVAL_SEC = int(os.getenv("RATE_LIMIT_SWEEP_INTERVAL_SEC", "60"))
+
+
+class _WindowState:
+    __slots__ = ("window_seconds", "max_attempts", "window_start", "previous", "current")
+
+    def __init__(
+        self,
+        window_seconds: int,
+        max_attempts: int,
+        window_start: float,
+        previous: int = 0,
+        current: int = 0,
+    ):
+        self.window_seconds = window_seconds
+        self.max_attempts = max_attempts
+        self.window_start = window_start
+        self.previous = previous
+        self.current = current
+
+    @classmethod
+    def new(cls, window_seconds: int, max_attempts: int, now: float) -> "_WindowState":
+        return cls(window_seconds, max_attempts, math.floor(now / window_seconds) * window_seconds)
+
+    def roll(self, now: float) -> None:
+        """Advance to the fixed window containing ``now``."""
+        window_start = math.floor(now / self.window_seconds) * self.window_seconds
+        if window_start == self.window_start:
+            return
+        if window_start - self.window_start == self.window_seconds:
+            self.previous = self.current
+        else:
+            self.previous = 0
+        self.current = 0
+        self.window_start = window_start
+
+    def estimate(self, now: float) -> float:
+        elapsed = now - self.window_start
+        weight = max(0.0, 1.0 - elapsed / self.window_seconds)
+        return self.previous * weight + self.current
+
+    def is_idle(self, now: float) -> bool:
+        """True once neither window can contribute to the estimate any more."""
+        return now >= self.window_start + 2 * self.window_seconds
+
+    def hit(self, now: float, max_attempts: int) -> Tuple[bool, int]:
+        """Record an attempt if allowed; return (is_allowed, remaining_attempts)."""
+        self.max_attempts = max_attempts
+        self.roll(now)
+        estimate = self.estimate(now)
+
+        # Check if limit exceeded
+        if estimate >= max_attempts:
+            return False, 0
+
+        # Record this attempt
+        self.current += 1
+        return True, max(0, max_attempts - math.ceil(estimate) - 1)
+
+    def retry_after(self, now: float) -> int:
+        """Seconds until the sliding-window estimate drops below the limit."""
+        self.roll(now)
+        limit = self.max_attempts
+        if self.estimate(now) < limit:
+            return 0
+
+        if self.current >= limit:
+            # Wait for the current window to become the previous one and decay
+            window_end = self.window_start + self.window_seconds
+            decay = self.window_seconds * (1 - limit / self.current)
+            retry_after = window_end + decay - now
+        else:
+            # The previous window's weight must decay far enough
+            needed = self.window_seconds * (1 - (limit - self.current) / self.previous)
+            retry_after = self.window_start + needed - now
+
+        return max(0, math.ceil(retry_after))
+
+
+class MemoryBackend:
+    """Per-process storage, ordered from least to most recently used."""
+
+    def __init__(
+        self,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        sweep_interval: int = RATE_LIMIT_SWEEP_INTERVAL_SEC,
+    ):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.states: "OrderedDict[str, _WindowState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def _sweep(self, now: float) -> None:
+        """Drop idle keys; called with the lock held."""
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+
+        for key in [key for key, state in self.states.items() if state.is_idle(now)]:
+            del self.states[key]
+
+    def hit(self, key: str, max_attempts: int, window_seconds: int, now: float) -> Tuple[bool, int]:
+        with self._lock:
+            self._sweep(now)
+
+            state = self.states.get(key)
+            if state is None or state.window_seconds != window_seconds:
+                state = _WindowState.new(window_seconds, max_attempts, now)
+                self.states[key] = state
+                while len(self.states) > self.max_keys:
+                    self.states.popitem(last=False)
+            else:
+                self.states.move_to_end(key)
+
+            return state.hit(now, max_attempts)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self.states.pop(key, None)
+
+    def retry_after(self, key: str, now: float) -> int:
+        with self._lock:
+            state = self.states.get(key)
+            return state.retry_after(now) if state else 0
+
+
+class SQLiteBackend:
+    """Counters in a shared SQLite file, updated inside ``BEGIN IMMEDIATE`` transactions."""
+
+    def __init__(
+        self,
+        path: str,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        sweep_interval: int = RATE_LIMIT_SWEEP_INTERVAL_SEC,
+    ):
+        self.path = path
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._last_sweep = 0.0
+
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY,"
+            " window_seconds INTEGER NOT NULL,"
+            " max_attempts INTEGER NOT NULL,"
+            " window_start REAL NOT NULL,"
+            " previous INTEGER NOT NULL,"
+            " current INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_updated_at ON rate_limits (updated_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _load(self, conn: sqlite3.Connection, key: str) -> Optional[_WindowState]:
+        row = conn.execute(
+            "SELECT window_seconds, max_attempts, window_start, previous, current"
+            " FROM rate_limits WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return _WindowState(*row) if row else None
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+
+        conn.execute("DELETE FROM rate_limits WHERE window_start + 2 * window_seconds <= ?", (now,))
+        conn.execute(
+            "DELETE FROM rate_limits WHERE key IN ("
+            " SELECT key FROM rate_limits ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,),
+        )
+
+    def hit(self, key: str, max_attempts: int, window_seconds: int, now: float) -> Tuple[bool, int]:
+        with self._transaction() as conn:
+            state = self._load(conn, key)
+            if state is None or state.window_seconds != window_seconds:
+                state = _WindowState.new(window_seconds, max_attempts, now)
+
+            result = state.hit(now, max_attempts)
+            conn.execute(
+                "INSERT INTO rate_limits"
+                " (key, window_seconds, max_attempts, window_start, previous, current, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET"
+                " window_seconds = excluded.window_seconds,"
+                " max_attempts = excluded.max_attempts,"
+                " window_start = excluded.window_start,"
+                " previous = excluded.previous,"
+                " current = excluded.current,"
+                " updated_at = excluded.updated_at",
+                (
+                    key,
+                    state.window_seconds,
+                    state.max_attempts,
+                    state.window_start,
+                    state.previous,
+                    state.current,
+                    now,
+                ),
+            )
+            self._sweep(conn, now)
+
+        return result
 
-# In-memory storage for rate limiting
-# key -> list of attempt timestamps
-_rate_limits: Dict[str, List[float]] = {}
+    def reset(self, key: str) -> None:
+        self._connect().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def retry_after(self, key: str, now: float) -> int:
+        state = self._load(self._connect(), key)
+        return state.retry_after(now) if state else 0
+
+
+class SharedMemoryBackend:
+    """Fixed-size open-addressing table in POSIX shared memory.
+
+    Each slot holds a 64-bit key hash and the window counters. A key probes
+    ``PROBES`` consecutive slots; when none is free or idle, the slot with the
+    oldest window is overwritten, so memory stays constant.
+    """
+
+    _SLOT = struct.Struct("<QdIIII")  # key_hash, window_start, window_seconds, max_attempts, previous, current
+    PROBES = 8
+
+    def __init__(self, name: str, slots: int = RATE_LIMIT_MAX_KEYS):
+        if not _HAS_FCNTL:
+            raise RuntimeError("The shm rate limit backend requires a POSIX platform")
+
+        from multiprocessing import shared_memory
+
+        size = slots * self._SLOT.size
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name=name)
+        _untrack_shared_memory(shm)
+
+        self._shm = shm
+        self._slots = shm.size // self._SLOT.size
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a+b")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest or 1  # 0 marks an empty slot
+
+    def _read(self, index: int) -> tuple:
+        return self._SLOT.unpack_from(self._shm.buf, index * self._SLOT.size)
+
+    def _write(self, index: int, key_hash: int, state: _WindowState) -> None:
+        self._SLOT.pack_into(
+            self._shm.buf,
+            index * self._SLOT.size,
+            key_hash,
+            state.window_start,
+            state.window_seconds,
+            state.max_attempts,
+            state.previous,
+            state.current,
+        )
+
+    def _probe(self, key_hash: int) -> list:
+        return [(key_hash + offset) % self._slots for offset in range(self.PROBES)]
+
+    def _find(self, key_hash: int) -> Tuple[Optional[int], Optional[_WindowState]]:
+        for index in self._probe(key_hash):
+            slot_hash, window_start, window_seconds, max_attempts, previous, current = self._read(index)
+            if slot_hash == key_hash:
+                return index, _WindowState(window_seconds, max_attempts, window_start, previous, current)
+        return None, None
+
+    def _claim(self, key_hash: int, now: float) -> int:
+        oldest_index, oldest_start = None, math.inf
+        for index in self._probe(key_hash):
+            slot_hash, window_start, window_seconds, _, _, _ = self._read(index)
+            if slot_hash == 0 or now >= window_start + 2 * window_seconds:
+                return index
+            if window_start < oldest_start:
+                oldest_index, oldest_start = index, window_start
+        return oldest_index
+
+    def hit(self, key: str, max_attempts: int, window_seconds: int, now: float) -> Tuple[bool, int]:
+        key_hash = self._hash(key)
+        with self._locked():
+            index, state = self._find(key_hash)
+            if state is None or state.window_seconds != window_seconds:
+                index = self._claim(key_hash, now) if index is None else index
+                state = _WindowState.new(window_seconds, max_attempts, now)
+
+            result = state.hit(now, max_attempts)
+            self._write(index, key_hash, state)
+
+        return result
+
+    def reset(self, key: str) -> None:
+        key_hash = self._hash(key)
+        with self._locked():
+            index, _ = self._find(key_hash)
+            if index is not None:
+                self._SLOT.pack_into(self._shm.buf, index * self._SLOT.size, 0, 0.0, 0, 0, 0, 0)
+
+    def retry_after(self, key: str, now: float) -> int:
+        with self._locked():
+            _, state = self._find(self._hash(key))
+        return state.retry_after(now) if state else 0
+
+
+def _untrack_shared_memory(shm) -> None:
+    """Keep this process's resource tracker from unlinking the shared segment on exit."""
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:  # pragma: no cover - tracker internals vary between versions
+        pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend():
+    name = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend(os.getenv("RATE_LIMIT_SQLITE_PATH", "./rate_limits.db"))
+    if name == "shm":
+        return SharedMemoryBackend(os.getenv("RATE_LIMIT_SHM_NAME", "fc_rate_limits"))
+    raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {name}")
+
+
+def get_backend():
+    """Return the configured rate limit backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Replace the active backend (used by tests and custom deployments)."""
+    global _backend
+    _backend = backend
 
 
 def check_rate_limit(key: str, max_attempts: int, window_seconds: int) -> Tuple[bool, int]:
@@ -20,26 +425,7 @@ def check_rate_limit(key: str, max_attempts: int, window_seconds: int) -> Tuple[
     Returns:
         Tuple of (is_allowed: bool, remaining_attempts: int)
     """
-    now = time.time()
-    cutoff = now - window_seconds
-
-    # Clean up old timestamps (lazy cleanup)
-    if key in _rate_limits:
-        _rate_limits[key] = [ts for ts in _rate_limits[key] if ts > cutoff]
-    else:
-        _rate_limits[key] = []
-
-    # Check if limit exceeded
-    current_attempts = len(_rate_limits[key])
-
-    if current_attempts >= max_attempts:
-        return False, 0
-
-    # Record this attempt
-    _rate_limits[key].append(now)
-    remaining = max_attempts - current_attempts - 1
-
-    return True, remaining
+    return get_backend().hit(key, max_attempts, window_seconds, time.time())
 
 
 def reset_rate_limit(key: str) -> None:
@@ -49,26 +435,19 @@ def reset_rate_limit(key: str) -> None:
     Args:
         key: Unique identifier for the rate limit
     """
-    if key in _rate_limits:
-        del _rate_limits[key]
+    get_backend().reset(key)
 
 
 def get_retry_after(key: str, window_seconds: int) -> int:
     """
-    Get seconds until the rate limit window expires.
+    Get seconds until another attempt would be allowed.
 
     Args:
         key: Unique identifier for the rate limit
         window_seconds: Time window in seconds
 
     Returns:
-        Seconds until oldest attempt expires (0 if no attempts or already expired)
+        Seconds until the sliding-window estimate drops below the limit
+        (0 if no attempts or already allowed)
     """
-    if key not in _rate_limits or not _rate_limits[key]:
-        return 0
-
-    now = time.time()
-    oldest_attempt = min(_rate_limits[key])
-    retry_after = int(oldest_attempt + window_seconds - now)
-
-    return max(0, retry_after)
+    return get_backend().retry_after(key, time.time())
@@ -1,33 +1,238 @@
 """
 Service for querying and filtering registration data for display in the web UI.
+
+Results are paged with keyset (seek) pagination: each page is fetched with a
+``WHERE (sort_key, id) < (last_sort_key, last_id)`` condition instead of an
+OFFSET, so every page costs the same no matter how deep the reader goes.
+The position is handed to clients as an opaque cursor.
+
+Text filters use the FTS5 index from ``app.search_index`` on SQLite, so they
+match word prefixes and can be ranked by relevance.
 """
-from typing import List, Dict, Any, Optional
+import base64
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, asc, desc, false, func, or_, select, text
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
 
+from app import search_index
+from app.services import metrics_service
 from app.models import Registration, Fencer, Tournament
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+REGISTRATION_COUNT_TTL_SEC = int(os.getenv("REGISTRATION_COUNT_TTL_SEC", "60"))
+REGISTRATION_COUNT_CACHE_SIZE = 256
+
+SORT_COLUMNS = {
+    "fencer_name": Fencer.name,
+    "tournament_name": Tournament.name,
+    "last_seen_at": Registration.last_seen_at,
+}
+
+_count_cache: Dict[Tuple[Optional[str], ...], Tuple[float, int]] = {}
+_count_lock = threading.Lock()
+_count_hit_metric, _count_miss_metric = metrics_service.cache_children("registration_count")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the sort."""
+
+
+def normalize_sort(
+    sort_by: Optional[str],
+    sort_order: Optional[str],
+    can_rank: bool = False,
+) -> Tuple[str, str]:
+    """
+    Fall back to ``last_seen_at``/``desc`` for unknown sort options.
+
+    ``relevance`` is only honoured when ``can_rank`` (a full-text filter is
+    active) and always sorts best match first.
+    """
+    if sort_by == "relevance" and can_rank:
+        return "relevance", "asc"
+    sort_by = sort_by if sort_by in SORT_COLUMNS else "last_seen_at"
+    sort_order = "asc" if (sort_order or "").lower() == "asc" else "desc"
+    return sort_by, sort_order
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """Bound ``page_size`` to ``1..MAX_PAGE_SIZE``."""
+    if not page_size:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(sort_by: str, sort_order: str, sort_value: Any, registration_id: int) -> str:
+    """Encode the position after a row as an opaque URL-safe token."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_by, sort_order, sort_value, registration_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, int]:
+    """Return ``(sort_value, registration_id)`` for a cursor issued for the same sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort_by, cursor_sort_order, sort_value, registration_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+
+    if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order) or not isinstance(registration_id, int):
+        raise InvalidCursorError("Cursor does not match the requested sort")
+
+    if sort_by == "last_seen_at":
+        try:
+            sort_value = datetime.fromisoformat(sort_value)
+        except (TypeError, ValueError):
+            raise InvalidCursorError("Invalid cursor")
+    elif sort_by == "relevance":
+        if not isinstance(sort_value, (int, float)):
+            raise InvalidCursorError("Invalid cursor")
+    elif not isinstance(sort_value, str):
+        raise InvalidCursorError("Invalid cursor")
+
+    return sort_value, registration_id
+
+
+def _use_fts(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _fts_matches(fts_table: str, match_query: str):
+    """Subquery of ``(rowid, rank)`` for rows of ``fts_table`` matching ``match_query``."""
+    return (
+        text(f"SELECT rowid, rank FROM {fts_table} WHERE {fts_table} MATCH :match")
+        .bindparams(match=match_query)
+        .columns(rowid=Integer, rank=Float)
+        .subquery()
+    )
+
+
+def _apply_filters(
+    db: Session,
+    query,
+    tournament_filter: Optional[str],
+    fencer_filter: Optional[str],
+    event_filter: Optional[str],
+):
+    """
+    Restrict ``query`` (rooted at Registration) to rows matching the text filters.
+
+    On SQLite each filter is a prefix search against the FTS5 index, joined by
+    rowid. Returns the filtered query and a relevance score expression (lower
+    is better, the sum of the bm25 ranks), or None when no filter applies.
+    Other databases fall back to substring matching without a score.
+    """
+    filters = [
+        (fencer_filter, "fencers_fts", Registration.fencer_id, Fencer.id, Fencer.name),
+        (tournament_filter, "tournaments_fts", Registration.tournament_id, Tournament.id, Tournament.name),
+        (event_filter, "registrations_fts", Registration.id, None, Registration.events),
+    ]
+    score = None
+
+    for term, fts_table, join_column, target_id, target_column in filters:
+        if not term:
+            continue
+
+        if not _use_fts(db):
+            if target_id is None:
+                query = query.filter(target_column.ilike(f"%{term}%"))
+            else:
+                matching = select(target_id).where(target_column.ilike(f"%{term}%"))
+                query = query.filter(join_column.in_(matching))
+            continue
+
+        match_query = search_index.build_match_query(term)
+        if match_query is None:
+            # Nothing searchable in the term (e.g. only punctuation)
+            return query.filter(false()), None
+
+        matches = _fts_matches(fts_table, match_query)
+        query = query.join(matches, matches.c.rowid == join_column)
+        score = matches.c.rank if score is None else score + matches.c.rank
+
+    return query, score
+
+
+def count_registrations(
+    db: Session,
+    tournament_filter: Optional[str] = None,
+    fencer_filter: Optional[str] = None,
+    event_filter: Optional[str] = None,
+) -> int:
+    """
+    Count matching registrations, cached per filter for ``REGISTRATION_COUNT_TTL_SEC``.
+
+    The count is for display only and may lag behind new scrapes by up to the TTL.
+    """
+    key = (tournament_filter or None, fencer_filter or None, event_filter or None)
+    now = time.monotonic()
+    with _count_lock:
+        cached = _count_cache.get(key)
+        if cached and cached[0] > now:
+            _count_hit_metric.inc()
+            return cached[1]
+
+    _count_miss_metric.inc()
+    query = db.query(func.count(Registration.id))
+    query, _ = _apply_filters(db, query, tournament_filter, fencer_filter, event_filter)
+    count = query.scalar() or 0
+
+    with _count_lock:
+        if len(_count_cache) >= REGISTRATION_COUNT_CACHE_SIZE:
+            _count_cache.clear()
+        _count_cache[key] = (now + REGISTRATION_COUNT_TTL_SEC, count)
+    return count
+
+
+def clear_count_cache() -> None:
+    """Drop cached counts (used by tests and after bulk imports)."""
+    with _count_lock:
+        _count_cache.clear()
+
 
 def query_registrations(
     db: Session,
     tournament_filter: Optional[str] = None,
     fencer_filter: Optional[str] = None,
     sort_by: str = "last_seen_at",
-    sort_order: str = "desc"
-) -> List[Dict[str, Any]]:
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    event_filter: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Query registrations with optional filtering and sorting.
+    Query one page of registrations with optional filtering and sorting.
 
     Args:
         db: Database session
-        tournament_filter: Optional case-insensitive substring filter for tournament name
-        fencer_filter: Optional case-insensitive substring filter for fencer name
-        sort_by: Field to sort by (fencer_name, tournament_name, last_seen_at)
-        sort_order: Sort order (asc or desc)
+        tournament_filter: Optional prefix search on tournament name words
+        fencer_filter: Optional prefix search on fencer name words
+        sort_by: Field to sort by (fencer_name, tournament_name, last_seen_at,
+            or relevance when a filter is given)
+        sort_order: Sort order (asc or desc); relevance is always best match first
+        cursor: Cursor returned as ``next_cursor`` by the previous page
+        page_size: Rows per page, clamped to ``MAX_PAGE_SIZE``
+        event_filter: Optional prefix search on event names
 
     Returns:
-        List of dictionaries containing flattened registration data
+        Dictionary with the page ``items`` (flattened registration dicts),
+        ``next_cursor`` (None on the last page), ``page_size``, ``total_count``
+        and the effective ``sort_by``/``sort_order``
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort
     """
+    page_size = clamp_page_size(page_size)
+
     # Start with base query joining all required tables
     query = db.query(
         Registration.id,
@@ -42,35 +247,41 @@ def query_registrations(
         Tournament, Registration.tournament_id == Tournament.id
     )
 
-    # Apply filters
-    if tournament_filter:
-        query = query.filter(Tournament.name.ilike(f"%{tournament_filter}%"))
+    query, score = _apply_filters(db, query, tournament_filter, fencer_filter, event_filter)
 
-    if fencer_filter:
-        query = query.filter(Fencer.name.ilike(f"%{fencer_filter}%"))
+    sort_by, sort_order = normalize_sort(sort_by, sort_order, can_rank=score is not None)
+    if sort_by == "relevance":
+        sort_column = score
+        query = query.add_columns(score.label("relevance"))
+    else:
+        sort_column = SORT_COLUMNS[sort_by]
 
-    # Apply sorting
-    # Map sort_by to actual column
-    sort_column_map = {
-        "fencer_name": Fencer.name,
-        "tournament_name": Tournament.name,
-        "last_seen_at": Registration.last_seen_at
-    }
+    # Registration.id breaks ties so the ordering (and the cursor) is total.
+    # The redundant bound on the sort column alone lets the index seek to it.
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        if sort_order == "asc":
+            query = query.filter(
+                sort_column >= sort_value,
+                or_(sort_column > sort_value, Registration.id > last_id),
+            )
+        else:
+            query = query.filter(
+                sort_column <= sort_value,
+                or_(sort_column < sort_value, Registration.id < last_id),
+            )
 
-    # Default to last_seen_at if invalid sort_by
-    sort_column = sort_column_map.get(sort_by, Registration.last_seen_at)
+    direction = asc if sort_order == "asc" else desc
+    query = query.order_by(direction(sort_column), direction(Registration.id))
 
-    # Apply sort order
-    if sort_order.lower() == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        # Default to desc if invalid sort_order
-        query = query.order_by(desc(sort_column))
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
 
-    # Execute query and convert to list of dicts
-    results = []
-    for row in query.all():
-        results.append({
+    items: List[Dict[str, Any]] = []
+    for row in rows:
+        items.append({
             "id": row.id,
             "fencer_name": row.fencer_name,
             "tournament_name": row.tournament_name,
@@ -79,4 +290,16 @@ def query_registrations(
             "last_seen_at": row.last_seen_at.isoformat() if row.last_seen_at else None
         })
 
-    return results
\ No newline at end of file
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "page_size": page_size,
+        "total_count": count_registrations(db, tournament_filter, fencer_filter, event_filter),
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+    }
@@ -0,0 +1,162 @@
+"""
+Lease-based scrape task queue shared by any number of scraper nodes.
+
+Every club URL and fencer ID to scrape is a row in ``scrape_tasks`` with a
+``next_run_at``. A node claims a batch of due rows with one atomic UPDATE that
+stamps them with its lease (owner, token, expiry), keeps the lease alive with
+heartbeats while it works, and releases each task with its result and next
+run time. Two nodes never hold the same task, and a task whose node dies is
+picked up by another node once its lease expires.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_LEASE_SEC = int(os.getenv("SCRAPE_LEASE_SEC", "300"))
+SCRAPE_TASK_BATCH_SIZE = int(os.getenv("SCRAPE_TASK_BATCH_SIZE", "10"))
+SCRAPE_TASK_RETRY_MIN = int(os.getenv("SCRAPE_TASK_RETRY_MIN", "5"))
+SCRAPE_POLL_SEC = float(os.getenv("SCRAPE_POLL_SEC", "30"))
+
+KIND_CLUB = "club"
+KIND_FENCER = "fencer"
+
+# Handlers scrape one target and return a JSON-serializable summary
+TaskHandler = Callable[[Session, str], Dict[str, Any]]
+
+
+def default_worker_id() -> str:
+    """Identify this node in ``lease_owner`` (host, pid and a per-process suffix)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def sync_targets(db: Session, kind: str, targets: Iterable[str]) -> Dict[str, int]:
+    """Add tasks for new ``targets`` and drop unleased tasks no longer wanted."""
+    added, removed = crud.sync_scrape_tasks(db, kind, targets, datetime.now(UTC))
+    db.commit()
+    if added or removed:
+        logger.info("Synced %s scrape tasks (added=%s removed=%s)", kind, added, removed)
+    return {"added": added, "removed": removed}
+
+
+class LeaseKeeper:
+    """
+    Renew a claimed batch's lease from a background thread until closed.
+
+    Uses its own session so heartbeats are not held up by the long-running
+    scrape transaction on the caller's session.
+    """
+
+    def __init__(
+        self,
+        lease_token: str,
+        lease_seconds: int = SCRAPE_LEASE_SEC,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.lease_token = lease_token
+        self.lease_seconds = lease_seconds
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="scrape-lease-keeper", daemon=True)
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def heartbeat(self) -> int:
+        """Extend the lease now; returns the number of tasks still held."""
+        session = self.session_factory()
+        try:
+            renewed = crud.renew_scrape_task_leases(
+                session, self.lease_token, self.lease_seconds, datetime.now(UTC)
+            )
+            session.commit()
+            return renewed
+        finally:
+            session.close()
+
+    def _run(self) -> None:
+        interval = max(1, self.lease_seconds // 3)
+        while not self._stop.wait(interval):
+            try:
+                if self.heartbeat() == 0:
+                    return
+            except Exception:  # pragma: no cover - logged for ops visibility
+                logger.exception("Scrape lease heartbeat failed")
+
+
+def process_due_tasks(
+    db: Session,
+    kind: str,
+    handler: TaskHandler,
+    worker_id: str,
+    interval_minutes: int,
+    limit: int = SCRAPE_TASK_BATCH_SIZE,
+    lease_seconds: int = SCRAPE_LEASE_SEC,
+    session_factory: Optional[Callable[[], Session]] = None,
+) -> Dict[str, int]:
+    """
+    Claim up to ``limit`` due ``kind`` tasks, run ``handler`` on each and release them.
+
+    Successful tasks are due again after ``interval_minutes``; failed ones
+    after ``SCRAPE_TASK_RETRY_MIN`` (or the interval, if shorter). Returns
+    counts of claimed, succeeded, failed and lost (lease taken over) tasks.
+    """
+    tasks = crud.claim_scrape_tasks(db, kind, worker_id, limit, lease_seconds, datetime.now(UTC))
+    db.commit()
+
+    stats = {"claimed": len(tasks), "succeeded": 0, "failed": 0, "lost": 0}
+    if not tasks:
+        return stats
+
+    lease_token = tasks[0].lease_token
+    tasks = [(task.id, task.target) for task in tasks]
+    retry_minutes = min(SCRAPE_TASK_RETRY_MIN, interval_minutes)
+
+    with LeaseKeeper(lease_token, lease_seconds, session_factory or SessionLocal):
+        for task_id, target in tasks:
+            result = error = None
+            try:
+                result = json.dumps(handler(db, target), default=str)
+                next_run_at = datetime.now(UTC) + timedelta(minutes=interval_minutes)
+                stats["succeeded"] += 1
+            except Exception as exc:
+                db.rollback()
+                error = str(exc) or exc.__class__.__name__
+                next_run_at = datetime.now(UTC) + timedelta(minutes=retry_minutes)
+                stats["failed"] += 1
+                logger.exception("Scrape task %s %s failed", kind, target)
+
+            released = crud.release_scrape_task(
+                db, task_id, lease_token, next_run_at, datetime.now(UTC), result=result, error=error
+            )
+            db.commit()
+            if not released:
+                stats["lost"] += 1
+                logger.warning("Lease on %s task %s was lost before release", kind, target)
+
+    logger.info(
+        "Processed %s %s task(s) (succeeded=%s failed=%s lost=%s)",
+        stats["claimed"],
+        kind,
+        stats["succeeded"],
+        stats["failed"],
+        stats["lost"],
+    )
+    return stats
@@ -2,13 +2,24 @@ import requests
 import logging
 import time
 from bs4 import BeautifulSoup
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from urllib.parse import urlparse
-from typing import Dict, List, Set
-
-from ..crud import get_or_create_fencer, get_or_create_tournament, update_or_create_registration
-from .notification_service import send_registration_notification
-from .mailgun_client import NotificationError
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ..crud import (
+    ScrapedRow,
+    bulk_ingest_registrations,
+    bump_data_versions_for_club,
+    get_active_tracked_club_urls,
+    get_or_create_fencer,
+    get_or_create_tournament,
+    is_postgres,
+    upsert_registration_event,
+)
+from .. import query_stats
+from ..models import Registration
+from . import metrics_service
+from .alert_service import enqueue_registration_alerts
 
 # Constants
 MAX_RETRIES = 3
@@ -17,6 +28,12 @@ RETRY_DELAYS = [1, 2, 4]  # Exponential backoff in seconds
 
 logger = logging.getLogger(__name__)
 
+_ROWS_PARSED = metrics_service.SCRAPE_ROWS_PARSED.labels("club")
+_RUN_SUCCEEDED = metrics_service.SCRAPE_RUNS.labels("club", "success")
+_RUN_FAILED = metrics_service.SCRAPE_RUNS.labels("club", "failure")
+_NEW_REGISTRATIONS = metrics_service.REGISTRATIONS.labels("club", "new")
+_UPDATED_REGISTRATIONS = metrics_service.REGISTRATIONS.labels("club", "updated")
+
 
 def _extract_table_headers(table) -> List[str]:
     """Return normalized header labels for the given table."""
@@ -116,6 +133,24 @@ def normalize_club_url(url: str) -> str:
     return normalized_url
 
 
+def resolve_club_targets(db: Session, configured_urls: Iterable[str] = ()) -> List[str]:
+    """
+    Return the club registration pages to scrape this cycle.
+
+    Combines the distinct active ``TrackedClub`` URLs with ``configured_urls``
+    (``--club-url``/``SCRAPER_CLUB_URLS``). URLs are normalized, so a club
+    tracked by many users, or also configured, appears once. Called on every
+    cycle so newly tracked clubs are scraped without a restart.
+    """
+    targets: Dict[str, None] = {}
+    for url in [*get_active_tracked_club_urls(db), *configured_urls]:
+        try:
+            targets.setdefault(normalize_club_url(url))
+        except ValueError as e:
+            logger.warning("Skipping invalid club URL %s: %s", url, e)
+    return list(targets)
+
+
 def scrape_and_persist(db: Session, club_url: str) -> Dict[str, int]:
     """
     Scrape registration data from fencingtracker.com club URL and persist to database.
@@ -134,11 +169,65 @@ def scrape_and_persist(db: Session, club_url: str) -> Dict[str, int]:
     # Normalize the URL
     try:
         normalized_url = normalize_club_url(club_url)
-        logger.info(f"Normalized URL: {normalized_url}")
+        logger.info("Normalized URL: %s", normalized_url)
     except ValueError as e:
-        logger.error(f"URL normalization failed: {e}")
+        logger.error("URL normalization failed: %s", e)
         raise
 
+    timer = metrics_service.StageTimer(metrics_service.SCRAPE_STAGE_SECONDS, "club")
+    with query_stats.track() as queries:
+        try:
+            content = _fetch_page(normalized_url, timer)
+
+            with timer.stage("parse"):
+                soup = BeautifulSoup(content, 'html.parser')
+                rows = _parse_registration_rows(soup, timer)
+            _ROWS_PARSED.inc(len(rows))
+
+            with timer.stage("persist"):
+                if is_postgres(db):
+                    persist = _persist_rows_bulk
+                else:
+                    persist = _persist_rows
+                new_count, updated_count, total_count, changed_count = persist(db, rows, normalized_url, timer)
+
+                # A re-scrape that only refreshes last_seen_at changes nothing the
+                # trackers' pages show, so their ETags stay valid
+                if changed_count:
+                    bump_data_versions_for_club(db, normalized_url)
+                db.commit()
+        except Exception:
+            _RUN_FAILED.inc()
+            raise
+        finally:
+            timer.observe()
+
+    _RUN_SUCCEEDED.inc()
+    _NEW_REGISTRATIONS.inc(new_count)
+    _UPDATED_REGISTRATIONS.inc(updated_count)
+
+    result = {
+        "new": new_count,
+        "updated": updated_count,
+        "total": total_count,
+        "timings_ms": timer.milliseconds(),
+        "bytes": len(content),
+        "queries": queries.count,
+    }
+    logger.info(
+        "Scrape stats %s",
+        metrics_service.format_fields({"scraper": "club", "url": normalized_url, **result}),
+    )
+    return result
+
+
+def _fetch_page(normalized_url: str, timer: metrics_service.StageTimer) -> bytes:
+    """
+    GET a club page, retrying connection errors and 5xx responses with backoff.
+
+    Times ``connect`` (DNS, connection set-up and waiting for the response
+    headers) separately from ``download`` (reading the body).
+    """
     # HTTP headers to avoid bot detection
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -152,156 +241,222 @@ def scrape_and_persist(db: Session, club_url: str) -> Dict[str, int]:
 
     for attempt in range(MAX_RETRIES):
         try:
-            logger.info(f"Fetching registrations from {normalized_url} (attempt {attempt + 1}/{MAX_RETRIES})")
-            response = session.get(normalized_url, headers=headers, timeout=TIMEOUT_SECONDS)
+            logger.info("Fetching registrations from %s (attempt %s/%s)", normalized_url, attempt + 1, MAX_RETRIES)
+            with timer.stage("connect"):
+                response = session.get(normalized_url, headers=headers, timeout=TIMEOUT_SECONDS, stream=True)
 
             # Check status code before raising to handle 4xx vs 5xx differently
             if response.status_code >= 400:
                 # Don't retry client errors (4xx)
                 if 400 <= response.status_code < 500:
-                    logger.error(f"HTTP client error {response.status_code}: {response.reason}")
+                    logger.error("HTTP client error %s: %s", response.status_code, response.reason)
                     raise Exception(f"HTTP {response.status_code} error for {normalized_url}: {response.reason}")
 
                 # Retry server errors (5xx)
                 if attempt == MAX_RETRIES - 1:
-                    logger.error(f"Failed after {MAX_RETRIES} attempts: HTTP {response.status_code}")
+                    logger.error("Failed after %s attempts: HTTP %s", MAX_RETRIES, response.status_code)
                     raise Exception(f"Failed to fetch data after {MAX_RETRIES} attempts: HTTP {response.status_code} {response.reason}")
 
                 delay = RETRY_DELAYS[attempt]
-                logger.warning(f"HTTP error {response.status_code}, retrying in {delay}s...")
+                logger.warning("HTTP error %s, retrying in %ss...", response.status_code, delay)
+                response.close()
                 time.sleep(delay)
                 continue
 
-            logger.info(f"Successfully fetched data (HTTP {response.status_code})")
+            logger.info("Successfully fetched data (HTTP %s)", response.status_code)
             break  # Success
 
         except requests.exceptions.RequestException as e:
             # Retry on connection errors
             if attempt == MAX_RETRIES - 1:
-                logger.error(f"Failed after {MAX_RETRIES} attempts: {e}")
+                logger.error("Failed after %s attempts: %s", MAX_RETRIES, e)
                 raise Exception(f"Failed to fetch data after {MAX_RETRIES} attempts: {e}")
 
             delay = RETRY_DELAYS[attempt]
-            logger.warning(f"Connection error: {e}, retrying in {delay}s...")
+            logger.warning("Connection error: %s, retrying in %ss...", e, delay)
             time.sleep(delay)
 
     if not response:
         raise Exception(f"Failed to fetch data from {normalized_url}")
 
-    # Parse HTML
-    soup = BeautifulSoup(response.content, 'html.parser')
+    with timer.stage("download"):
+        return response.content
+
+
+def _parse_registration_rows(soup: BeautifulSoup, timer: metrics_service.StageTimer) -> List[ScrapedRow]:
+    """
+    Extract (fencer, tournament, date, event) rows from a club registrations page.
 
+    Finding the tournament headings and their registration tables is timed
+    as the ``detect`` stage.
+    """
     # Find all tournament headings (h3 tags)
-    headings = soup.find_all('h3')
+    with timer.stage("detect"):
+        headings = soup.find_all('h3')
 
     if not headings:
         logger.error("No tournament headings (<h3>) found on the page")
         raise Exception("No tournament sections found on the page")
 
-    logger.info(f"Found {len(headings)} tournament sections")
-
-    new_count = 0
-    updated_count = 0
-    total_count = 0
+    logger.info("Found %s tournament sections", len(headings))
 
+    parsed: List[ScrapedRow] = []
     processed_headings: Set[str] = set()
 
     # Process each tournament section
     for heading_idx, heading in enumerate(headings, start=1):
         tournament_name = heading.get_text(strip=True)
-        logger.info(f"Processing tournament {heading_idx}/{len(headings)}: {tournament_name}")
+        logger.info("Processing tournament %s/%s: %s", heading_idx, len(headings), tournament_name)
 
         if _should_skip_heading(tournament_name):
-            logger.debug(f"  [{tournament_name}] Skipping non-tournament heading")
+            logger.debug("  [%s] Skipping non-tournament heading", tournament_name)
             continue
 
         normalized_heading = tournament_name.lower()
         if normalized_heading in processed_headings:
-            logger.debug(f"  [{tournament_name}] Already processed heading, skipping duplicate")
+            logger.debug("  [%s] Already processed heading, skipping duplicate", tournament_name)
             continue
 
         processed_headings.add(normalized_heading)
 
         # Find the next table after this heading
-        table = heading.find_next('table')
+        with timer.stage("detect"):
+            table = heading.find_next('table')
+            is_registration_table = table is not None and _is_registration_table(table)
 
         if not table:
-            logger.warning(f"  [{tournament_name}] No table found for tournament, skipping")
+            logger.warning("  [%s] No table found for tournament, skipping", tournament_name)
             continue
 
-        if not _is_registration_table(table):
-            logger.debug(f"  [{tournament_name}] Skipping non-registration table for heading")
+        if not is_registration_table:
+            logger.debug("  [%s] Skipping non-registration table for heading", tournament_name)
             continue
 
         # Parse rows in this tournament's table
         rows = table.find_all('tr')[1:]  # Skip header row
-        logger.info(f"  [{tournament_name}] Found {len(rows)} registrations")
+        logger.info("  [%s] Found %s registrations", tournament_name, len(rows))
 
         for row_idx, row in enumerate(rows, start=1):
             cells = row.find_all('td')
 
             if len(cells) != 4:
-                logger.warning(f"  [{tournament_name}] Skipping row {row_idx} with {len(cells)} columns (expected 4)")
+                logger.warning(
+                    "  [%s] Skipping row %s with %s columns (expected 4)",
+                    tournament_name,
+                    row_idx,
+                    len(cells),
+                )
                 continue
 
-            try:
-                # Correct parsing for fencingtracker.com structure:
-                # Column 0: Name (fencer)
-                # Column 1: Event (e.g., "Junior Women's Epee") - stored in events field
-                # Column 2: Status (usually empty)
-                # Column 3: Date (tournament date)
-                fencer_name = cells[0].get_text(strip=True)
-                event_name = cells[1].get_text(strip=True)
-                # Skip cells[2] (Status) - appears to be empty
-                event_date = cells[3].get_text(strip=True)
-
-                # Skip empty rows
-                if not fencer_name or not event_name:
-                    logger.debug(f"  [{tournament_name}] Skipping row {row_idx} with empty fencer or event name")
-                    continue
-
-                # Use empty string if date is missing
-                if not event_date:
-                    event_date = "TBD"
-                    logger.warning(f"  [{tournament_name}] Missing date for row {row_idx}, using 'TBD'")
-
-                # Get or create fencer and tournament
-                # Use tournament_name from heading, not from table
-                fencer = get_or_create_fencer(db, fencer_name)
-                tournament = get_or_create_tournament(db, tournament_name, event_date)
-
-                # Store event_name in the events field where it belongs
-                registration, is_new = update_or_create_registration(
-                    db,
-                    fencer,
-                    tournament,
-                    event_name,
-                    normalized_url,
-                )
+            # Correct parsing for fencingtracker.com structure:
+            # Column 0: Name (fencer)
+            # Column 1: Event (e.g., "Junior Women's Epee") - stored in events field
+            # Column 2: Status (usually empty)
+            # Column 3: Date (tournament date)
+            fencer_name = cells[0].get_text(strip=True)
+            event_name = cells[1].get_text(strip=True)
+            # Skip cells[2] (Status) - appears to be empty
+            event_date = cells[3].get_text(strip=True)
+
+            # Skip empty rows
+            if not fencer_name or not event_name:
+                logger.debug("  [%s] Skipping row %s with empty fencer or event name", tournament_name, row_idx)
+                continue
 
-                if is_new:
-                    new_count += 1
-                    # Send notification for new registration
-                    try:
-                        send_registration_notification(fencer_name, tournament_name, event_name, normalized_url)
-                        logger.info(f"  [{tournament_name}] Notification sent: {fencer_name} -> {event_name}")
-                    except NotificationError as e:
-                        logger.error(f"  [{tournament_name}] Failed to send notification for {fencer_name}: {e}")
-                else:
-                    updated_count += 1
+            # Use empty string if date is missing
+            if not event_date:
+                event_date = "TBD"
+                logger.warning("  [%s] Missing date for row %s, using 'TBD'", tournament_name, row_idx)
 
-                total_count += 1
+            # Use tournament_name from heading, not from table
+            parsed.append((fencer_name, tournament_name, event_date, event_name))
 
-            except Exception as e:
-                # Log the error but continue processing other rows
-                logger.error(f"  [{tournament_name}] Error processing row {row_idx}: {e}")
-                continue
+    return parsed
 
-    db.commit()
-    logger.info(f"Scraping complete. Total: {total_count}, New: {new_count}, Updated: {updated_count}")
 
-    return {
-        "new": new_count,
-        "updated": updated_count,
-        "total": total_count
-    }
+def _persist_rows(
+    db: Session,
+    rows: List[ScrapedRow],
+    club_url: str,
+    timer: metrics_service.StageTimer,
+) -> Tuple[int, int, int, int]:
+    """Upsert parsed rows one at a time through the ORM.
+
+    Returns new, updated (existing rows seen again), total and changed
+    (created or given a new event) counts.
+    """
+    new_count = 0
+    updated_count = 0
+    total_count = 0
+    changed_count = 0
+
+    for fencer_name, tournament_name, event_date, event_name in rows:
+        try:
+            # Get or create fencer and tournament
+            fencer = get_or_create_fencer(db, fencer_name)
+            tournament = get_or_create_tournament(db, tournament_name, event_date)
+
+            # Store event_name in the events field where it belongs
+            registration, is_new, changed = upsert_registration_event(
+                db,
+                fencer,
+                tournament,
+                event_name,
+                club_url,
+            )
+            changed_count += changed
+
+            if is_new:
+                new_count += 1
+                # Queue instant alerts for users tracking this club or fencer
+                with timer.stage("notify"):
+                    queued = enqueue_registration_alerts(db, registration, fencer, tournament)
+                if queued:
+                    logger.info("  [%s] Queued %s alert(s): %s -> %s", tournament_name, queued, fencer_name, event_name)
+            else:
+                updated_count += 1
+
+            total_count += 1
+
+        except Exception as e:
+            # Log the error but continue processing other rows
+            logger.error("  [%s] Error processing row for %s: %s", tournament_name, fencer_name, e)
+            continue
+
+    return new_count, updated_count, total_count, changed_count
+
+
+def _persist_rows_bulk(
+    db: Session,
+    rows: List[ScrapedRow],
+    club_url: str,
+    timer: metrics_service.StageTimer,
+) -> Tuple[int, int, int, int]:
+    """Upsert a whole page with one COPY and set-based merge (PostgreSQL only)."""
+    if not rows:
+        return 0, 0, 0, 0
+
+    new_ids, changed_count = bulk_ingest_registrations(db, rows, club_url)
+
+    if new_ids:
+        with timer.stage("notify"):
+            _enqueue_new_registration_alerts(db, new_ids)
+
+    new_count = len(new_ids)
+    total_count = len(rows)
+    return new_count, total_count - new_count, total_count, changed_count
+
+
+def _enqueue_new_registration_alerts(db: Session, new_ids: List[int]) -> None:
+    """Queue instant alerts for registrations created by a bulk ingest."""
+    new_registrations = (
+        db.query(Registration)
+        .options(
+            joinedload(Registration.fencer),
+            joinedload(Registration.tournament),
+        )
+        .filter(Registration.id.in_(new_ids))
+        .all()
+    )
+    for registration in new_registrations:
+        enqueue_registration_alerts(db, registration, registration.fencer, registration.tournament)
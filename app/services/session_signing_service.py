@@ -0,0 +1,263 @@
+"""HMAC-signed stateless session tokens.
+
+Enabled with ``SESSION_MODE=signed``. The session cookie carries a signed
+payload (session id, user details, expiry and CSRF token), so validating a
+request only needs an HMAC check. Logout, user deactivation and demotion are
+recorded in ``revoked_sessions`` and enforced through an in-memory copy of the
+revocations that have not expired yet, refreshed periodically; local
+revocations take effect immediately, revocations made by other processes
+within ``SESSION_REVOCATION_REFRESH_SEC``.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .. import crud
+from ..models import User
+
+SESSION_REVOCATION_REFRESH_SEC = int(os.getenv("SESSION_REVOCATION_REFRESH_SEC", "30"))
+# Tolerance for clock differences between the process issuing a token and the
+# process revoking a user's sessions.
+CLOCK_SKEW_SEC = 5
+
+logger = logging.getLogger(__name__)
+
+
+def is_enabled() -> bool:
+    """Return True when signed session cookies are configured."""
+    return os.getenv("SESSION_MODE", "database").lower() == "signed"
+
+
+def _signing_key() -> bytes:
+    key = os.getenv("SESSION_SIGNING_KEY")
+    if not key:
+        raise RuntimeError("SESSION_SIGNING_KEY environment variable is required when SESSION_MODE=signed")
+    return key.encode("utf-8")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> str:
+    return _b64encode(hmac.new(_signing_key(), payload, hashlib.sha256).digest())
+
+
+class SignedSession:
+    """Session data decoded from a signed cookie; mirrors the ``UserSession`` fields used by the web layer."""
+
+    __slots__ = ("id", "user", "csrf_token", "expires_at", "issued_at")
+
+    def __init__(self, id: int, user: User, csrf_token: str, expires_at: datetime, issued_at: float):
+        self.id = id
+        self.user = user
+        self.csrf_token = csrf_token
+        self.expires_at = expires_at
+        self.issued_at = issued_at
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite hands back naive datetimes; every stored value is UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class RevocationList:
+    """Unexpired revocations loaded from ``revoked_sessions`` plus local ones since."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refreshed_at: Optional[float] = None
+        # session id -> token expiry
+        self._revoked_sessions: Dict[int, float] = {}
+        # user id -> (latest revocation time, expiry)
+        self._revoked_users: Dict[int, Tuple[float, float]] = {}
+
+    def refresh(self, db: Session) -> None:
+        """Reload the unexpired revocations from the database."""
+        started_at = time.time()
+        revoked_sessions: Dict[int, float] = {}
+        revoked_users: Dict[int, Tuple[float, float]] = {}
+        for row in crud.get_active_session_revocations(db, datetime.fromtimestamp(started_at, UTC)):
+            expires_at = _timestamp(row.expires_at)
+            if row.session_id is not None:
+                revoked_sessions[row.session_id] = max(expires_at, revoked_sessions.get(row.session_id, 0.0))
+            if row.user_id is not None:
+                _merge_user(revoked_users, row.user_id, _timestamp(row.revoked_at), expires_at)
+
+        with self._lock:
+            # Keep local revocations whose rows may not be committed yet
+            for session_id, expires_at in self._revoked_sessions.items():
+                if expires_at > started_at:
+                    revoked_sessions[session_id] = max(expires_at, revoked_sessions.get(session_id, 0.0))
+            for user_id, (revoked_at, expires_at) in self._revoked_users.items():
+                if expires_at > started_at:
+                    _merge_user(revoked_users, user_id, revoked_at, expires_at)
+            self._revoked_sessions = revoked_sessions
+            self._revoked_users = revoked_users
+            self._refreshed_at = started_at
+
+        logger.debug(
+            "Refreshed session revocation list (%s sessions, %s users)",
+            len(revoked_sessions),
+            len(revoked_users),
+        )
+
+    def maybe_refresh(self, db: Session) -> None:
+        if self._refreshed_at is None or time.time() - self._refreshed_at > SESSION_REVOCATION_REFRESH_SEC:
+            self.refresh(db)
+
+    def revoke_session(self, session_id: int, expires_at: float) -> None:
+        with self._lock:
+            self._revoked_sessions[session_id] = max(expires_at, self._revoked_sessions.get(session_id, 0.0))
+
+    def revoke_user(self, user_id: int, revoked_at: float, expires_at: float) -> None:
+        with self._lock:
+            _merge_user(self._revoked_users, user_id, revoked_at, expires_at)
+
+    def is_revoked(self, session_id: int, user_id: int, issued_at: float) -> bool:
+        with self._lock:
+            if session_id in self._revoked_sessions:
+                return True
+
+            revoked_user = self._revoked_users.get(user_id)
+            return revoked_user is not None and issued_at <= revoked_user[0] + CLOCK_SKEW_SEC
+
+
+def _merge_user(
+    revoked_users: Dict[int, Tuple[float, float]], user_id: int, revoked_at: float, expires_at: float
+) -> None:
+    previous_revoked_at, previous_expires_at = revoked_users.get(user_id, (0.0, 0.0))
+    revoked_users[user_id] = (max(revoked_at, previous_revoked_at), max(expires_at, previous_expires_at))
+
+
+_revocations = RevocationList()
+
+
+def issue_token(session_id: int, user: User, csrf_token: str, expires_at: datetime) -> str:
+    """Return a signed cookie value for a newly created session."""
+    payload = {
+        "sid": session_id,
+        "uid": user.id,
+        "usr": user.username,
+        "eml": user.email,
+        "adm": bool(user.is_admin),
+        "csrf": csrf_token,
+        "iat": time.time(),
+        "exp": int(expires_at.timestamp()),
+    }
+    encoded = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    return f"{encoded}.{_sign(encoded.encode('ascii'))}"
+
+
+def decode_token(token: Optional[str]) -> Optional[dict]:
+    """Verify a signed token and return its payload, or None if invalid or expired."""
+    # compare_digest raises TypeError on non-ASCII str, and valid tokens never contain any
+    if not token or not token.isascii() or "." not in token:
+        return None
+
+    encoded, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(signature, _sign(encoded.encode("ascii"))):
+        return None
+
+    try:
+        payload = json.loads(_b64decode(encoded))
+    except ValueError:
+        return None
+
+    if payload.get("exp", 0) < time.time():
+        return None
+
+    return payload
+
+
+def load_session(db: Session, token: Optional[str]) -> Optional[SignedSession]:
+    """Return the session encoded in ``token`` unless it is invalid or revoked.
+
+    Only touches the database when the revocation list is due for a refresh.
+    """
+    payload = decode_token(token)
+    if payload is None:
+        return None
+
+    _revocations.maybe_refresh(db)
+    return _session_from_payload(payload)
+
+
+async def load_session_async(db: AsyncSession, token: Optional[str]) -> Optional[SignedSession]:
+    """Async variant of ``load_session`` for routes using an ``AsyncSession``."""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+
+    await db.run_sync(_revocations.maybe_refresh)
+    return _session_from_payload(payload)
+
+
+def _session_from_payload(payload: dict) -> Optional[SignedSession]:
+    if _revocations.is_revoked(payload["sid"], payload["uid"], payload["iat"]):
+        return None
+
+    user = User(
+        id=payload["uid"],
+        username=payload["usr"],
+        email=payload["eml"],
+        is_admin=payload["adm"],
+        is_active=True,
+    )
+    return SignedSession(
+        id=payload["sid"],
+        user=user,
+        csrf_token=payload["csrf"],
+        expires_at=datetime.fromtimestamp(payload["exp"], UTC),
+        issued_at=payload["iat"],
+    )
+
+
+def revoke_token(db: Session, token: Optional[str]) -> None:
+    """Delete the session behind ``token`` and record its revocation until it expires."""
+    payload = decode_token(token)
+    if payload is None:
+        return
+
+    crud.delete_session_by_id(db, payload["sid"])
+    crud.create_session_revocation(
+        db,
+        revoked_at=datetime.now(UTC),
+        expires_at=datetime.fromtimestamp(payload["exp"], UTC),
+        session_id=payload["sid"],
+    )
+    _revocations.revoke_session(payload["sid"], payload["exp"])
+
+
+def revoke_user(db: Session, user_id: int, expires_at: datetime) -> None:
+    """Reject every session issued to ``user_id`` so far, until ``expires_at``.
+
+    ``expires_at`` must be no earlier than the expiry of any token already
+    issued to the user (``auth_service.revoke_user_sessions`` passes the full
+    session lifetime).
+    """
+    revoked_at = time.time()
+    crud.create_session_revocation(
+        db,
+        revoked_at=datetime.fromtimestamp(revoked_at, UTC),
+        expires_at=expires_at,
+        user_id=user_id,
+    )
+    _revocations.revoke_user(user_id, revoked_at, expires_at.timestamp())
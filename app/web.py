@@ -0,0 +1,67 @@
+"""FastAPI application: ``uvicorn app.web:app``.
+
+Only the web stack is imported here; scheduling and scraping live in
+``app.cli`` and are never loaded by the web process.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, Response
+
+# Load environment variables from .env file before app modules read their settings
+load_dotenv()
+
+from .database import dispose_async_engine
+from .services import metrics_service, password_pool_service
+from .api import endpoints
+from .api.dependencies import precompile_templates
+from .api.timing import ServerTimingMiddleware
+from .api.admin import router as admin_router
+from .api.auth import router as auth_router
+from .api.clubs import router as clubs_router
+from .api.registrations import router as registrations_router
+from .api.tracked_fencers import router as fencers_router
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    count = precompile_templates()
+    logger.info("Compiled %d templates in %.1f ms", count, (time.perf_counter() - started) * 1000)
+    yield
+    # Release pooled async connections and password worker threads
+    await dispose_async_engine()
+    password_pool_service.shutdown()
+
+
+app = FastAPI(
+    title="Fencing Club Registration Notifications",
+    description="An API to track and get notified about fencing tournament registrations.",
+    lifespan=lifespan,
+)
+
+app.add_middleware(ServerTimingMiddleware)
+
+# Include routers
+app.include_router(endpoints.router)
+app.include_router(auth_router)
+app.include_router(clubs_router)
+app.include_router(fencers_router)
+app.include_router(registrations_router)
+app.include_router(admin_router)
+
+
+@app.get("/health")
+def health_check():
+    return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint for this web process."""
+    return Response(metrics_service.render(), media_type=metrics_service.CONTENT_TYPE)
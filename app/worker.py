@@ -0,0 +1,168 @@
+"""Unified background worker: ``python -m app.cli worker``.
+
+Runs every recurring job (club scraping, fencer scraping, daily digests,
+session cleanup and instant-alert dispatch) on one asyncio scheduler. The
+jobs themselves are blocking and run on a small thread pool.
+
+Jobs live in a SQLAlchemy job store (SQLite by default), so schedules and
+next run times survive restarts and a digest missed while the worker was
+down still goes out if the worker returns within the misfire grace time.
+Every job coalesces missed runs into one and allows a single running
+instance, so a slow fencer run delays the next run instead of overlapping
+it. Run one worker per job store.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import List, Optional
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from .cli import ALERT_DISPATCH_INTERVAL_MINUTES, SESSION_SWEEP_INTERVAL_MINUTES
+from .services import digest_service
+
+WORKER_JOBSTORE_URL = os.getenv("WORKER_JOBSTORE_URL", "sqlite:///./worker_jobs.db")
+WORKER_MISFIRE_GRACE_SEC = int(os.getenv("WORKER_MISFIRE_GRACE_SEC", "300"))
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "4"))
+
+# Jobs that run immediately on startup when ``run_now`` is set
+RUN_NOW_JOB_IDS = ("scrape_clubs", "scrape_fencers", "sweep_sessions")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobSpec:
+    """A recurring job; ``func`` is a textual reference so it can be persisted."""
+
+    id: str
+    func: str
+    trigger: BaseTrigger
+    args: List = field(default_factory=list)
+
+
+def build_job_specs(club_urls: List[str], interval_minutes: int, scrape: bool = True) -> List[JobSpec]:
+    """
+    Return the worker's jobs for the given extra club URLs and scrape interval.
+
+    With ``scrape=False`` the club and fencer scrape jobs are left out, for
+    deployments where ``scrape-node`` processes do the scraping.
+    """
+    specs = [
+        JobSpec(
+            "dispatch_alerts",
+            "app.cli:_run_alert_dispatch_job",
+            IntervalTrigger(minutes=ALERT_DISPATCH_INTERVAL_MINUTES),
+        ),
+        JobSpec(
+            "sweep_sessions",
+            "app.cli:_run_session_sweep_job",
+            IntervalTrigger(minutes=SESSION_SWEEP_INTERVAL_MINUTES),
+        ),
+        JobSpec(
+            "send_digests",
+            "app.services.digest_service:send_daily_digests",
+            CronTrigger(hour=digest_service.DIGEST_HOUR, minute=digest_service.DIGEST_MINUTE),
+        ),
+    ]
+    if not scrape:
+        return specs
+
+    # The club job re-reads tracked clubs on every run; club_urls are extra targets
+    return [
+        JobSpec(
+            "scrape_clubs",
+            "app.cli:_run_club_scrape_cycle",
+            IntervalTrigger(minutes=interval_minutes),
+            args=[list(club_urls)],
+        ),
+        JobSpec(
+            "scrape_fencers",
+            "app.cli:_run_fencer_scrape_job",
+            IntervalTrigger(minutes=interval_minutes),
+        ),
+        *specs,
+    ]
+
+
+def create_scheduler(jobstore_url: str = WORKER_JOBSTORE_URL) -> AsyncIOScheduler:
+    """Create the worker scheduler with a persistent job store and overlap protection."""
+    return AsyncIOScheduler(
+        jobstores={"default": SQLAlchemyJobStore(url=jobstore_url)},
+        executors={"default": ThreadPoolExecutor(WORKER_THREADS)},
+        job_defaults={
+            "coalesce": True,
+            "max_instances": 1,
+            "misfire_grace_time": WORKER_MISFIRE_GRACE_SEC,
+        },
+    )
+
+
+def sync_jobs(scheduler: AsyncIOScheduler, specs: List[JobSpec]) -> None:
+    """
+    Make the stored jobs match ``specs``.
+
+    Unchanged jobs are left alone so their stored next run time (and any
+    pending misfire) survives restarts; changed jobs are replaced and jobs
+    no longer configured are removed.
+    """
+    wanted = {spec.id for spec in specs}
+    for job in scheduler.get_jobs():
+        if job.id not in wanted:
+            logger.info("Removing job %s", job.id)
+            job.remove()
+
+    for spec in specs:
+        existing = scheduler.get_job(spec.id)
+        if (
+            existing is not None
+            and existing.func_ref == spec.func
+            and str(existing.trigger) == str(spec.trigger)
+            and list(existing.args) == spec.args
+        ):
+            continue
+        scheduler.add_job(spec.func, spec.trigger, id=spec.id, args=spec.args, replace_existing=True)
+        logger.info("Scheduled job %s (%s)", spec.id, spec.trigger)
+
+
+async def run_worker(
+    club_urls: List[str],
+    interval_minutes: int,
+    run_now: bool = True,
+    stop_event: Optional[asyncio.Event] = None,
+    scrape: bool = True,
+) -> None:
+    """Run the scheduler until SIGINT/SIGTERM (or ``stop_event``) and then drain running jobs."""
+    scheduler = create_scheduler()
+    scheduler.start(paused=True)
+    sync_jobs(scheduler, build_job_specs(club_urls, interval_minutes, scrape=scrape))
+
+    if run_now:
+        for job_id in RUN_NOW_JOB_IDS:
+            if scheduler.get_job(job_id):
+                scheduler.modify_job(job_id, next_run_time=datetime.now(UTC))
+
+    stop_event = stop_event or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):  # pragma: no cover - non-POSIX loops
+            pass
+
+    scheduler.resume()
+    logger.info("Worker started with %d job(s)", len(scheduler.get_jobs()))
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Worker stopping; waiting for running jobs")
+        scheduler.shutdown(wait=True)
@@ -8,6 +8,7 @@ from alembic import context
 
 # Import the SQLAlchemy Base from our app to get metadata
 from app.database import Base
+from app.search_index import FTS_TABLES
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -29,6 +30,14 @@ config.set_main_option("sqlalchemy.url", database_url)
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    """Leave the FTS5 search tables (and their shadow tables) out of autogenerate."""
+    if type_ == "table":
+        return not any(name == fts or name.startswith(f"{fts}_") for fts in FTS_TABLES)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,6 +60,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -74,7 +84,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
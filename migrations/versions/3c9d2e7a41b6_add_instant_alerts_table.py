@@ -0,0 +1,50 @@
+"""add instant_alerts table
+
+Revision ID: 3c9d2e7a41b6
+Revises: 0e52dd5a3afc, f8a8c6bdf3d7
+Create Date: 2025-10-07 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2e7a41b6'
+down_revision: Union[str, Sequence[str], None] = ('0e52dd5a3afc', 'f8a8c6bdf3d7')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('instant_alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('registration_id', sa.Integer(), nullable=False),
+    sa.Column('recipient', sa.String(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('body', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['registration_id'], ['registrations.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'registration_id', name='uq_instant_alerts_user_registration')
+    )
+    op.create_index(op.f('ix_instant_alerts_id'), 'instant_alerts', ['id'], unique=False)
+    op.create_index(op.f('ix_instant_alerts_status'), 'instant_alerts', ['status'], unique=False)
+    op.create_index(op.f('ix_instant_alerts_user_id'), 'instant_alerts', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_instant_alerts_user_id'), table_name='instant_alerts')
+    op.drop_index(op.f('ix_instant_alerts_status'), table_name='instant_alerts')
+    op.drop_index(op.f('ix_instant_alerts_id'), table_name='instant_alerts')
+    op.drop_table('instant_alerts')
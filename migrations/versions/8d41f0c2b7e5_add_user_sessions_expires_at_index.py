@@ -0,0 +1,28 @@
+"""add index on user_sessions.expires_at
+
+Revision ID: 8d41f0c2b7e5
+Revises: 3c9d2e7a41b6
+Create Date: 2025-10-07 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0c2b7e5'
+down_revision: Union[str, Sequence[str], None] = '3c9d2e7a41b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_user_sessions_expires_at'), 'user_sessions', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_sessions_expires_at'), table_name='user_sessions')
@@ -0,0 +1,50 @@
+"""add scrape_tasks table
+
+Revision ID: a7c3e91f5b20
+Revises: e5f2b8d41c07
+Create Date: 2025-10-13 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91f5b20'
+down_revision: Union[str, Sequence[str], None] = 'e5f2b8d41c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scrape_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('target', sa.String(), nullable=False),
+    sa.Column('next_run_at', sa.DateTime(), nullable=False),
+    sa.Column('lease_owner', sa.String(), nullable=True),
+    sa.Column('lease_token', sa.String(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_started_at', sa.DateTime(), nullable=True),
+    sa.Column('last_finished_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('last_result', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'target', name='uq_scrape_tasks_kind_target')
+    )
+    op.create_index(op.f('ix_scrape_tasks_id'), 'scrape_tasks', ['id'], unique=False)
+    op.create_index(op.f('ix_scrape_tasks_lease_token'), 'scrape_tasks', ['lease_token'], unique=False)
+    op.create_index('ix_scrape_tasks_kind_next_run_at', 'scrape_tasks', ['kind', 'next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scrape_tasks_kind_next_run_at', table_name='scrape_tasks')
+    op.drop_index(op.f('ix_scrape_tasks_lease_token'), table_name='scrape_tasks')
+    op.drop_index(op.f('ix_scrape_tasks_id'), table_name='scrape_tasks')
+    op.drop_table('scrape_tasks')
@@ -0,0 +1,32 @@
+"""add claim columns to instant_alerts
+
+Revision ID: b3e8d20c6a14
+Revises: a7c3e91f5b20
+Create Date: 2025-10-14 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d20c6a14'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91f5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('instant_alerts', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.add_column('instant_alerts', sa.Column('claim_token', sa.String(), nullable=True))
+    op.create_index(op.f('ix_instant_alerts_claim_token'), 'instant_alerts', ['claim_token'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_instant_alerts_claim_token'), table_name='instant_alerts')
+    op.drop_column('instant_alerts', 'claim_token')
+    op.drop_column('instant_alerts', 'claimed_at')
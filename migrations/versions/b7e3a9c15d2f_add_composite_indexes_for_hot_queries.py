@@ -0,0 +1,35 @@
+"""add composite indexes for hot queries
+
+Revision ID: b7e3a9c15d2f
+Revises: 8d41f0c2b7e5
+Create Date: 2025-10-09 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3a9c15d2f'
+down_revision: Union[str, Sequence[str], None] = '8d41f0c2b7e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite index also serves plain club_url lookups
+    op.create_index('ix_registrations_club_url_created_at', 'registrations', ['club_url', 'created_at'], unique=False)
+    op.drop_index(op.f('ix_registrations_club_url'), table_name='registrations')
+    op.create_index('ix_tracked_clubs_user_id_active_created_at', 'tracked_clubs', ['user_id', 'active', 'created_at'], unique=False)
+    op.create_index('ix_tracked_fencers_user_id_active_created_at', 'tracked_fencers', ['user_id', 'active', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tracked_fencers_user_id_active_created_at', table_name='tracked_fencers')
+    op.drop_index('ix_tracked_clubs_user_id_active_created_at', table_name='tracked_clubs')
+    op.create_index(op.f('ix_registrations_club_url'), 'registrations', ['club_url'], unique=False)
+    op.drop_index('ix_registrations_club_url_created_at', table_name='registrations')
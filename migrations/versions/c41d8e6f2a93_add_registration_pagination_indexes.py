@@ -0,0 +1,30 @@
+"""add registration pagination indexes
+
+Revision ID: c41d8e6f2a93
+Revises: b7e3a9c15d2f
+Create Date: 2025-10-10 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e6f2a93'
+down_revision: Union[str, Sequence[str], None] = 'b7e3a9c15d2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_registrations_last_seen_at_id', 'registrations', ['last_seen_at', 'id'], unique=False)
+    op.create_index('ix_registrations_tournament_id', 'registrations', ['tournament_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_registrations_tournament_id', table_name='registrations')
+    op.drop_index('ix_registrations_last_seen_at_id', table_name='registrations')
@@ -0,0 +1,54 @@
+"""backfill registrations.last_seen_at and make it NOT NULL
+
+Revision ID: d6f1a2b3c4e5
+Revises: b3e8d20c6a14
+Create Date: 2025-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f1a2b3c4e5'
+down_revision: Union[str, Sequence[str], None] = 'b3e8d20c6a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_fts_triggers() -> None:
+    # Batch mode rebuilds the table on SQLite, which drops the triggers
+    # keeping registrations_fts in sync; rowids are preserved by the copy.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS registrations_fts_ai AFTER INSERT ON registrations BEGIN "
+        "INSERT INTO registrations_fts(rowid, events) VALUES (new.id, new.events); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS registrations_fts_ad AFTER DELETE ON registrations BEGIN "
+        "INSERT INTO registrations_fts(registrations_fts, rowid, events) VALUES ('delete', old.id, old.events); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS registrations_fts_au AFTER UPDATE OF events ON registrations BEGIN "
+        "INSERT INTO registrations_fts(registrations_fts, rowid, events) VALUES ('delete', old.id, old.events); "
+        "INSERT INTO registrations_fts(rowid, events) VALUES (new.id, new.events); END"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination on (last_seen_at, id) cannot step past NULL sort values
+    op.execute("UPDATE registrations SET last_seen_at = created_at WHERE last_seen_at IS NULL")
+    with op.batch_alter_table('registrations') as batch_op:
+        batch_op.alter_column('last_seen_at', existing_type=sa.DateTime(), nullable=False)
+    _recreate_fts_triggers()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('registrations') as batch_op:
+        batch_op.alter_column('last_seen_at', existing_type=sa.DateTime(), nullable=True)
+    _recreate_fts_triggers()
@@ -0,0 +1,39 @@
+"""add revoked_sessions table
+
+Revision ID: e1a7c4d92b38
+Revises: d6f1a2b3c4e5
+Create Date: 2025-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c4d92b38'
+down_revision: Union[str, Sequence[str], None] = 'd6f1a2b3c4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revoked_sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('revoked_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_revoked_sessions_id'), 'revoked_sessions', ['id'], unique=False)
+    op.create_index(op.f('ix_revoked_sessions_expires_at'), 'revoked_sessions', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_sessions_expires_at'), table_name='revoked_sessions')
+    op.drop_index(op.f('ix_revoked_sessions_id'), table_name='revoked_sessions')
+    op.drop_table('revoked_sessions')
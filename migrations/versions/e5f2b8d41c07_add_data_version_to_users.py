@@ -0,0 +1,28 @@
+"""add data_version to users
+
+Revision ID: e5f2b8d41c07
+Revises: d9a0b3c57e14
+Create Date: 2025-10-12 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f2b8d41c07'
+down_revision: Union[str, Sequence[str], None] = 'd9a0b3c57e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'data_version')
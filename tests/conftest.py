@@ -1,14 +1,31 @@
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.models import Base
+from app.services import fragment_cache_service
+
+
+@pytest.fixture(autouse=True)
+def _clear_fragment_cache():
+    """Rendered fragments are keyed by user id, which every test database reuses."""
+    fragment_cache_service.clear()
+    yield
+    fragment_cache_service.clear()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of the SQLite database file shared by the sync and async sessions."""
+    return tmp_path / "test.db"
 
 
 @pytest.fixture
-def db_session():
-    """Provide a fresh in-memory database session for each test."""
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+def db_session(db_path):
+    """Provide a fresh database session for each test."""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
     TestingSession = sessionmaker(bind=engine)
     Base.metadata.create_all(bind=engine)
     session = TestingSession()
@@ -18,3 +35,17 @@ def db_session():
     finally:
         session.close()
         engine.dispose()
+
+
+@pytest.fixture
+def async_db_override(db_session, db_path):
+    """Override for ``get_async_db`` that opens sessions on the ``db_session`` database."""
+    # NullPool: connections belong to the TestClient's event loop and must not outlive it
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingAsyncSession = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def _get_async_db_override():
+        async with TestingAsyncSession() as session:
+            yield session
+
+    return _get_async_db_override
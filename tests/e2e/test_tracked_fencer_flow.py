@@ -6,7 +6,7 @@ from unittest.mock import patch
 from app import crud, models
 from app.database import SessionLocal, engine
 from app.services import digest_service
-from app.main import _run_scrape_job, _run_fencer_scrape_job
+from app.cli import _run_scrape_job, _run_fencer_scrape_job
 
 @pytest.fixture(scope="module")
 def db_session():
@@ -61,13 +61,14 @@ def test_e2e_tracked_fencer_flow(db_session, monkeypatch):
     _run_fencer_scrape_job()
 
     # 3. Run digest and assert
-    with patch("app.services.digest_service.send_registration_notification") as mock_send:
+    with patch("app.services.digest_service.get_client") as mock_get_client:
         sent = digest_service.send_user_digest(db_session, user)
+    mock_send = mock_get_client.return_value.send_text
 
     assert sent is True
     mock_send.assert_called_once()
     
-    email_body = mock_send.call_args.kwargs['body']
+    email_body = mock_send.call_args.args[1]
     assert "TRACKED CLUBS" in email_body
     assert "TRACKED FENCERS" not in email_body # Deduplicated
     assert email_body.count("Senior Men's Epee") == 1
@@ -0,0 +1,160 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app import crud
+from app.models import InstantAlert
+from app.services import alert_service
+from app.services.mailgun_client import NotificationError
+
+CLUB_URL = "https://fencingtracker.com/club/7/Alerts/registrations"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    alert_service.invalidate_index()
+    yield
+    alert_service.invalidate_index()
+
+
+def _create_user(db_session, username, is_active=True):
+    user = crud.create_user(db_session, username, f"{username}@example.com", "hash")
+    user.is_active = is_active
+    db_session.flush()
+    return user
+
+
+def _create_registration(db_session, fencer_name="Jane Doe", events="Junior Women's Foil", fencingtracker_id=None):
+    fencer = crud.get_or_create_fencer(db_session, fencer_name)
+    fencer.fencingtracker_id = fencingtracker_id
+    tournament = crud.get_or_create_tournament(db_session, "Autumn Open", "2025-10-01")
+    registration, _ = crud.update_or_create_registration(
+        db_session, fencer, tournament, events=events, club_url=CLUB_URL
+    )
+    return registration, fencer, tournament
+
+
+def test_match_applies_weapon_filter_and_skips_inactive_users(db_session):
+    foil_user = _create_user(db_session, "foil")
+    saber_user = _create_user(db_session, "saber")
+    inactive_user = _create_user(db_session, "inactive", is_active=False)
+    crud.create_tracked_club(db_session, foil_user.id, CLUB_URL, weapon_filter="foil")
+    crud.create_tracked_club(db_session, saber_user.id, CLUB_URL, weapon_filter="saber")
+    crud.create_tracked_club(db_session, inactive_user.id, CLUB_URL)
+    db_session.commit()
+
+    index = alert_service.get_index(db_session)
+    matched = index.match(CLUB_URL, None, "Junior Women's Foil")
+
+    assert [subscriber.user_id for subscriber in matched] == [foil_user.id]
+
+
+def test_match_dedupes_users_tracking_club_and_fencer(db_session):
+    user = _create_user(db_session, "both")
+    crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    crud.create_tracked_fencer(db_session, user.id, "555")
+    db_session.commit()
+
+    matched = alert_service.get_index(db_session).match(CLUB_URL, "555", "Cadet Men's Epee")
+
+    assert len(matched) == 1
+    assert matched[0].email == "both@example.com"
+
+
+def test_index_rebuilds_after_invalidation(db_session):
+    assert alert_service.get_index(db_session).match(CLUB_URL, None, "Foil") == []
+
+    user = _create_user(db_session, "late")
+    crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    db_session.commit()
+
+    assert alert_service.get_index(db_session).match(CLUB_URL, None, "Foil") == []
+
+    alert_service.invalidate_index()
+    matched = alert_service.get_index(db_session).match(CLUB_URL, None, "Foil")
+    assert [subscriber.user_id for subscriber in matched] == [user.id]
+
+
+def test_invalidation_during_build_is_not_lost(db_session, monkeypatch):
+    build_index = alert_service.build_index
+    builds = []
+
+    def _build_and_invalidate(db, generation=0):
+        builds.append(generation)
+        if len(builds) == 1:
+            # Tracking changes while the first build is reading subscriptions
+            alert_service.invalidate_index()
+        return build_index(db, generation)
+
+    monkeypatch.setattr(alert_service, "build_index", _build_and_invalidate)
+
+    alert_service.get_index(db_session)
+    alert_service.get_index(db_session)
+    alert_service.get_index(db_session)
+
+    assert len(builds) == 2
+
+
+def test_enqueue_and_dispatch_alerts(db_session):
+    club_user = _create_user(db_session, "club")
+    fencer_user = _create_user(db_session, "fencer")
+    crud.create_tracked_club(db_session, club_user.id, CLUB_URL)
+    crud.create_tracked_fencer(db_session, fencer_user.id, "999")
+    registration, fencer, tournament = _create_registration(db_session, fencingtracker_id="999")
+
+    queued = alert_service.enqueue_registration_alerts(db_session, registration, fencer, tournament)
+    db_session.commit()
+
+    assert queued == 2
+
+    with patch("app.services.alert_service.get_client") as mock_get_client:
+        result = alert_service.dispatch_pending_alerts(db_session)
+    mock_send = mock_get_client.return_value.send_text
+
+    assert result == {"sent": 2, "failed": 0}
+    recipients = sorted(call.kwargs["to"][0] for call in mock_send.call_args_list)
+    assert recipients == ["club@example.com", "fencer@example.com"]
+    assert all(alert.status == "sent" for alert in db_session.query(InstantAlert).all())
+
+
+def test_dispatch_marks_alert_failed_after_max_attempts(db_session):
+    user = _create_user(db_session, "unlucky")
+    crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    registration, fencer, tournament = _create_registration(db_session)
+    alert_service.enqueue_registration_alerts(db_session, registration, fencer, tournament)
+    db_session.commit()
+
+    with patch("app.services.alert_service.get_client") as mock_get_client:
+        mock_get_client.return_value.send_text.side_effect = NotificationError("boom")
+        for _ in range(alert_service.ALERT_MAX_ATTEMPTS):
+            alert_service.dispatch_pending_alerts(db_session)
+
+    alert = db_session.query(InstantAlert).one()
+    assert alert.status == "failed"
+    assert alert.attempts == alert_service.ALERT_MAX_ATTEMPTS
+    assert alert.last_error == "boom"
+
+
+def test_concurrent_dispatchers_claim_disjoint_alerts(db_session):
+    for name in ("first", "second", "third"):
+        user = _create_user(db_session, name)
+        crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    registration, fencer, tournament = _create_registration(db_session)
+    alert_service.enqueue_registration_alerts(db_session, registration, fencer, tournament)
+    db_session.commit()
+
+    now = datetime.now(UTC)
+    stale_before = now - timedelta(minutes=10)
+    first = crud.claim_instant_alerts(db_session, 2, now, stale_before)
+    second = crud.claim_instant_alerts(db_session, 2, now, stale_before)
+    db_session.commit()
+
+    assert len(first) == 2 and len(second) == 1
+    assert {alert.id for alert in first}.isdisjoint(alert.id for alert in second)
+    assert crud.claim_instant_alerts(db_session, 10, now, stale_before) == []
+
+    # A dispatcher that died holding its claim gives the alerts up after the timeout
+    reclaimed = crud.claim_instant_alerts(db_session, 10, now + timedelta(minutes=11), now + timedelta(minutes=1))
+    assert len(reclaimed) == 3
+    assert all(alert.status == "sending" for alert in reclaimed)
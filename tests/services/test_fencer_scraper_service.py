@@ -14,6 +14,9 @@ class DummyResponse:
         self.content = content.encode("utf-8")
         self.reason = reason
 
+    def close(self):
+        pass
+
 
 class DummySession:
     def __init__(self, responses):
@@ -183,6 +186,8 @@ def test_scrape_all_tracked_fencers_retries_with_exponential_backoff(monkeypatch
     assert sleep_calls == [1, 2]
     assert result["fencers_scraped"] == 1
     assert result["fencers_failed"] == 0
+    assert {"connect", "download", "parse", "detect", "persist"} <= set(result["timings_ms"])
+    assert result["bytes"] == len(html.encode("utf-8"))
 
 
 def test_scrape_all_tracked_fencers_respects_failure_cooldown(monkeypatch, mock_db):
@@ -254,3 +259,67 @@ def test_scrape_all_tracked_fencers_logs_retries(monkeypatch, mock_db, caplog):
 
     assert "Request failed for fencer logging_fencer (1/3), retrying in 1s" in caplog.text
 
+
+
+def test_scrape_tracked_fencer_fetches_once_for_every_tracking_user(monkeypatch, mock_db):
+    html = """
+    <html>
+      <body>
+        <table>
+          <tr><th>Tournament</th><th>Event</th><th>Date</th></tr>
+          <tr><td>Autumn Open</td><td>Senior Men's Foil</td><td>2025-10-01</td></tr>
+        </table>
+      </body>
+    </html>
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cached_hash = scraper_service._compute_registration_hash(soup.find_all("table"))
+    rows = [
+        SimpleNamespace(
+            fencer_id="12345",
+            display_name=name,
+            last_registration_hash=cached_hash,
+            failure_count=0,
+            last_failure_at=None,
+        )
+        for name in (None, "Shared Fencer")
+    ]
+
+    sessions = []
+
+    def make_session():
+        sessions.append(DummySession([DummyResponse(200, html)]))
+        return sessions[-1]
+
+    monkeypatch.setattr(scraper_service.requests, "Session", make_session)
+    monkeypatch.setattr(scraper_service, "get_active_tracked_fencers_by_fencer_id", lambda db, fencer_id: rows)
+    update_status = MagicMock()
+    monkeypatch.setattr(scraper_service, "update_fencer_check_status", update_status)
+
+    result = scraper_service.scrape_tracked_fencer(mock_db, "12345")
+
+    assert len(sessions) == 1
+    assert result["skipped"] is True
+    assert result["tracked"] == 2
+    assert update_status.call_count == 2
+    assert all(call.kwargs["success"] for call in update_status.call_args_list)
+
+
+def test_scrape_tracked_fencer_skips_when_every_row_is_cooling_down(monkeypatch, mock_db):
+    rows = [
+        SimpleNamespace(
+            fencer_id="12345",
+            display_name="Cooling Fencer",
+            last_registration_hash=None,
+            failure_count=scraper_service.FENCER_MAX_FAILURES,
+            last_failure_at=datetime.now(UTC),
+        )
+    ]
+    monkeypatch.setattr(scraper_service, "get_active_tracked_fencers_by_fencer_id", lambda db, fencer_id: rows)
+    scrape_mock = MagicMock()
+    monkeypatch.setattr(scraper_service, "scrape_fencer_profile", scrape_mock)
+
+    result = scraper_service.scrape_tracked_fencer(mock_db, "12345")
+
+    assert result == {"skipped_cooldown": True, "tracked": 1}
+    scrape_mock.assert_not_called()
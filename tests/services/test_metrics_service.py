@@ -0,0 +1,123 @@
+import time
+import urllib.request
+
+from fastapi.testclient import TestClient
+
+from app.services import fragment_cache_service, metrics_service
+
+
+def _registry():
+    return metrics_service.Registry()
+
+
+def test_counter_renders_labelled_samples():
+    registry = _registry()
+    counter = registry.register(metrics_service.Counter("test_events_total", "Events.", ("kind",)))
+    counter.labels("a").inc()
+    counter.labels("a").inc(2)
+    counter.labels('b"c').inc()
+
+    text = registry.render()
+
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{kind="a"} 3' in text
+    assert 'test_events_total{kind="b\\"c"} 1' in text
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = _registry()
+    histogram = registry.register(
+        metrics_service.Histogram("test_seconds", "Durations.", buckets=(0.1, 1.0))
+    )
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert 'test_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{le="1"} 3' in lines
+    assert 'test_seconds_bucket{le="+Inf"} 4' in lines
+    assert "test_seconds_count 4" in lines
+    assert "test_seconds_sum 4.25" in lines
+
+
+def test_callback_metric_is_read_at_render_time():
+    registry = _registry()
+    values = {"in_flight": 1}
+    registry.register(
+        metrics_service.CallbackMetric(
+            "test_pool_jobs", "Jobs.", lambda: {(k,): v for k, v in values.items()}, ("state",)
+        )
+    )
+
+    values["in_flight"] = 4
+
+    assert 'test_pool_jobs{state="in_flight"} 4' in registry.render()
+
+
+def test_stage_timer_excludes_nested_stage_time():
+    histogram = metrics_service.Histogram("test_stage_seconds", "Stages.", ("stage",))
+    timer = metrics_service.StageTimer(histogram)
+
+    with timer.stage("persist"):
+        with timer.stage("notify"):
+            time.sleep(0.05)
+
+    assert timer.durations["notify"] >= 0.05
+    assert timer.durations["persist"] < 0.05
+
+    timer.observe()
+    assert 'test_stage_seconds_count{stage="notify"} 1' in histogram.render()
+
+
+def test_format_fields_quotes_values_and_flattens_timings():
+    line = metrics_service.format_fields(
+        {"scraper": "club", "url": "a b", "timings_ms": {"parse": 1.5, "persist": 2.0}}
+    )
+
+    assert line == 'scraper=club url="a b" timings_ms.parse=1.5 timings_ms.persist=2.0'
+
+
+def test_fragment_cache_lookups_are_counted():
+    hits, misses = metrics_service.cache_children("fragment")
+    hits_before, misses_before = hits.value, misses.value
+
+    fragment_cache_service.get(("metrics-test", 1, 0, None))
+    fragment_cache_service.put(("metrics-test", 1, 0, None), "<ul></ul>")
+    fragment_cache_service.get(("metrics-test", 1, 0, None))
+
+    assert (hits.value - hits_before, misses.value - misses_before) == (1, 1)
+
+
+def test_web_app_serves_metrics():
+    from app.web import app
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE fc_cache_requests_total counter" in response.text
+    assert "fc_password_pool_jobs" in response.text
+
+
+def test_http_server_exposes_registry_for_background_processes():
+    assert metrics_service.start_http_server(port=0) is None
+
+    server = metrics_service.start_http_server(port=_free_port(), addr="127.0.0.1")
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "# TYPE fc_scrape_stage_seconds histogram" in body
+
+
+def _free_port():
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
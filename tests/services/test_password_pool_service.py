@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.models import User
+from app.services import auth_service, password_pool_service
+
+
+def test_run_hashes_and_verifies_off_the_event_loop():
+    async def _exercise():
+        hashed = await password_pool_service.run(auth_service.hash_password, "swordfish123")
+        ok = await password_pool_service.run(auth_service.verify_password, "swordfish123", hashed)
+        bad = await password_pool_service.run(auth_service.verify_password, "wrong", hashed)
+        return ok, bad
+
+    assert asyncio.run(_exercise()) == (True, False)
+    assert password_pool_service.get_stats()["in_flight"] == 0
+
+
+def test_run_rejects_when_pool_is_full(monkeypatch):
+    monkeypatch.setattr(password_pool_service, "PASSWORD_POOL_MAX_PENDING", 0)
+    rejected_before = password_pool_service.get_stats()["rejected"]
+
+    with pytest.raises(password_pool_service.PasswordPoolBusyError):
+        asyncio.run(password_pool_service.run(auth_service.hash_password, "swordfish123"))
+
+    assert password_pool_service.get_stats()["rejected"] == rejected_before + 1
+
+
+def test_authenticate_async(db_session):
+    auth_service.register_user("judy", "judy@example.com", "password123", db_session)
+    db_session.commit()
+
+    assert asyncio.run(auth_service.authenticate_async("judy", "password123", db_session)).username == "judy"
+    assert asyncio.run(auth_service.authenticate_async("judy", "wrong", db_session)) is None
+
+
+def test_register_user_async_keeps_database_and_email_off_the_event_loop(db_session, monkeypatch):
+    threads = {}
+    monkeypatch.setattr(
+        auth_service, "notify_admin_new_user", lambda user: threads.setdefault("email", threading.current_thread())
+    )
+
+    async def _register():
+        threads["loop"] = threading.current_thread()
+        return await auth_service.register_user_async("kim", "kim@example.com", "password123", db_session)
+
+    user = asyncio.run(_register())
+    db_session.commit()
+
+    assert db_session.query(User).filter_by(username="kim").one().id == user.id
+    assert threads["email"] is not threads["loop"]
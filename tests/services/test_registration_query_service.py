@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.services import registration_query_service
+
+CLUB_URL = "https://fencingtracker.com/club/3/Paging/registrations"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_counts():
+    registration_query_service.clear_count_cache()
+    yield
+    registration_query_service.clear_count_cache()
+
+
+def _seed(db_session, count=7):
+    base = datetime(2025, 1, 1)
+    for index in range(count):
+        fencer = crud.get_or_create_fencer(db_session, f"Fencer {index:02d}")
+        tournament = crud.get_or_create_tournament(db_session, f"Open {index % 3}", "2025-02-01")
+        registration, _ = crud.update_or_create_registration(db_session, fencer, tournament, "Foil", CLUB_URL)
+        # Pairs share a timestamp so the id tie-breaker is exercised
+        registration.last_seen_at = base + timedelta(hours=index // 2)
+    db_session.commit()
+
+
+def _walk(db_session, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        page = registration_query_service.query_registrations(db_session, cursor=cursor, **kwargs)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort_by", ["last_seen_at", "fencer_name", "tournament_name"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_keyset_pages_cover_every_row_once_in_order(db_session, sort_by, sort_order):
+    _seed(db_session)
+
+    pages = _walk(db_session, sort_by=sort_by, sort_order=sort_order, page_size=3)
+    items = [item for page in pages for item in page["items"]]
+
+    assert [len(page["items"]) for page in pages] == [3, 3, 1]
+    assert len({item["id"] for item in items}) == 7
+
+    keys = [(item[sort_by], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=(sort_order == "desc"))
+
+
+def test_filters_apply_to_pages_and_count(db_session):
+    _seed(db_session)
+
+    page = registration_query_service.query_registrations(db_session, tournament_filter="open 1", page_size=50)
+
+    assert {item["tournament_name"] for item in page["items"]} == {"Open 1"}
+    assert page["total_count"] == len(page["items"]) == 2
+    assert page["next_cursor"] is None
+
+
+def test_page_size_is_bounded(db_session):
+    _seed(db_session, count=1)
+
+    page = registration_query_service.query_registrations(db_session, page_size=10_000)
+
+    assert page["page_size"] == registration_query_service.MAX_PAGE_SIZE
+
+
+def test_cursor_must_match_sort(db_session):
+    _seed(db_session)
+    first = registration_query_service.query_registrations(db_session, sort_by="fencer_name", page_size=2)
+
+    with pytest.raises(registration_query_service.InvalidCursorError):
+        registration_query_service.query_registrations(
+            db_session, sort_by="tournament_name", cursor=first["next_cursor"]
+        )
+    with pytest.raises(registration_query_service.InvalidCursorError):
+        registration_query_service.query_registrations(db_session, cursor="not-a-cursor")
+
+
+def test_cursor_without_sort_value_is_rejected(db_session):
+    cursor = registration_query_service.encode_cursor("last_seen_at", "desc", None, 1)
+
+    with pytest.raises(registration_query_service.InvalidCursorError):
+        registration_query_service.query_registrations(db_session, cursor=cursor)
+
+
+@pytest.mark.parametrize("sort_value", [["Fencer 01"], {"name": "Fencer 01"}, 3])
+def test_name_cursor_with_non_string_value_is_rejected(db_session, sort_value):
+    cursor = registration_query_service.encode_cursor("fencer_name", "asc", sort_value, 1)
+
+    with pytest.raises(registration_query_service.InvalidCursorError):
+        registration_query_service.query_registrations(
+            db_session, sort_by="fencer_name", sort_order="asc", cursor=cursor
+        )
+
+
+def test_pages_cover_rows_backfilled_from_null_last_seen_at(tmp_path, monkeypatch):
+    db_url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).resolve().parents[2] / "migrations"))
+    command.upgrade(config, "b3e8d20c6a14")
+
+    engine = create_engine(db_url)
+    session = sessionmaker(bind=engine)()
+    try:
+        _seed(session, count=4)
+        session.execute(text("UPDATE registrations SET last_seen_at = NULL WHERE id = 2"))
+        session.commit()
+        session.close()
+
+        command.upgrade(config, "head")
+
+        pages = _walk(session, sort_by="last_seen_at", sort_order="desc", page_size=1)
+        ids = [item["id"] for page in pages for item in page["items"]]
+        assert sorted(ids) == [1, 2, 3, 4]
+        assert all(item["last_seen_at"] is not None for page in pages for item in page["items"])
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_count_is_cached_until_ttl(db_session):
+    _seed(db_session, count=2)
+    assert registration_query_service.count_registrations(db_session) == 2
+
+    _seed(db_session, count=4)
+
+    assert registration_query_service.count_registrations(db_session) == 2
+    registration_query_service.clear_count_cache()
+    assert registration_query_service.count_registrations(db_session) == 4
@@ -0,0 +1,116 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.models import ScrapeTask
+from app.services import scrape_queue_service
+
+
+@pytest.fixture
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+def _tasks(db_session, kind="club"):
+    db_session.expire_all()
+    return {task.target: task for task in db_session.query(ScrapeTask).filter_by(kind=kind)}
+
+
+def test_sync_targets_adds_missing_and_removes_unwanted(db_session):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://a", "https://b"])
+    stats = scrape_queue_service.sync_targets(db_session, "club", ["https://b", "https://c"])
+
+    assert stats == {"added": 1, "removed": 1}
+    assert set(_tasks(db_session)) == {"https://b", "https://c"}
+
+
+def test_sync_targets_keeps_leased_tasks(db_session):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://a"])
+    crud.claim_scrape_tasks(db_session, "club", "node-1", 10, 300, datetime.now(UTC))
+    db_session.commit()
+
+    stats = scrape_queue_service.sync_targets(db_session, "club", [])
+
+    assert stats == {"added": 0, "removed": 0}
+    assert set(_tasks(db_session)) == {"https://a"}
+
+
+def test_claim_hands_each_task_to_one_node(db_session):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://a", "https://b", "https://c"])
+    now = datetime.now(UTC)
+
+    first = crud.claim_scrape_tasks(db_session, "club", "node-1", 2, 300, now)
+    second = crud.claim_scrape_tasks(db_session, "club", "node-2", 2, 300, now)
+    third = crud.claim_scrape_tasks(db_session, "club", "node-3", 2, 300, now)
+
+    assert len(first) == 2
+    assert [task.target for task in second] == ["https://c"]
+    assert third == []
+    assert {task.lease_owner for task in first} == {"node-1"}
+    assert len({task.lease_token for task in first}) == 1
+    assert first[0].lease_token != second[0].lease_token
+
+
+def test_expired_lease_can_be_reclaimed_and_old_holder_cannot_release(db_session):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://a"])
+    now = datetime.now(UTC)
+    [stale] = crud.claim_scrape_tasks(db_session, "club", "node-1", 1, 60, now)
+    stale_id, stale_token = stale.id, stale.lease_token
+
+    later = now + timedelta(seconds=120)
+    [reclaimed] = crud.claim_scrape_tasks(db_session, "club", "node-2", 1, 60, later)
+
+    assert reclaimed.lease_owner == "node-2"
+    assert reclaimed.attempts == 2
+    assert not crud.release_scrape_task(db_session, stale_id, stale_token, later, later, result="{}")
+    assert crud.release_scrape_task(db_session, reclaimed.id, reclaimed.lease_token, later, later, result="{}")
+
+
+def test_task_not_due_is_not_claimed(db_session):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://a"])
+    now = datetime.now(UTC)
+    [task] = crud.claim_scrape_tasks(db_session, "club", "node-1", 1, 300, now)
+    crud.release_scrape_task(db_session, task.id, task.lease_token, now + timedelta(minutes=30), now)
+
+    assert crud.claim_scrape_tasks(db_session, "club", "node-1", 1, 300, now + timedelta(minutes=5)) == []
+    assert len(crud.claim_scrape_tasks(db_session, "club", "node-1", 1, 300, now + timedelta(minutes=31))) == 1
+
+
+def test_heartbeat_extends_lease(db_session, session_factory):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://a"])
+    [task] = crud.claim_scrape_tasks(db_session, "club", "node-1", 1, 1, datetime.now(UTC))
+    db_session.commit()
+    first_expiry = task.lease_expires_at
+
+    keeper = scrape_queue_service.LeaseKeeper(task.lease_token, 600, session_factory)
+
+    assert keeper.heartbeat() == 1
+    assert _tasks(db_session)["https://a"].lease_expires_at > first_expiry + timedelta(seconds=500)
+
+
+def test_process_due_tasks_records_results_and_errors(db_session, session_factory):
+    scrape_queue_service.sync_targets(db_session, "club", ["https://ok", "https://broken"])
+
+    def handler(db, target):
+        if target == "https://broken":
+            raise RuntimeError("page unavailable")
+        return {"new": 2, "updated": 0, "total": 2}
+
+    stats = scrape_queue_service.process_due_tasks(
+        db_session, "club", handler, "node-1", 30, session_factory=session_factory
+    )
+
+    assert stats == {"claimed": 2, "succeeded": 1, "failed": 1, "lost": 0}
+    tasks = _tasks(db_session)
+    ok, broken = tasks["https://ok"], tasks["https://broken"]
+    assert json.loads(ok.last_result) == {"new": 2, "updated": 0, "total": 2}
+    assert ok.lease_token is None and ok.attempts == 0
+    assert broken.last_error == "page unavailable"
+    assert broken.lease_token is None and broken.attempts == 1
+    assert broken.next_run_at < ok.next_run_at
+    assert scrape_queue_service.process_due_tasks(
+        db_session, "club", handler, "node-1", 30, session_factory=session_factory
+    )["claimed"] == 0
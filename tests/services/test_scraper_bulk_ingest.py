@@ -0,0 +1,191 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.models import Base, Fencer, Registration, Tournament
+from app.services import scraper_service
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+# Run with TEST_POSTGRES_URL=postgresql://... (see docs/TESTING.md)
+requires_postgres = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+CLUB_URL = "https://fencingtracker.com/club/1/Bulk/registrations"
+
+PAGE = """
+<html><body>
+    <h3>Fall Open</h3>
+    <table>
+        <tr><th>Fencer</th><th>Event</th><th>Status</th><th>Date</th></tr>
+        <tr><td>Alex Smith</td><td>Junior Men's Foil</td><td></td><td>2025-10-01</td></tr>
+        <tr><td>Alex Smith</td><td>Cadet Men's Foil</td><td></td><td>2025-10-01</td></tr>
+        <tr><td>Bea Jones</td><td>Junior Women's Epee</td><td></td><td>2025-10-01</td></tr>
+    </table>
+</body></html>
+"""
+
+
+@pytest.fixture
+def pg_session():
+    engine = create_engine(POSTGRES_URL)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def _scrape(db, html):
+    response = Mock(status_code=200, content=html.encode("utf-8"))
+    with patch("requests.Session.get", return_value=response), \
+            patch("app.services.scraper_service.enqueue_registration_alerts") as mock_enqueue:
+        result = scraper_service.scrape_and_persist(db, CLUB_URL)
+    return result, mock_enqueue
+
+
+def _counts(result):
+    return {key: result[key] for key in ("new", "updated", "total")}
+
+
+@requires_postgres
+def test_bulk_ingest_creates_and_merges_registrations(pg_session):
+    result, mock_enqueue = _scrape(pg_session, PAGE)
+
+    assert _counts(result) == {"new": 2, "updated": 1, "total": 3}
+    assert mock_enqueue.call_count == 2
+    assert pg_session.query(Fencer).count() == 2
+    assert pg_session.query(Tournament).count() == 1
+
+    alex = (
+        pg_session.query(Registration)
+        .join(Fencer)
+        .filter(Fencer.name == "Alex Smith")
+        .one()
+    )
+    assert alex.events == "Junior Men's Foil, Cadet Men's Foil"
+    assert alex.club_url == CLUB_URL
+
+
+@requires_postgres
+def test_bulk_ingest_rescrape_only_appends_new_events(pg_session):
+    _scrape(pg_session, PAGE)
+    pg_session.expire_all()
+
+    rescrape = PAGE.replace(
+        "</table>",
+        "<tr><td>Bea Jones</td><td>Senior Women's Epee</td><td></td><td>2025-10-01</td></tr></table>",
+    )
+    result, mock_enqueue = _scrape(pg_session, rescrape)
+
+    assert _counts(result) == {"new": 0, "updated": 4, "total": 4}
+    mock_enqueue.assert_not_called()
+
+    bea = (
+        pg_session.query(Registration)
+        .join(Fencer)
+        .filter(Fencer.name == "Bea Jones")
+        .one()
+    )
+    assert bea.events == "Junior Women's Epee, Senior Women's Epee"
+    assert pg_session.query(Registration).count() == 2
+
+
+@requires_postgres
+def test_bulk_ingest_keeps_event_contained_in_an_existing_event(pg_session):
+    _scrape(pg_session, PAGE)
+    pg_session.expire_all()
+
+    rescrape = PAGE.replace(
+        "</table>",
+        "<tr><td>Bea Jones</td><td>Epee</td><td></td><td>2025-10-01</td></tr>"
+        "<tr><td>Bea Jones</td><td>Junior Women's Epee</td><td></td><td>2025-10-01</td></tr></table>",
+    )
+    _scrape(pg_session, rescrape)
+
+    bea = (
+        pg_session.query(Registration)
+        .join(Fencer)
+        .filter(Fencer.name == "Bea Jones")
+        .one()
+    )
+    assert bea.events == "Junior Women's Epee, Epee"
+
+
+@requires_postgres
+def test_bulk_ingest_twice_in_one_transaction_only_stages_the_new_page(pg_session):
+    rows = [("Alex Smith", "Fall Open", "2025-10-01", "Junior Men's Foil")]
+    new_ids, _ = crud.bulk_ingest_registrations(pg_session, rows, CLUB_URL)
+    assert len(new_ids) == 1
+
+    rows = [("Bea Jones", "Fall Open", "2025-10-01", "Junior Women's Epee")]
+    new_ids, _ = crud.bulk_ingest_registrations(pg_session, rows, CLUB_URL)
+    assert len(new_ids) == 1
+
+    staged = pg_session.execute(text("SELECT fencer_name FROM registration_stage")).scalars().all()
+    assert staged == ["Bea Jones"]
+    pg_session.commit()
+    assert pg_session.query(Registration).count() == 2
+
+
+@requires_postgres
+def test_bulk_ingest_reports_only_real_changes(pg_session):
+    _scrape(pg_session, PAGE)
+
+    unchanged = [("Alex Smith", "Fall Open", "2025-10-01", "Cadet Men's Foil")]
+    assert crud.bulk_ingest_registrations(pg_session, unchanged, CLUB_URL) == ([], 0)
+
+    new_event = [("Alex Smith", "Fall Open", "2025-10-01", "Senior Men's Foil")]
+    assert crud.bulk_ingest_registrations(pg_session, new_event, CLUB_URL) == ([], 1)
+
+
+class _RecordingSession:
+    """Stands in for a PostgreSQL session, recording SQL and COPY data instead of running them."""
+
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(" ".join(str(statement).split()))
+        return SimpleNamespace(all=lambda: [])
+
+    def connection(self):
+        cursor = SimpleNamespace(
+            copy_expert=lambda sql, buffer: self.copied.append((sql, buffer.read())),
+            close=lambda: None,
+        )
+        return SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cursor))
+
+
+def test_bulk_ingest_statements_without_postgres():
+    db = _RecordingSession()
+    rows = [
+        ("Smith, Alex", "Fall Open", "2025-10-01", "Junior Men's Foil"),
+        ("Bea Jones", "Fall Open", "2025-10-01", 'Epee "A"'),
+    ]
+
+    crud.bulk_ingest_registrations(db, rows, CLUB_URL)
+
+    create, truncate, fencers, tournaments, merge = db.statements
+    assert create.startswith("CREATE TEMP TABLE IF NOT EXISTS registration_stage")
+    assert truncate == "TRUNCATE registration_stage"
+    assert fencers.startswith("INSERT INTO fencers")
+    assert tournaments.startswith("INSERT INTO tournaments")
+    assert "NOT (staged.event_name = ANY(string_to_array(r.events, ', ')))" in merge
+    assert "strpos" not in merge
+
+    [(copy_sql, data)] = db.copied
+    assert copy_sql.startswith("COPY registration_stage (seq, fencer_name, tournament_name, event_date, event_name)")
+    assert data.splitlines() == [
+        '0,"Smith, Alex",Fall Open,2025-10-01,Junior Men\'s Foil',
+        '1,Bea Jones,Fall Open,2025-10-01,"Epee ""A"""',
+    ]
@@ -5,6 +5,7 @@ from bs4 import BeautifulSoup
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app import crud
 from app.models import Base, Registration, Tournament
 from app.services import scraper_service
 
@@ -50,9 +51,9 @@ class ScraperServiceTableTests(unittest.TestCase):
 
         self.assertFalse(scraper_service._is_registration_table(table))
 
-    @patch("app.services.scraper_service.send_registration_notification")
+    @patch("app.services.scraper_service.enqueue_registration_alerts")
     @patch("requests.Session.get")
-    def test_scrape_skips_non_registration_headings(self, mock_get, mock_notify):
+    def test_scrape_skips_non_registration_headings(self, mock_get, mock_enqueue):
         """Scraper ignores headings whose tables are not registration data."""
         html = """
         <html>
@@ -102,7 +103,7 @@ class ScraperServiceTableTests(unittest.TestCase):
         mock_response.reason = "OK"
         mock_response.content = html.encode("utf-8")
         mock_get.return_value = mock_response
-        mock_notify.return_value = "msg-id"
+        mock_enqueue.return_value = 0
 
         stats = scraper_service.scrape_and_persist(
             self.db,
@@ -112,7 +113,7 @@ class ScraperServiceTableTests(unittest.TestCase):
         self.assertEqual(stats["total"], 2)
         self.assertEqual(stats["new"], 2)
         self.assertEqual(stats["updated"], 0)
-        self.assertEqual(mock_notify.call_count, 2)
+        self.assertEqual(mock_enqueue.call_count, 2)
 
         tournaments = self.db.query(Tournament).all()
         self.assertEqual(len(tournaments), 1)
@@ -123,6 +124,64 @@ class ScraperServiceTableTests(unittest.TestCase):
         events = sorted(reg.events for reg in registrations)
         self.assertEqual(events, ["Senior Men's Foil", "Senior Women's Foil"])
 
+    @patch("app.services.scraper_service.enqueue_registration_alerts")
+    @patch("requests.Session.get")
+    def test_scrape_reports_stage_timings_bytes_and_queries(self, mock_get, mock_enqueue):
+        """Each run returns its per-stage breakdown alongside the counts."""
+        html = """
+        <h3>October NAC</h3>
+        <table>
+            <tr><th>Fencer</th><th>Event</th><th>Status</th><th>Date</th></tr>
+            <tr><td>John Doe</td><td>Senior Men's Foil</td><td></td><td>2024-10-12</td></tr>
+        </table>
+        """
+        mock_get.return_value = Mock(status_code=200, reason="OK", content=html.encode("utf-8"))
+        mock_enqueue.return_value = 0
+
+        stats = scraper_service.scrape_and_persist(self.db, "https://fencingtracker.com/club/100/example")
+
+        self.assertEqual(
+            set(stats["timings_ms"]),
+            {"connect", "download", "parse", "detect", "persist", "notify"},
+        )
+        self.assertEqual(stats["bytes"], len(html.encode("utf-8")))
+        self.assertGreater(stats["queries"], 0)
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+
+    def test_resolve_club_targets_dedupes_tracked_and_configured_urls(self):
+        """Each club is scraped once, whoever tracks it and however it was configured."""
+        club_url = "https://fencingtracker.com/club/100/Example/registrations"
+        for idx in range(2):
+            user = crud.create_user(self.db, f"user{idx}", f"user{idx}@example.com", "hash")
+            crud.create_tracked_club(self.db, user_id=user.id, club_url=club_url)
+        inactive = crud.create_tracked_club(
+            self.db, user_id=user.id, club_url="https://fencingtracker.com/club/200/Gone/registrations"
+        )
+        crud.deactivate_tracked_club(self.db, inactive.id)
+        self.db.commit()
+
+        targets = scraper_service.resolve_club_targets(
+            self.db,
+            [
+                "https://fencingtracker.com/club/100/Example",
+                "https://fencingtracker.com/club/300/Other/",
+                "not a url",
+            ],
+        )
+
+        self.assertEqual(targets, [club_url, "https://fencingtracker.com/club/300/Other/registrations"])
+
+    def test_event_contained_in_an_existing_event_is_appended(self):
+        """Events are matched as list items, not as substrings of the stored list."""
+        fencer = crud.get_or_create_fencer(self.db, "Sam Lee")
+        tournament = crud.get_or_create_tournament(self.db, "Fall Open", "2025-10-01")
+        crud.update_or_create_registration(self.db, fencer, tournament, "Senior Men's Epee", "url")
+        crud.update_or_create_registration(self.db, fencer, tournament, "Epee", "url")
+        registration, created = crud.update_or_create_registration(self.db, fencer, tournament, "Epee", "url")
+
+        self.assertFalse(created)
+        self.assertEqual(registration.events, "Senior Men's Epee, Epee")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,142 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import crud
+from app.models import RevokedSession, UserSession
+from app.services import auth_service, session_signing_service
+
+
+@pytest.fixture(autouse=True)
+def signed_mode(monkeypatch):
+    monkeypatch.setenv("SESSION_MODE", "signed")
+    monkeypatch.setenv("SESSION_SIGNING_KEY", "test-signing-key")
+    monkeypatch.setattr(session_signing_service, "_revocations", session_signing_service.RevocationList())
+
+
+def _create_user(db_session, username="signed"):
+    user = crud.create_user(db_session, username, f"{username}@example.com", "hash")
+    db_session.commit()
+    return user
+
+
+def _count_statements(db_session):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", _record)
+    return statements, lambda: event.remove(db_session.get_bind(), "before_cursor_execute", _record)
+
+
+def test_signed_session_validates_without_queries(db_session):
+    user = _create_user(db_session)
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    # First lookup loads the revocation snapshot
+    assert auth_service.validate_session(db_session, token).id == user.id
+
+    statements, stop = _count_statements(db_session)
+    try:
+        session = auth_service.load_session(db_session, token)
+    finally:
+        stop()
+
+    assert statements == []
+    assert session.user.username == "signed"
+    assert session.user.email == "signed@example.com"
+    assert session.csrf_token == db_session.query(UserSession).one().csrf_token
+
+
+def test_tampered_token_is_rejected(db_session):
+    user = _create_user(db_session)
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    payload, signature = token.rsplit(".", 1)
+    assert auth_service.validate_session(db_session, f"{payload}x.{signature}") is None
+    assert auth_service.validate_session(db_session, f"{payload}.{signature[:-2]}") is None
+
+
+def test_non_ascii_token_is_rejected(db_session):
+    user = _create_user(db_session)
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    payload, signature = token.rsplit(".", 1)
+    assert auth_service.validate_session(db_session, f"{payload}.{signature[:-1]}\u00e9") is None
+    assert auth_service.validate_session(db_session, f"\u00e9{payload}.{signature}") is None
+
+
+def test_logout_revokes_token(db_session):
+    user = _create_user(db_session)
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    auth_service.logout(db_session, token)
+    db_session.commit()
+
+    assert auth_service.validate_session(db_session, token) is None
+    assert db_session.query(UserSession).count() == 0
+
+
+def test_revocations_reach_other_processes_on_refresh(db_session, monkeypatch):
+    monkeypatch.setattr(session_signing_service, "CLOCK_SKEW_SEC", 0)
+    user = _create_user(db_session)
+    other = _create_user(db_session, "other")
+    token, _ = auth_service.create_session(db_session, user.id)
+    logged_out, _ = auth_service.create_session(db_session, other.id)
+    kept, _ = auth_service.create_session(db_session, other.id)
+    db_session.commit()
+
+    auth_service.revoke_user_sessions(db_session, user.id)
+    auth_service.logout(db_session, logged_out)
+    db_session.commit()
+
+    # A process that never saw the revocations learns them from the table
+    revocations = session_signing_service.RevocationList()
+    monkeypatch.setattr(session_signing_service, "_revocations", revocations)
+    assert auth_service.validate_session(db_session, token) is None
+    assert auth_service.validate_session(db_session, logged_out) is None
+    assert auth_service.validate_session(db_session, kept).id == other.id
+    assert len(revocations._revoked_sessions) == 1
+    assert list(revocations._revoked_users) == [user.id]
+
+
+def test_sessions_issued_after_user_revocation_are_accepted(db_session, monkeypatch):
+    monkeypatch.setattr(session_signing_service, "CLOCK_SKEW_SEC", 0)
+    user = _create_user(db_session)
+    old_token, _ = auth_service.create_session(db_session, user.id)
+    auth_service.revoke_user_sessions(db_session, user.id)
+    new_token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    assert auth_service.validate_session(db_session, old_token) is None
+    assert auth_service.validate_session(db_session, new_token).id == user.id
+
+
+def test_expired_revocations_are_ignored_and_swept(db_session):
+    user = _create_user(db_session)
+    now = datetime.now(UTC)
+    crud.create_session_revocation(db_session, now - timedelta(days=31), now - timedelta(days=1), user_id=user.id)
+    db_session.commit()
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    assert auth_service.validate_session(db_session, token).id == user.id
+
+    auth_service.sweep_expired_sessions(db_session)
+    assert db_session.query(RevokedSession).count() == 0
+
+
+def test_revoke_user_applies_immediately(db_session):
+    user = _create_user(db_session)
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    auth_service.revoke_user_sessions(db_session, user.id)
+
+    assert auth_service.validate_session(db_session, token) is None
@@ -0,0 +1,110 @@
+import pytest
+
+try:
+    import httpx  # type: ignore
+    HAS_HTTPX = True
+except ModuleNotFoundError:
+    HAS_HTTPX = False
+
+if HAS_HTTPX:
+    from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for TestClient")
+
+from app import crud
+from app.api.dependencies import SESSION_COOKIE_NAME
+from app.database import get_async_db, get_db
+from app.main import app
+from app.models import UserSession
+from app.services import auth_service, session_signing_service
+
+
+@pytest.fixture(autouse=True)
+def signed_mode(monkeypatch):
+    monkeypatch.setenv("SESSION_MODE", "signed")
+    monkeypatch.setenv("SESSION_SIGNING_KEY", "test-signing-key")
+    monkeypatch.setattr(session_signing_service, "CLOCK_SKEW_SEC", 0)
+    monkeypatch.setattr(session_signing_service, "_revocations", session_signing_service.RevocationList())
+
+
+@pytest.fixture
+def client(db_session, async_db_override):
+    def _get_db_override():
+        yield db_session
+
+    app.dependency_overrides[get_db] = _get_db_override
+    app.dependency_overrides[get_async_db] = async_db_override
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+
+
+def _login(db_session, username, is_admin=True):
+    user = crud.create_user(db_session, username, f"{username}@example.com", "hash", is_admin=is_admin)
+    db_session.commit()
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+    return user, token
+
+
+def _get_users(client, token):
+    return client.get("/admin/users", cookies={SESSION_COOKIE_NAME: token})
+
+
+def _patch_user(client, db_session, admin_token, user_id, updates):
+    session = auth_service.load_session(db_session, admin_token)
+    return client.patch(
+        f"/admin/users/{user_id}",
+        json=updates,
+        headers={"X-CSRF-Token": session.csrf_token},
+        cookies={SESSION_COOKIE_NAME: admin_token},
+    )
+
+
+def test_demoted_admin_loses_access_on_existing_sessions(client, db_session):
+    _, admin_token = _login(db_session, "admin")
+    demoted, demoted_token = _login(db_session, "demoted")
+    assert _get_users(client, demoted_token).status_code == 200
+
+    response = _patch_user(client, db_session, admin_token, demoted.id, {"is_admin": False})
+    assert response.status_code == 200
+    assert response.json()["is_admin"] is False
+
+    # The cookie still says adm=true, but the session behind it is gone, so
+    # it is rejected outright (401) rather than reaching the admin check (403)
+    assert _get_users(client, demoted_token).status_code == 401
+    assert db_session.query(UserSession).filter_by(user_id=demoted.id).count() == 0
+
+    # Another process only learns about it from revoked_sessions on its next refresh
+    session_signing_service._revocations = session_signing_service.RevocationList()
+    assert _get_users(client, demoted_token).status_code == 401
+    assert _get_users(client, admin_token).status_code == 200
+
+
+@pytest.mark.parametrize("session_mode", ["signed", "database"])
+def test_granting_admin_keeps_existing_sessions(client, db_session, monkeypatch, session_mode):
+    monkeypatch.setenv("SESSION_MODE", session_mode)
+    _, admin_token = _login(db_session, "admin")
+    promoted, promoted_token = _login(db_session, "promoted", is_admin=False)
+
+    response = _patch_user(client, db_session, admin_token, promoted.id, {"is_admin": True})
+
+    assert response.status_code == 200
+    assert response.json()["is_admin"] is True
+    assert db_session.query(UserSession).filter_by(user_id=promoted.id).count() == 1
+    assert client.get("/auth/me", cookies={SESSION_COOKIE_NAME: promoted_token}).status_code == 200
+
+
+def test_deactivating_user_ends_sessions_in_database_mode(client, db_session, monkeypatch):
+    monkeypatch.setenv("SESSION_MODE", "database")
+    _, admin_token = _login(db_session, "admin")
+    deactivated, deactivated_token = _login(db_session, "deactivated", is_admin=False)
+
+    response = _patch_user(client, db_session, admin_token, deactivated.id, {"is_active": False})
+
+    assert response.status_code == 200
+    assert db_session.query(UserSession).filter_by(user_id=deactivated.id).count() == 0
+    assert client.get("/auth/me", cookies={SESSION_COOKIE_NAME: deactivated_token}).status_code == 401
@@ -0,0 +1,87 @@
+import asyncio
+
+from app import async_crud, crud
+from app.services import auth_service
+
+
+def _run(async_db_override, func):
+    async def _with_session():
+        async for db in async_db_override():
+            return await func(db)
+
+    return asyncio.run(_with_session())
+
+
+def test_get_tracked_clubs_filters_by_active(db_session, async_db_override):
+    user = crud.create_user(db_session, "async-clubs", "async-clubs@example.com", "hash")
+    crud.create_tracked_club(db_session, user.id, "https://fencingtracker.com/club/1/A/registrations")
+    inactive = crud.create_tracked_club(db_session, user.id, "https://fencingtracker.com/club/2/B/registrations")
+    inactive.active = False
+    db_session.commit()
+
+    async def _query(db):
+        active = await async_crud.get_tracked_clubs(db, user.id, active=True)
+        every = await async_crud.get_tracked_clubs(db, user.id)
+        return [club.club_url for club in active], len(every)
+
+    active_urls, total = _run(async_db_override, _query)
+
+    assert active_urls == ["https://fencingtracker.com/club/1/A/registrations"]
+    assert total == 2
+
+
+def test_create_and_deactivate_tracked_fencer(db_session, async_db_override):
+    user = crud.create_user(db_session, "async-fencer", "async-fencer@example.com", "hash")
+    db_session.commit()
+
+    async def _create(db):
+        tracked = await async_crud.create_tracked_fencer(db, user.id, "4242", display_name="Async")
+        await async_crud.deactivate_tracked_fencer(db, tracked)
+        await db.commit()
+        return tracked.id
+
+    tracked_id = _run(async_db_override, _create)
+
+    tracked = crud.get_tracked_fencer_by_id(db_session, tracked_id)
+    assert tracked.display_name == "Async"
+    assert tracked.active is False
+
+
+def test_get_tracking_counts_groups_by_kind_and_active(db_session, async_db_override):
+    user = crud.create_user(db_session, "async-counts", "async-counts@example.com", "hash")
+    other = crud.create_user(db_session, "async-other", "async-other@example.com", "hash")
+    crud.create_tracked_club(db_session, user.id, "https://fencingtracker.com/club/1/A/registrations")
+    inactive = crud.create_tracked_club(db_session, user.id, "https://fencingtracker.com/club/2/B/registrations")
+    inactive.active = False
+    crud.create_tracked_club(db_session, other.id, "https://fencingtracker.com/club/3/C/registrations")
+    for fencer_id in ("1", "2", "3"):
+        crud.create_tracked_fencer(db_session, user.id, fencer_id)
+    db_session.commit()
+
+    counts = _run(async_db_override, lambda db: async_crud.get_tracking_counts(db, user.id))
+
+    assert counts == {"active_clubs": 1, "inactive_clubs": 1, "active_fencers": 3, "inactive_fencers": 0}
+
+
+def test_load_session_async_returns_session_with_user(db_session, async_db_override):
+    user = crud.create_user(db_session, "async-session", "async-session@example.com", "hash")
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    async def _load(db):
+        session = await auth_service.load_session_async(db, token)
+        return session.user.username, session.csrf_token
+
+    username, csrf_token = _run(async_db_override, _load)
+
+    assert username == "async-session"
+    assert csrf_token == crud.get_session(db_session, token).csrf_token
+
+
+def test_load_session_async_rejects_inactive_user(db_session, async_db_override):
+    user = crud.create_user(db_session, "async-inactive", "async-inactive@example.com", "hash")
+    token, _ = auth_service.create_session(db_session, user.id)
+    user.is_active = False
+    db_session.commit()
+
+    assert _run(async_db_override, lambda db: auth_service.load_session_async(db, token)) is None
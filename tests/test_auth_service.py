@@ -1,6 +1,7 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from sqlalchemy import event
 
 from app import crud
 from app.services import auth_service
@@ -72,3 +73,50 @@ def test_validate_session_expires_old_tokens(db_session):
     db_session.commit()
 
     assert auth_service.validate_session(db_session, "expired") is None
+
+
+def test_load_session_returns_user_and_csrf_token_in_one_query(db_session):
+    user = auth_service.register_user("grace", "grace@example.com", "password123", db_session)
+    db_session.commit()
+
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+    db_session.expire_all()
+
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        session = auth_service.load_session(db_session, token)
+        assert session.user.username == "grace"
+        assert session.csrf_token
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
+
+
+def test_load_session_rejects_inactive_user(db_session):
+    user = auth_service.register_user("heidi", "heidi@example.com", "password123", db_session)
+    token, _ = auth_service.create_session(db_session, user.id)
+    user.is_active = False
+    db_session.commit()
+
+    assert auth_service.load_session(db_session, token) is None
+
+
+def test_sweep_expired_sessions_deletes_in_batches(db_session):
+    user = auth_service.register_user("ivan", "ivan@example.com", "password123", db_session)
+    expired_time = datetime.now(UTC) - timedelta(days=1)
+    for idx in range(5):
+        crud.create_session(db_session, user.id, f"expired-{idx}", expired_time)
+    token, _ = auth_service.create_session(db_session, user.id)
+    db_session.commit()
+
+    assert auth_service.sweep_expired_sessions(db_session, batch_size=2, max_batches=2) == 4
+    assert auth_service.sweep_expired_sessions(db_session, batch_size=2, max_batches=2) == 1
+    assert auth_service.validate_session(db_session, token).id == user.id
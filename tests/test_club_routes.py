@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+try:
+    import httpx  # type: ignore
+    HAS_HTTPX = True
+except ModuleNotFoundError:
+    HAS_HTTPX = False
+
+pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for ASGI client")
+
+from app import crud
+from app.api import clubs as clubs_module
+from app.api.dependencies import get_current_user, validate_csrf
+from app.database import get_async_db
+from app.main import app
+from app.models import TrackedClub
+
+CLUB_URL = "https://fencingtracker.com/club/12/Loop/registrations"
+
+
+@pytest.fixture
+def user(db_session, async_db_override):
+    user = crud.create_user(db_session, "club-loop", "club-loop@example.com", "hash")
+    db_session.commit()
+
+    app.dependency_overrides[get_async_db] = async_db_override
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[validate_csrf] = lambda: None
+    try:
+        yield user
+    finally:
+        for dependency in (get_async_db, get_current_user, validate_csrf):
+            app.dependency_overrides.pop(dependency, None)
+
+
+def test_club_validation_does_not_block_the_event_loop(user, db_session, monkeypatch):
+    validation_started = threading.Event()
+    loop_responded = threading.Event()
+
+    def _slow_validate(club_url, timeout=10):
+        validation_started.set()
+        # Only set by a coroutine, so it stays unset if this call holds the event loop
+        if not loop_responded.wait(2):
+            raise ValueError("event loop was blocked during validation")
+        return club_url, "Loop Club"
+
+    monkeypatch.setattr(clubs_module, "validate_club_url", _slow_validate)
+
+    async def _exercise():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            request = asyncio.create_task(client.post("/clubs/add", json={"club_url": CLUB_URL}))
+            while not validation_started.is_set():
+                await asyncio.sleep(0.01)
+            loop_responded.set()
+            return await request
+
+    response = asyncio.run(_exercise())
+
+    assert response.status_code == 201, response.text
+    assert db_session.query(TrackedClub).filter_by(user_id=user.id).one().club_name == "Loop Club"
@@ -0,0 +1,36 @@
+from app import crud
+
+
+def _make_users(db_session, count):
+    return [
+        crud.create_user(db_session, f"user{i}", f"user{i}@example.com", "hash")
+        for i in range(count)
+    ]
+
+
+def test_get_users_with_counts_includes_tracking_counts(db_session):
+    tracker, idle = _make_users(db_session, 2)
+    crud.create_tracked_club(db_session, tracker.id, "https://fencingtracker.com/club/1/A/registrations")
+    crud.create_tracked_club(db_session, tracker.id, "https://fencingtracker.com/club/2/B/registrations")
+    crud.create_tracked_fencer(db_session, tracker.id, "100")
+    db_session.commit()
+
+    rows = {user.id: (clubs, fencers) for user, clubs, fencers in crud.get_users_with_counts(db_session)}
+
+    assert rows == {tracker.id: (2, 1), idle.id: (0, 0)}
+    assert crud.get_user_with_counts(db_session, idle.id)[1:] == (0, 0)
+    assert crud.get_user_with_counts(db_session, 9999) is None
+
+
+def test_get_users_with_counts_pages_and_searches(db_session):
+    users = _make_users(db_session, 5)
+    db_session.commit()
+
+    first = crud.get_users_with_counts(db_session, limit=2)
+    second = crud.get_users_with_counts(db_session, before_id=first[-1][0].id, limit=2)
+
+    assert [row[0].id for row in first] == [users[4].id, users[3].id]
+    assert [row[0].id for row in second] == [users[2].id, users[1].id]
+
+    matches = crud.get_users_with_counts(db_session, search="USER3@")
+    assert [row[0].username for row in matches] == ["user3"]
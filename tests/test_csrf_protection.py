@@ -14,11 +14,18 @@ pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for T
 
 from app import crud
 from app.api.dependencies import SESSION_COOKIE_NAME
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.main import app
 from app.services import auth_service, csrf_service
 
 
+@pytest.fixture(autouse=True)
+def _async_db(async_db_override):
+    app.dependency_overrides[get_async_db] = async_db_override
+    yield
+    app.dependency_overrides.pop(get_async_db, None)
+
+
 def _create_user(db_session, username: str = "csfr-user"):
     password_hash = auth_service.hash_password("example-password")
     user = crud.create_user(db_session, username, f"{username}@example.com", password_hash)
@@ -0,0 +1,70 @@
+from sqlalchemy import text
+
+from app import database, query_stats
+from app import models  # noqa: F401 - registers the statement listener
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_engine_applies_performance_pragmas(tmp_path):
+    engine = database.create_db_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+
+    try:
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "busy_timeout") == database.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(engine, "cache_size") == -database.SQLITE_CACHE_SIZE_KB
+        assert _pragma(engine, "temp_store") == 2  # MEMORY
+    finally:
+        engine.dispose()
+
+
+def test_in_memory_sqlite_engine_is_supported():
+    engine = database.create_db_engine("sqlite:///:memory:")
+
+    try:
+        assert _pragma(engine, "busy_timeout") == database.SQLITE_BUSY_TIMEOUT_MS
+    finally:
+        engine.dispose()
+
+
+def test_query_stats_count_statements_in_the_tracked_context():
+    engine = database.create_db_engine("sqlite:///:memory:")
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with query_stats.track() as stats:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            conn.execute(text("SELECT 3"))
+    finally:
+        engine.dispose()
+
+    assert stats.count == 2
+
+
+def test_slow_statements_are_logged_with_parameters_redacted(monkeypatch, caplog):
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_THRESHOLD_MS", 1e-9)
+    engine = database.create_db_engine("sqlite:///:memory:")
+
+    try:
+        with engine.connect() as conn, caplog.at_level("WARNING", logger="app.query_stats"):
+            with query_stats.track() as stats:
+                conn.execute(text("SELECT :secret AS value"), {"secret": "hunter2"})
+    finally:
+        engine.dispose()
+
+    assert stats.seconds > 0
+    assert "Slow query" in caplog.text
+    assert "SELECT ? AS value" in caplog.text
+    assert "hunter2" not in caplog.text
+
+
+def test_redact_parameters_keeps_only_names_and_positions():
+    assert query_stats.redact_parameters({"email": "a@example.com", "id": 7}) == "{email=?, id=?}"
+    assert query_stats.redact_parameters(("a@example.com", 7)) == "(?, ?)"
+    assert query_stats.redact_parameters([(1, "x"), (2, "y")], executemany=True) == "2 x (?, ?)"
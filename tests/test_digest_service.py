@@ -28,8 +28,9 @@ def test_send_user_digest_skips_when_no_registrations(db_session):
     )
     db_session.commit()
 
-    with patch("app.services.digest_service.send_registration_notification") as mock_send:
+    with patch("app.services.digest_service.get_client") as mock_get_client:
         sent = digest_service.send_user_digest(db_session, user)
+    mock_send = mock_get_client.return_value.send_text
 
     assert sent is False
     mock_send.assert_not_called()
@@ -57,13 +58,13 @@ def test_send_user_digest_sends_email(db_session):
     )
     db_session.commit()
 
-    with patch("app.services.digest_service.send_registration_notification") as mock_send:
+    with patch("app.services.digest_service.get_client") as mock_get_client:
         sent = digest_service.send_user_digest(db_session, user)
+    mock_send = mock_get_client.return_value.send_text
 
     assert sent is True
     mock_send.assert_called_once()
-    args, kwargs = mock_send.call_args
-    assert kwargs["recipients"] == [user.email]
+    assert mock_send.call_args.kwargs["to"] == [user.email]
 
 
 def test_send_user_digest_dedupes_fencer_entries(db_session):
@@ -95,12 +96,13 @@ def test_send_user_digest_dedupes_fencer_entries(db_session):
     )
     db_session.commit()
 
-    with patch("app.services.digest_service.send_registration_notification") as mock_send:
+    with patch("app.services.digest_service.get_client") as mock_get_client:
         sent = digest_service.send_user_digest(db_session, user)
+    mock_send = mock_get_client.return_value.send_text
 
     assert sent is True
     mock_send.assert_called_once()
-    body = mock_send.call_args.kwargs["body"]
+    body = mock_send.call_args.args[1]
     assert body.count("Senior Women's Foil") == 1
     assert "TRACKED FENCERS" not in body
 
@@ -135,11 +137,12 @@ def test_send_user_digest_with_mixed_weapon_filters(db_session):
     )
     db_session.commit()
 
-    with patch("app.services.digest_service.send_registration_notification") as mock_send:
+    with patch("app.services.digest_service.get_client") as mock_get_client:
         digest_service.send_user_digest(db_session, user)
+    mock_send = mock_get_client.return_value.send_text
 
     mock_send.assert_called_once()
-    body = mock_send.call_args.kwargs["body"]
+    body = mock_send.call_args.args[1]
     assert "Senior Men's Epee" in body
     assert "Senior Men's Saber" in body
     assert "TRACKED CLUBS" in body
@@ -163,11 +166,12 @@ def test_send_user_digest_with_fencer_only(db_session):
     )
     db_session.commit()
 
-    with patch("app.services.digest_service.send_registration_notification") as mock_send:
+    with patch("app.services.digest_service.get_client") as mock_get_client:
         digest_service.send_user_digest(db_session, user)
+    mock_send = mock_get_client.return_value.send_text
 
     mock_send.assert_called_once()
-    body = mock_send.call_args.kwargs["body"]
+    body = mock_send.call_args.args[1]
     assert "TRACKED CLUBS" not in body
     assert "TRACKED FENCERS" in body
     assert "Div 1 Women's Foil" in body
@@ -0,0 +1,105 @@
+import pytest
+
+try:
+    import httpx  # type: ignore
+    HAS_HTTPX = True
+except ModuleNotFoundError:
+    HAS_HTTPX = False
+
+if HAS_HTTPX:
+    from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for TestClient")
+
+from app import async_crud, crud
+from app.main import app
+from app.database import get_async_db
+from app.api.dependencies import get_current_user
+from app.services import fragment_cache_service
+
+
+@pytest.fixture
+def client(db_session, async_db_override):
+    user = crud.create_user(db_session, "fragment-user", "fragment@example.com", "hash")
+    crud.create_tracked_fencer(db_session, user.id, "100", display_name="Cached Fencer")
+    db_session.commit()
+
+    app.dependency_overrides[get_async_db] = async_db_override
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        with TestClient(app) as test_client:
+            yield test_client, user
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def fencer_queries(monkeypatch):
+    calls = []
+    original = async_crud.get_all_tracked_fencers_for_user
+
+    async def _counting(*args, **kwargs):
+        calls.append(args)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(async_crud, "get_all_tracked_fencers_for_user", _counting)
+    return calls
+
+
+def test_fencer_list_is_served_from_cache_on_repeat_views(client, fencer_queries):
+    test_client, _ = client
+
+    first = test_client.get("/fencers")
+    second = test_client.get("/dashboard")
+
+    assert "Cached Fencer" in first.text
+    assert "Cached Fencer" in second.text
+    assert len(fencer_queries) == 1
+    assert fragment_cache_service.stats()["hits"] == 1
+
+
+def test_changing_fencers_renders_fresh_list(client, db_session, fencer_queries):
+    test_client, user = client
+    test_client.get("/fencers")
+
+    crud.create_tracked_fencer(db_session, user.id, "200", display_name="New Fencer")
+    db_session.commit()
+
+    assert "New Fencer" in test_client.get("/fencers").text
+    assert len(fencer_queries) == 2
+
+
+def test_invalidate_user_only_drops_that_users_fragments():
+    fragment_cache_service.put(("list", 1, 0, None), "one")
+    fragment_cache_service.put(("list", 2, 0, None), "two")
+
+    fragment_cache_service.invalidate_user(1)
+
+    assert fragment_cache_service.get(("list", 1, 0, None)) is None
+    assert fragment_cache_service.get(("list", 2, 0, None)) == "two"
+
+
+def test_expired_fragments_are_not_served(monkeypatch):
+    monkeypatch.setattr(fragment_cache_service, "FRAGMENT_CACHE_TTL_SEC", 60)
+    fragment_cache_service.put(("list", 1, 0, None), "stale")
+    assert fragment_cache_service.get(("list", 1, 0, None)) == "stale"
+
+    now = fragment_cache_service.time.monotonic()
+    monkeypatch.setattr(fragment_cache_service.time, "monotonic", lambda: now + 61)
+
+    assert fragment_cache_service.get(("list", 1, 0, None)) is None
+    assert fragment_cache_service.stats()["entries"] == 0
+
+
+def test_full_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(fragment_cache_service, "FRAGMENT_CACHE_MAX_ENTRIES", 2)
+    fragment_cache_service.put(("list", 1, 0, None), "one")
+    fragment_cache_service.put(("list", 2, 0, None), "two")
+    fragment_cache_service.get(("list", 1, 0, None))
+
+    fragment_cache_service.put(("list", 3, 0, None), "three")
+
+    assert fragment_cache_service.get(("list", 1, 0, None)) == "one"
+    assert fragment_cache_service.get(("list", 2, 0, None)) is None
+    assert fragment_cache_service.get(("list", 3, 0, None)) == "three"
@@ -0,0 +1,45 @@
+"""Entry modules must not import dependencies they never use.
+
+Runs ``python -X importtime`` in a fresh interpreter, which reports every
+module imported, and checks the heavy ones are absent.
+"""
+
+import functools
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@functools.lru_cache(maxsize=None)
+def _imported_modules(module: str) -> frozenset:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:   self [us] | cumulative | package.module"
+    return frozenset(
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    )
+
+
+@pytest.mark.parametrize("heavy", ["fastapi", "jinja2", "apscheduler", "bs4", "requests", "bcrypt"])
+def test_cli_import_skips_web_and_scraper_stack(heavy):
+    assert heavy not in _imported_modules("app.cli")
+
+
+@pytest.mark.parametrize("heavy", ["typer", "apscheduler", "bs4", "requests"])
+def test_web_import_skips_cli_and_scraper_stack(heavy):
+    assert heavy not in _imported_modules("app.web")
+
+
+def test_main_shim_only_loads_web_app_on_demand():
+    assert "fastapi" not in _imported_modules("app.main")
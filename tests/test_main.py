@@ -1,15 +1,15 @@
 import pytest
 
-from app import main
+from app import cli
 
 
 class TestParseClubUrls:
     def test_returns_empty_list_for_blank_string(self):
-        assert main._parse_club_urls("") == []
+        assert cli._parse_club_urls("") == []
 
     def test_splits_and_trims_urls(self):
         raw = " https://example.com/one ,https://example.com/two ,, "
-        assert main._parse_club_urls(raw) == [
+        assert cli._parse_club_urls(raw) == [
             "https://example.com/one",
             "https://example.com/two",
         ]
@@ -17,16 +17,37 @@ class TestParseClubUrls:
 
 class TestResolveInterval:
     def test_uses_fallback_when_value_missing(self):
-        assert main._resolve_interval(None, 30) == 30
+        assert cli._resolve_interval(None, 30) == 30
 
     def test_parses_positive_integer(self):
-        assert main._resolve_interval("45", 30) == 45
+        assert cli._resolve_interval("45", 30) == 45
 
     @pytest.mark.parametrize("value", ["0", "-5"])
     def test_rejects_non_positive_values(self, value):
         with pytest.raises(ValueError):
-            main._resolve_interval(value, 30)
+            cli._resolve_interval(value, 30)
 
     def test_rejects_non_integer_values(self):
         with pytest.raises(ValueError):
-            main._resolve_interval("abc", 30)
+            cli._resolve_interval("abc", 30)
+
+
+class TestPrecompileTemplates:
+    def test_compiles_every_template_into_bytecode_cache(self, tmp_path, monkeypatch):
+        from jinja2 import FileSystemBytecodeCache
+
+        from app.api import dependencies
+
+        env = dependencies.templates.env
+        monkeypatch.setattr(env, "bytecode_cache", FileSystemBytecodeCache(str(tmp_path)))
+        monkeypatch.setattr(env, "cache", {})
+
+        count = dependencies.precompile_templates()
+
+        assert count == len(env.list_templates(extensions=["html"]))
+        assert len(list(tmp_path.iterdir())) == count
+
+    def test_auto_reload_is_off_by_default(self):
+        from app.api import dependencies
+
+        assert dependencies.templates.env.auto_reload is False
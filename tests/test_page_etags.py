@@ -0,0 +1,133 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+try:
+    import httpx  # type: ignore
+    HAS_HTTPX = True
+except ModuleNotFoundError:
+    HAS_HTTPX = False
+
+if HAS_HTTPX:
+    from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for TestClient")
+
+from app import crud
+from app.main import app
+from app.database import get_async_db
+from app.api.dependencies import get_current_user
+from app.services import etag_service, scraper_service
+
+CLUB_URL = "https://fencingtracker.com/club/1/A/registrations"
+
+
+@pytest.fixture
+def client(db_session, async_db_override):
+    user = crud.create_user(db_session, "etag-user", "etag@example.com", "hash")
+    db_session.commit()
+
+    app.dependency_overrides[get_async_db] = async_db_override
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        with TestClient(app) as test_client:
+            yield test_client, user
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def _version(db_session, user):
+    db_session.expire_all()
+    return crud.get_user_by_id(db_session, user.id).data_version
+
+
+@pytest.mark.parametrize("path", ["/dashboard", "/clubs", "/fencers"])
+def test_unchanged_page_returns_304(client, path):
+    test_client, _ = client
+
+    first = test_client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+
+    repeat = test_client.get(path, headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == etag
+    assert repeat.content == b""
+
+
+def test_tracking_change_invalidates_etag(client, db_session):
+    test_client, user = client
+    etag = test_client.get("/clubs").headers["etag"]
+
+    crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    db_session.commit()
+
+    response = test_client.get("/clubs", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_flushes_and_club_scrapes_bump_data_version(db_session):
+    tracker = crud.create_user(db_session, "tracker", "tracker@example.com", "hash")
+    bystander = crud.create_user(db_session, "bystander", "bystander@example.com", "hash")
+    db_session.commit()
+    start = _version(db_session, tracker)
+
+    fencer = crud.create_tracked_fencer(db_session, tracker.id, "100")
+    crud.create_tracked_club(db_session, tracker.id, CLUB_URL)
+    db_session.commit()
+    after_create = _version(db_session, tracker)
+    assert after_create > start
+
+    fencer = crud.get_tracked_fencer_by_id(db_session, fencer.id)
+    fencer.display_name = fencer.display_name  # no net change
+    db_session.commit()
+    assert _version(db_session, tracker) == after_create
+
+    crud.bump_data_versions_for_club(db_session, CLUB_URL)
+    db_session.commit()
+    assert _version(db_session, tracker) == after_create + 1
+    assert _version(db_session, bystander) == 0
+
+
+def _scrape(db_session, events):
+    rows = "".join(
+        f"<tr><td>Alex Smith</td><td>{event}</td><td></td><td>2025-10-01</td></tr>" for event in events
+    )
+    html = (
+        "<h3>Fall Open</h3><table><tr><th>Fencer</th><th>Event</th><th>Status</th><th>Date</th></tr>"
+        f"{rows}</table>"
+    )
+    response = Mock(status_code=200, reason="OK", content=html.encode("utf-8"))
+    with patch("requests.Session.get", return_value=response), \
+            patch("app.services.scraper_service.enqueue_registration_alerts"):
+        scraper_service.scrape_and_persist(db_session, CLUB_URL)
+
+
+def test_unchanged_rescrape_keeps_etag(client, db_session):
+    test_client, user = client
+    crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    db_session.commit()
+    _scrape(db_session, ["Junior Men's Foil"])
+    etag = test_client.get("/clubs").headers["etag"]
+
+    _scrape(db_session, ["Junior Men's Foil"])
+    assert test_client.get("/clubs", headers={"If-None-Match": etag}).status_code == 304
+
+    _scrape(db_session, ["Junior Men's Foil", "Foil"])
+    changed = test_client.get("/clubs", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_etag_matches_weak_lists_and_wildcard():
+    etag = etag_service.build_etag(1, 3, "/clubs", now=0)
+
+    assert etag_service.etag_matches(f'"other", {etag}', etag)
+    assert etag_service.etag_matches(etag[2:], etag)
+    assert etag_service.etag_matches("*", etag)
+    assert not etag_service.etag_matches(None, etag)
+    assert not etag_service.etag_matches(etag_service.build_etag(1, 4, "/clubs", now=0), etag)
+    assert etag != etag_service.build_etag(1, 3, "/clubs", now=etag_service.ETAG_TIME_BUCKET_SEC)
@@ -0,0 +1,101 @@
+"""Guard hot queries against regressing to full table scans.
+
+Each case runs a crud query, captures the SQL it emits and checks SQLite's
+``EXPLAIN QUERY PLAN`` output. A plan step of the form ``SCAN <table>``
+without an index means the table is read end to end; FTS5 tables report a
+MATCH lookup as ``SCAN <fts> VIRTUAL TABLE INDEX n:M...``.
+"""
+
+import re
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import crud
+from app.services import registration_query_service
+
+CLUB_URL = "https://fencingtracker.com/club/1/Plans/registrations"
+SINCE = datetime.now(UTC) - timedelta(days=7)
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?!.*(\bUSING\b|VIRTUAL TABLE INDEX \d+:M))")
+
+HOT_QUERIES = {
+    "registrations_by_club_url": lambda db, ids: crud.get_registrations_by_club_url(db, CLUB_URL, since=SINCE),
+    "registrations_for_fencer": lambda db, ids: crud.get_registrations_for_fencer(db, "1001", since=SINCE),
+    "tracked_fencers_for_user_active": lambda db, ids: crud.get_all_tracked_fencers_for_user(db, ids["user"]),
+    "tracked_fencers_for_user_all": lambda db, ids: crud.get_all_tracked_fencers_for_user(
+        db, ids["user"], active_only=False
+    ),
+    "tracked_clubs_for_user_active": lambda db, ids: crud.get_tracked_clubs(db, ids["user"], active=True),
+    "tracked_club_by_user_and_url": lambda db, ids: crud.get_tracked_club_by_user_and_url(db, ids["user"], CLUB_URL),
+    "tracked_fencer_for_user": lambda db, ids: crud.get_tracked_fencer_for_user(db, ids["user"], "1001"),
+    "session_with_user": lambda db, ids: crud.get_session_with_user(db, ids["token"]),
+    "fencer_by_fencingtracker_id": lambda db, ids: crud.get_fencer_by_fencingtracker_id(db, "1001"),
+    "fencer_by_name": lambda db, ids: crud.get_or_create_fencer(db, "Plan Fencer 1"),
+    "registrations_page_by_last_seen": lambda db, ids: _second_page(db, "last_seen_at"),
+    "registrations_page_by_fencer": lambda db, ids: _second_page(db, "fencer_name"),
+    "registrations_page_by_tournament": lambda db, ids: _second_page(db, "tournament_name"),
+    "registrations_search_by_fencer": lambda db, ids: registration_query_service.query_registrations(
+        db, fencer_filter="plan fen", sort_by="relevance"
+    ),
+    "registrations_search_by_tournament": lambda db, ids: registration_query_service.query_registrations(
+        db, tournament_filter="plan", sort_by="tournament_name"
+    ),
+}
+
+
+def _second_page(db, sort_by):
+    first = registration_query_service.query_registrations(db, sort_by=sort_by, page_size=2)
+    return registration_query_service.query_registrations(
+        db, sort_by=sort_by, cursor=first["next_cursor"], page_size=2
+    )
+
+
+@pytest.fixture
+def seeded(db_session):
+    user = crud.create_user(db_session, "planner", "planner@example.com", "hash")
+    other = crud.create_user(db_session, "other", "other@example.com", "hash")
+    crud.create_tracked_club(db_session, user.id, CLUB_URL)
+    crud.create_tracked_club(db_session, other.id, CLUB_URL)
+    crud.create_tracked_fencer(db_session, user.id, "1001")
+    crud.create_tracked_fencer(db_session, other.id, "1002")
+
+    tournament = crud.get_or_create_tournament(db_session, "Plan Open", "2025-11-01")
+    for index in range(5):
+        fencer = crud.get_or_create_fencer(db_session, f"Plan Fencer {index}")
+        fencer.fencingtracker_id = str(1000 + index)
+        crud.update_or_create_registration(db_session, fencer, tournament, "Foil", CLUB_URL)
+
+    crud.create_session(db_session, user.id, "plan-token", datetime.now(UTC) + timedelta(days=1))
+    db_session.commit()
+    return {"user": user.id, "token": "plan-token"}
+
+
+def _capture_selects(db_session, run):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        run()
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+    return statements
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_avoids_full_table_scan(db_session, seeded, name):
+    statements = _capture_selects(db_session, lambda: HOT_QUERIES[name](db_session, seeded))
+    assert statements, f"{name} issued no SELECT"
+
+    connection = db_session.connection()
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        details = [row[3] for row in plan]
+        scans = [detail for detail in details if FULL_SCAN.match(detail)]
+        assert not scans, f"{name} scans {scans}:\n{statement}\nplan: {details}"
@@ -1,5 +1,7 @@
 """Tests for rate limiting functionality."""
 
+import uuid
+
 import pytest
 
 try:
@@ -12,13 +14,20 @@ if HAS_HTTPX:
     from fastapi.testclient import TestClient
 
 from app import crud
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.main import app
 from app.services import auth_service, rate_limit_service
 
 pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for TestClient")
 
 
+@pytest.fixture(autouse=True)
+def _async_db(async_db_override):
+    app.dependency_overrides[get_async_db] = async_db_override
+    yield
+    app.dependency_overrides.pop(get_async_db, None)
+
+
 def _create_user(db_session, username: str = "ratelimit-user"):
     password_hash = auth_service.hash_password("test-password")
     user = crud.create_user(db_session, username, f"{username}@example.com", password_hash)
@@ -238,3 +247,77 @@ def test_rate_limit_service_sliding_window():
 
     # Clean up
     rate_limit_service.reset_rate_limit(key)
+
+
+def test_rate_limit_service_caps_tracked_keys():
+    """Least recently used keys are evicted once the key cap is reached."""
+    backend = rate_limit_service.MemoryBackend(max_keys=3)
+
+    for idx in range(5):
+        backend.hit(f"test:cap:{idx}", 5, 60, 1_000_000.0)
+
+    assert list(backend.states) == ["test:cap:2", "test:cap:3", "test:cap:4"]
+
+
+def test_rate_limit_service_sweeps_idle_keys():
+    """Keys whose windows have fully elapsed are dropped by the sweep."""
+    backend = rate_limit_service.MemoryBackend(sweep_interval=0)
+
+    backend.hit("test:idle", 5, 10, 1_000_000.0)
+    backend.hit("test:fresh", 5, 10, 1_000_025.0)
+
+    assert list(backend.states) == ["test:fresh"]
+
+
+@pytest.fixture(params=["memory", "sqlite", "shm"])
+def rate_limit_backend(request, tmp_path):
+    if request.param == "memory":
+        backend = rate_limit_service.MemoryBackend()
+    elif request.param == "sqlite":
+        backend = rate_limit_service.SQLiteBackend(str(tmp_path / "rate_limits.db"))
+    else:
+        if not rate_limit_service._HAS_FCNTL:
+            pytest.skip("shared memory backend requires POSIX")
+        from multiprocessing import shared_memory
+
+        name = f"fc_rl_test_{uuid.uuid4().hex[:12]}"
+        backend = rate_limit_service.SharedMemoryBackend(name, slots=64)
+        request.addfinalizer(lambda: shared_memory._posixshmem.shm_unlink(f"/{name}"))
+    return backend
+
+
+def test_rate_limit_backend_retry_after(rate_limit_backend):
+    """Retry-After reflects when the sliding estimate drops below the limit."""
+    now = 1_000_000.0
+
+    for _ in range(2):
+        assert rate_limit_backend.hit("test:retry", 2, 100, now)[0]
+    assert not rate_limit_backend.hit("test:retry", 2, 100, now)[0]
+
+    retry_after = rate_limit_backend.retry_after("test:retry", now)
+    assert retry_after == 100
+
+    assert rate_limit_backend.hit("test:retry", 2, 100, now + retry_after + 1)[0]
+
+
+def test_rate_limit_backend_reset(rate_limit_backend):
+    now = 1_000_000.0
+    assert rate_limit_backend.hit("test:reset", 1, 60, now) == (True, 0)
+    assert rate_limit_backend.hit("test:reset", 1, 60, now) == (False, 0)
+
+    rate_limit_backend.reset("test:reset")
+
+    assert rate_limit_backend.hit("test:reset", 1, 60, now) == (True, 0)
+
+
+def test_shared_backends_enforce_one_budget_across_instances(tmp_path):
+    """Two backend instances (as in two workers) share the same counters."""
+    path = str(tmp_path / "shared.db")
+    worker_a = rate_limit_service.SQLiteBackend(path)
+    worker_b = rate_limit_service.SQLiteBackend(path)
+    now = 1_000_000.0
+
+    assert worker_a.hit("login:shared", 3, 60, now)[0]
+    assert worker_b.hit("login:shared", 3, 60, now)[0]
+    assert worker_a.hit("login:shared", 3, 60, now)[0]
+    assert not worker_b.hit("login:shared", 3, 60, now)[0]
@@ -0,0 +1,70 @@
+import pytest
+
+try:
+    import httpx  # type: ignore
+    HAS_HTTPX = True
+except ModuleNotFoundError:
+    HAS_HTTPX = False
+
+if HAS_HTTPX:
+    from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for TestClient")
+
+from app import crud
+from app.api.dependencies import get_current_user
+from app.database import get_async_db
+from app.main import app
+from app.services import registration_query_service
+
+CLUB_URL = "https://fencingtracker.com/club/4/Routes/registrations"
+
+
+@pytest.fixture
+def client(db_session, async_db_override):
+    user = crud.create_user(db_session, "browser", "browser@example.com", "hash")
+    for index in range(5):
+        fencer = crud.get_or_create_fencer(db_session, f"Route Fencer {index}")
+        tournament = crud.get_or_create_tournament(db_session, "Route Open", "2025-03-01")
+        crud.update_or_create_registration(db_session, fencer, tournament, "Epee", CLUB_URL)
+    db_session.commit()
+
+    registration_query_service.clear_count_cache()
+    app.dependency_overrides[get_async_db] = async_db_override
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_json_endpoint_pages_with_cursor(client):
+    first = client.get("/api/registrations", params={"sort_by": "fencer_name", "sort_order": "asc", "page_size": 3})
+    assert first.status_code == 200
+    body = first.json()
+    assert [item["fencer_name"] for item in body["items"]] == [f"Route Fencer {i}" for i in range(3)]
+    assert body["total_count"] == 5
+
+    second = client.get(
+        "/api/registrations",
+        params={"sort_by": "fencer_name", "sort_order": "asc", "page_size": 3, "cursor": body["next_cursor"]},
+    )
+    assert [item["fencer_name"] for item in second.json()["items"]] == ["Route Fencer 3", "Route Fencer 4"]
+    assert second.json()["next_cursor"] is None
+
+
+def test_invalid_cursor_returns_400(client):
+    response = client.get("/api/registrations", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
+
+
+def test_html_page_links_to_next_page(client):
+    response = client.get("/registrations", params={"page_size": 2})
+
+    assert response.status_code == 200
+    assert "Route Fencer" in response.text
+    assert "Next page" in response.text
+    assert "of 5 registration(s)" in response.text
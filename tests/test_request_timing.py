@@ -0,0 +1,82 @@
+import pytest
+
+try:
+    import httpx  # type: ignore
+    HAS_HTTPX = True
+except ModuleNotFoundError:
+    HAS_HTTPX = False
+
+if HAS_HTTPX:
+    from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for TestClient")
+
+from fastapi import FastAPI
+
+from app import crud
+from app.main import app
+from app.database import get_async_db
+from app.api import timing
+from app.api.dependencies import get_current_user
+from app.services import metrics_service
+
+
+def _entries(header):
+    return {entry.split(";", 1)[0]: entry for entry in header.split(", ")}
+
+
+@pytest.fixture
+def client(db_session, async_db_override):
+    user = crud.create_user(db_session, "timing-user", "timing@example.com", "hash")
+    db_session.commit()
+
+    app.dependency_overrides[get_async_db] = async_db_override
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_page_reports_sql_and_render_time(client):
+    response = client.get("/clubs")
+
+    assert response.status_code == 200
+    entries = _entries(response.headers["server-timing"])
+    assert entries["app"].startswith("app;dur=")
+    assert "render" in entries
+    queries = int(entries["db"].split('desc="', 1)[1].split(" ", 1)[0])
+    assert queries > 0
+
+
+def test_latency_is_recorded_per_route_template():
+    route_app = FastAPI()
+    route_app.add_middleware(timing.ServerTimingMiddleware)
+
+    @route_app.get("/timing-test/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    child = metrics_service.HTTP_REQUEST_SECONDS.labels("GET", "/timing-test/{item_id}", "200")
+    before = sum(child.snapshot()[0])
+
+    test_client = TestClient(route_app)
+    test_client.get("/timing-test/1")
+    test_client.get("/timing-test/2")
+    missing = test_client.get("/timing-test-missing")
+
+    assert sum(child.snapshot()[0]) - before == 2
+    assert missing.status_code == 404
+    assert "app;dur=" in missing.headers["server-timing"]
+    assert 'route="unmatched"' in metrics_service.render()
+
+
+def test_server_timing_header_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(timing, "SERVER_TIMING_ENABLED", False)
+
+    response = TestClient(app).get("/health")
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import text
+
+from app import crud, search_index
+from app.services import registration_query_service
+
+CLUB_URL = "https://fencingtracker.com/club/5/Search/registrations"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_counts():
+    registration_query_service.clear_count_cache()
+    yield
+    registration_query_service.clear_count_cache()
+
+
+def _register(db_session, fencer_name, tournament_name, events):
+    fencer = crud.get_or_create_fencer(db_session, fencer_name)
+    tournament = crud.get_or_create_tournament(db_session, tournament_name, "2025-04-01")
+    registration, _ = crud.update_or_create_registration(db_session, fencer, tournament, events, CLUB_URL)
+    return registration
+
+
+def _fencer_matches(db_session, term):
+    rows = db_session.execute(
+        text("SELECT rowid FROM fencers_fts WHERE fencers_fts MATCH :q"),
+        {"q": search_index.build_match_query(term)},
+    )
+    return {row.rowid for row in rows}
+
+
+def test_build_match_query_quotes_prefix_tokens():
+    assert search_index.build_match_query("jan  do") == '"jan"* "do"*'
+    assert search_index.build_match_query('OR "NEAR(') == '"OR"* "NEAR"*'
+    assert search_index.build_match_query("--") is None
+
+
+def test_triggers_keep_index_in_sync(db_session):
+    fencer = crud.get_or_create_fencer(db_session, "Alexandra Petrova")
+    db_session.commit()
+    assert _fencer_matches(db_session, "alex") == {fencer.id}
+
+    fencer.name = "Sasha Petrova"
+    db_session.commit()
+    assert _fencer_matches(db_session, "alex") == set()
+    assert _fencer_matches(db_session, "sash") == {fencer.id}
+
+    db_session.delete(fencer)
+    db_session.commit()
+    assert _fencer_matches(db_session, "petrova") == set()
+
+
+def test_search_ignores_case_and_accents(db_session):
+    fencer = crud.get_or_create_fencer(db_session, "Zoë Müller")
+    db_session.commit()
+
+    assert _fencer_matches(db_session, "zoe mull") == {fencer.id}
+
+
+def test_prefix_filters_on_fencer_tournament_and_event(db_session):
+    _register(db_session, "Jordan Lee", "Spring Regional Open", "Cadet Men's Foil")
+    _register(db_session, "Jordan Smith", "Fall Super Youth Circuit", "Y14 Men's Epee")
+    _register(db_session, "Casey Jordan", "Spring Regional Open", "Junior Women's Saber")
+    db_session.commit()
+
+    by_fencer = registration_query_service.query_registrations(db_session, fencer_filter="jord sm")
+    by_tournament = registration_query_service.query_registrations(db_session, tournament_filter="reg")
+    by_event = registration_query_service.query_registrations(db_session, event_filter="foil")
+
+    assert [item["fencer_name"] for item in by_fencer["items"]] == ["Jordan Smith"]
+    assert {item["fencer_name"] for item in by_tournament["items"]} == {"Jordan Lee", "Casey Jordan"}
+    assert by_tournament["total_count"] == 2
+    assert [item["fencer_name"] for item in by_event["items"]] == ["Jordan Lee"]
+
+
+def test_relevance_sort_ranks_better_matches_first(db_session):
+    _register(db_session, "Morgan Reyes", "Reyes Memorial Reyes Cup", "Senior Foil")
+    _register(db_session, "Riley Chen", "Reyes Open", "Senior Foil")
+    db_session.commit()
+
+    page = registration_query_service.query_registrations(
+        db_session, tournament_filter="reyes", sort_by="relevance", page_size=1
+    )
+    assert page["sort_by"] == "relevance"
+    assert [item["tournament_name"] for item in page["items"]] == ["Reyes Memorial Reyes Cup"]
+
+    second = registration_query_service.query_registrations(
+        db_session, tournament_filter="reyes", sort_by="relevance", page_size=1, cursor=page["next_cursor"]
+    )
+    assert [item["tournament_name"] for item in second["items"]] == ["Reyes Open"]
+    assert second["next_cursor"] is None
+
+
+def test_relevance_without_filter_falls_back_to_last_seen(db_session):
+    page = registration_query_service.query_registrations(db_session, sort_by="relevance")
+
+    assert (page["sort_by"], page["sort_order"]) == ("last_seen_at", "desc")
+
+
+def test_punctuation_only_filter_matches_nothing(db_session):
+    _register(db_session, "Taylor Brooks", "Winter Open", "Senior Epee")
+    db_session.commit()
+
+    page = registration_query_service.query_registrations(db_session, fencer_filter="%%")
+
+    assert page["items"] == []
+    assert page["total_count"] == 0
+
+
+def test_drop_all_removes_search_tables(db_session):
+    from app.models import Base
+
+    bind = db_session.get_bind()
+    db_session.close()
+    Base.metadata.drop_all(bind=bind)
+
+    with bind.connect() as connection:
+        tables = connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE name LIKE '%_fts%'").all()
+    assert tables == []
@@ -16,12 +16,19 @@ pytestmark = pytest.mark.skipif(not HAS_HTTPX, reason="httpx not available for T
 
 from app import crud
 from app.main import app
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models import User
 from app.services import auth_service
 from app.api.dependencies import SESSION_COOKIE_NAME, get_current_user
 
 
+@pytest.fixture(autouse=True)
+def _async_db(async_db_override):
+    app.dependency_overrides[get_async_db] = async_db_override
+    yield
+    app.dependency_overrides.pop(get_async_db, None)
+
+
 def _override_db(db_session):
     def _get_db_override():
         try:
@@ -135,10 +142,10 @@ def test_create_tracked_fencer_slugless_uses_scraper_helper(monkeypatch, db_sess
         calls.append((fencer_id, timeout))
         return "Jordan Lee"
 
-    from app.api import tracked_fencers as tracked_fencers_module
+    from app.services import fencer_scraper_service
 
     monkeypatch.setattr(
-        tracked_fencers_module.fencer_scraper_service,
+        fencer_scraper_service,
         "fetch_fencer_display_name",
         _fake_fetch,
     )
@@ -283,10 +290,10 @@ def test_add_fencer_shows_flash_message(monkeypatch, db_session):
     user = crud.create_user(db_session, "flash-user", "flash@example.com", password_hash)
     db_session.commit()
 
-    from app.api import tracked_fencers as tracked_fencers_module
+    from app.services import fencer_scraper_service
 
     monkeypatch.setattr(
-        tracked_fencers_module.fencer_scraper_service,
+        fencer_scraper_service,
         "fetch_fencer_display_name",
         lambda *_args, **_kwargs: None,
     )
@@ -0,0 +1,69 @@
+import asyncio
+
+from app import worker
+
+CLUB_URL = "https://fencingtracker.com/club/1/A/registrations"
+
+
+def _with_scheduler(jobstore_url, callback):
+    async def _run():
+        scheduler = worker.create_scheduler(jobstore_url)
+        scheduler.start(paused=True)
+        try:
+            return callback(scheduler)
+        finally:
+            scheduler.shutdown(wait=False)
+
+    return asyncio.run(_run())
+
+
+def test_build_job_specs_covers_every_background_job():
+    ids = [spec.id for spec in worker.build_job_specs([CLUB_URL], 30)]
+    assert ids == ["scrape_clubs", "scrape_fencers", "dispatch_alerts", "sweep_sessions", "send_digests"]
+
+    # Tracked clubs are scraped even when no extra URLs are configured
+    assert worker.build_job_specs([], 30)[0].args == [[]]
+    assert [spec.id for spec in worker.build_job_specs([CLUB_URL], 30, scrape=False)] == [
+        "dispatch_alerts",
+        "sweep_sessions",
+        "send_digests",
+    ]
+
+
+def test_jobs_are_persisted_with_overlap_protection(tmp_path):
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    specs = worker.build_job_specs([CLUB_URL], 30)
+
+    def _first(scheduler):
+        worker.sync_jobs(scheduler, specs)
+        return {job.id: job.next_run_time for job in scheduler.get_jobs()}
+
+    def _restart(scheduler):
+        worker.sync_jobs(scheduler, specs)
+        return {job.id: job for job in scheduler.get_jobs()}
+
+    first_run_times = _with_scheduler(url, _first)
+    jobs = _with_scheduler(url, _restart)
+
+    assert set(jobs) == {spec.id for spec in specs}
+    for job in jobs.values():
+        assert job.coalesce is True
+        assert job.max_instances == 1
+        assert job.misfire_grace_time == worker.WORKER_MISFIRE_GRACE_SEC
+        # Unchanged jobs keep their stored schedule across restarts
+        assert job.next_run_time == first_run_times[job.id]
+    assert jobs["scrape_clubs"].args == ([CLUB_URL],)
+
+
+def test_sync_jobs_replaces_changed_and_removes_stale_jobs(tmp_path):
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    _with_scheduler(url, lambda scheduler: worker.sync_jobs(scheduler, worker.build_job_specs([CLUB_URL], 30)))
+
+    def _reconfigure(scheduler):
+        worker.sync_jobs(scheduler, worker.build_job_specs([], 15))
+        return {job.id: job for job in scheduler.get_jobs()}
+
+    jobs = _with_scheduler(url, _reconfigure)
+
+    assert jobs["scrape_clubs"].args == ([],)
+    assert jobs["scrape_fencers"].trigger.interval.total_seconds() == 15 * 60